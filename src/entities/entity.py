@@ -24,6 +24,7 @@ class Entity:
         
         # Collision properties
         self.collision_radius = radius
+        self.terrain = None  # TileMap to collide with after moving, if the world has one
     
     def update(self, dt):
         # Apply friction
@@ -54,6 +55,10 @@ class Entity:
         # Reset acceleration for next frame
         self.ax = 0
         self.ay = 0
+        
+        # Walls stop movement (part of the step so prediction replays match the host)
+        if self.terrain is not None:
+            self.terrain.collide(self)
     
     def apply_acceleration(self, ax, ay):
         """Apply acceleration to the entity"""
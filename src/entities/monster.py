@@ -5,39 +5,41 @@ from entities.entity import Entity
 from weapons.projectile import Projectile
 
 class Monster(Entity):
-    def __init__(self, x, y):
-        # Randomize monster properties
-        radius = random.randint(15, 25)
-        mass = random.randint(5, 20)
-        max_health = random.randint(30, 80)
+    def __init__(self, x, y, rng=random):
+        # Randomize monster properties (rng: a seeded random.Random for reproducible spawns)
+        radius = rng.randint(15, 25)
+        mass = rng.randint(5, 20)
+        max_health = rng.randint(30, 80)
         
         super().__init__(x, y, radius, mass, max_health)
         
         # Monster-specific properties
-        self.max_speed = random.randint(50, 150)
-        self.acceleration_rate = random.randint(30, 80)
-        self.friction_coefficient = random.randint(20, 60)
-        self.damage = random.randint(5, 15)
-        self.attack_speed = random.uniform(0.5, 1.5)
+        self.max_speed = rng.randint(50, 150)
+        self.acceleration_rate = rng.randint(30, 80)
+        self.friction_coefficient = rng.randint(20, 60)
+        self.damage = rng.randint(5, 15)
+        self.attack_speed = rng.uniform(0.5, 1.5)
         
         # AI properties
         self.move_timer = 0
         self.move_direction = (0, 0)
-        self.last_attack_time = 0
+        self.attack_cooldown = 0.0  # Seconds of simulated time until the next attack
         self.projectiles = []
+        self.rng = random  # AI randomness; the world hands each monster its seeded stream
         
         # Color for drawing
         self.color = (
-            random.randint(100, 255),
-            random.randint(0, 100),
-            random.randint(0, 100)
+            rng.randint(100, 255),
+            rng.randint(0, 100),
+            rng.randint(0, 100)
         )
     
     def update(self, dt, player_x, player_y):
         # Simple AI: periodically change direction towards player
         self.move_timer -= dt
+        self.attack_cooldown -= dt
         if self.move_timer <= 0:
-            self.move_timer = random.uniform(0.5, 2.0)  # Change direction every 0.5-2 seconds
+            self.move_timer = self.rng.uniform(0.5, 2.0)  # Change direction every 0.5-2 seconds
             
             # Move towards player with some randomness
             dx = player_x - self.x
@@ -46,8 +48,8 @@ class Monster(Entity):
             
             # Normalize and add some randomness
             self.move_direction = (
-                dx/distance + random.uniform(-0.5, 0.5),
-                dy/distance + random.uniform(-0.5, 0.5)
+                dx/distance + self.rng.uniform(-0.5, 0.5),
+                dy/distance + self.rng.uniform(-0.5, 0.5)
             )
             
             # Normalize direction
@@ -65,19 +67,14 @@ class Monster(Entity):
         if distance_to_player < 200:  # Attack range
             self.attack(player_x, player_y)
         
-        # Update entity with physics
+        # Update entity with physics (projectiles are flown by the world simulation)
         super().update(dt)
-        
-        # Update projectiles
-        self.projectiles = [p for p in self.projectiles if p.update(dt)]
     
     def attack(self, target_x, target_y):
         """Attack towards a target position"""
-        current_time = pygame.time.get_ticks() / 1000.0  # Convert to seconds
-        
         # Check if we can attack based on attack speed
-        if current_time - self.last_attack_time >= 1.0 / self.attack_speed:
-            self.last_attack_time = current_time
+        if self.attack_cooldown <= 0:
+            self.attack_cooldown = 1.0 / self.attack_speed
             
             # Calculate direction to target
             dx = target_x - self.x
@@ -99,7 +96,8 @@ class Monster(Entity):
                 projectile_vx,
                 projectile_vy,
                 self.damage,
-                "monster"
+                "monster",
+                max_range=600
             )
             
             self.projectiles.append(projectile)
@@ -1,12 +1,22 @@
 import math
 import pygame
 from entities.entity import Entity
-from weapons.projectile import Projectile
+from weapons.projectile import Projectile, PROJECTILE_TYPES
+from weapons.registry import get_weapon_registry
+from world.spatial import arc_overlaps
+
+SWING_SHOW_TIME = 0.15  # seconds a melee swing stays drawn
+GUARD_TIME = 0.5  # seconds a defensive weapon stays raised after each attack
 
 class Player(Entity):
-    def __init__(self, x=0, y=0, player_id=None):
+    def __init__(self, x=0, y=0, player_id=None, is_local=None):
         super().__init__(x, y, radius=20, mass=10, max_health=100)
         self.player_id = player_id if player_id else "player"
+        
+        # Only the local player reads the keyboard
+        if is_local is None:
+            is_local = self.player_id.startswith("player_1") or (not self.player_id.startswith("player_"))
+        self.is_local = is_local
         self.level = 1
         self.experience = 0
         self.experience_needed = 100
@@ -28,13 +38,22 @@ class Player(Entity):
         self.damage = self.base_damage
         self.attack_range = self.base_attack_range
         
+        # Last input frame the host has simulated for this player, and the simulated
+        # time its next input frames may still cover (host only)
+        self.last_input = 0
+        self.input_budget = 0.0
+        
         # Combat
-        self.last_attack_time = 0
+        self.attack_cooldown = 0.0  # Seconds of simulated time until the next attack
         self.projectiles = []
+        self.swings = []  # Melee swing directions (radians) for the world to resolve
+        self.swing_direction = 0.0
+        self.swing_time = 0.0  # Left to draw the last swing
+        self.guard_direction = 0.0
+        self.guard_time = 0.0  # Left with a defensive weapon raised
         
-        # Weapon
-        self.weapon = None
-        self.weapon_name = "Unarmed"
+        # Weapon (a shared WeaponStats record)
+        self.weapon = get_weapon_registry().unarmed
         
         # Color (different for different players)
         if self.player_id == "player_1":
@@ -66,35 +85,31 @@ class Player(Entity):
         self.update_stats()
     
     def update_stats(self):
-        # Apply weapon modifiers if equipped
+        """Recompute derived stats; only needed after a level-up, an equip or a load"""
+        weapon = self.weapon
         self.max_health = self.base_max_health
         self.max_speed = self.base_movement_speed
         self.acceleration_rate = self.base_acceleration_rate
         self.friction_coefficient = self.base_friction_coefficient
-        self.attack_speed = self.base_attack_speed
-        self.damage = self.base_damage
-        self.attack_range = self.base_attack_range
-        
-        if self.weapon:
-            self.weapon_name = self.weapon.name
-            self.damage += self.weapon.damage
-            self.attack_speed = self.base_attack_speed * self.weapon.attack_speed
-            if hasattr(self.weapon, 'attack_range'):
-                self.attack_range = self.base_attack_range + self.weapon.attack_range
-        else:
-            self.weapon_name = "Unarmed"
+        self.attack_speed = self.base_attack_speed * weapon.attack_speed
+        self.damage = self.base_damage + weapon.damage
+        self.attack_range = self.base_attack_range + weapon.attack_range
+    
+    @property
+    def weapon_name(self):
+        return self.weapon.name
     
     def equip_weapon(self, weapon):
-        self.weapon = weapon
-        self.update_stats()
+        """Hold a WeaponStats from the weapon registry"""
+        if weapon is not self.weapon:
+            self.weapon = weapon
+            self.update_stats()
     
     def attack(self, target_x, target_y):
         """Attack towards a target position"""
-        current_time = pygame.time.get_ticks() / 1000.0  # Convert to seconds
-        
         # Check if we can attack based on attack speed
-        if current_time - self.last_attack_time >= 1.0 / self.attack_speed:
-            self.last_attack_time = current_time
+        if self.attack_cooldown <= 0:
+            self.attack_cooldown = 1.0 / self.attack_speed
             
             # Calculate direction to target
             dx = target_x - self.x
@@ -105,8 +120,20 @@ class Player(Entity):
             dx /= distance
             dy /= distance
             
-            # Create projectile
-            projectile_speed = 300  # pixels per second
+            # Melee weapons swing, defensive ones raise a guard, the rest shoot
+            if self.weapon.kind == "melee":
+                self.swing_direction = math.atan2(dy, dx)
+                self.swing_time = SWING_SHOW_TIME
+                self.swings.append(self.swing_direction)
+                return True
+            if self.weapon.kind == "defensive":
+                self.guard_direction = math.atan2(dy, dx)
+                self.guard_time = GUARD_TIME
+                return True
+            
+            # Create projectile (weapons without one shoot like bare hands)
+            weapon = self.weapon if self.weapon.projectile_type else get_weapon_registry().unarmed
+            projectile_speed = PROJECTILE_TYPES[weapon.projectile_type]["speed"]  # pixels per second
             projectile_vx = dx * projectile_speed
             projectile_vy = dy * projectile_speed
             
@@ -116,33 +143,65 @@ class Player(Entity):
                 projectile_vx,
                 projectile_vy,
                 self.damage,
-                "player"
+                "player",
+                weapon.projectile_type,
+                max_range=weapon.range
             )
             
             self.projectiles.append(projectile)
             return True
         return False
     
-    def update(self, dt):
-        # Handle player movement with acceleration and friction
-        keys = pygame.key.get_pressed()
+    @property
+    def reach(self):
+        """How far from the player's centre a melee swing lands"""
+        return self.radius + self.attack_range
+    
+    def blocks(self, projectile):
+        """Whether a raised defensive weapon stops this projectile"""
+        weapon = self.weapon
+        if self.guard_time <= 0 or weapon.kind != "defensive" or projectile.damage_type != weapon.defense_type:
+            return False
+        # Only projectiles arriving from the side the guard faces
+        return arc_overlaps(self.x, self.y, self.reach, self.guard_direction, math.radians(weapon.arc) / 2,
+                            projectile.x, projectile.y, projectile.collision_radius)
+    
+    def read_input(self):
+        """Sample the movement keys as an (x, y) direction, each -1, 0 or 1"""
+        if not self.is_local:
+            return (0, 0)
         
-        # Apply acceleration based on input (only for main player)
-        if self.player_id.startswith("player_1") or (not self.player_id.startswith("player_")):
-            if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-                self.apply_acceleration(-self.acceleration_rate, 0)
-            if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-                self.apply_acceleration(self.acceleration_rate, 0)
-            if keys[pygame.K_UP] or keys[pygame.K_w]:
-                self.apply_acceleration(0, -self.acceleration_rate)
-            if keys[pygame.K_DOWN] or keys[pygame.K_s]:
-                self.apply_acceleration(0, self.acceleration_rate)
+        keys = pygame.key.get_pressed()
+        move_x = 0
+        move_y = 0
+        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+            move_x -= 1
+        if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+            move_x += 1
+        if keys[pygame.K_UP] or keys[pygame.K_w]:
+            move_y -= 1
+        if keys[pygame.K_DOWN] or keys[pygame.K_s]:
+            move_y += 1
+        return (move_x, move_y)
+    
+    def apply_input(self, move_input, dt):
+        """Advance movement by one input frame (shared by host, prediction and replay)"""
+        self.apply_acceleration(move_input[0] * self.acceleration_rate, move_input[1] * self.acceleration_rate)
         
         # Update entity with physics
         super().update(dt)
         
-        # Update projectiles
-        self.projectiles = [p for p in self.projectiles if p.update(dt)]
+        # Cooldowns, swings and guards wear off with simulated time
+        self.attack_cooldown -= dt
+        self.swing_time = max(0.0, self.swing_time - dt)
+        self.guard_time = max(0.0, self.guard_time - dt)
+    
+    def update(self, dt, move_input=None):
+        # Handle player movement with acceleration and friction
+        if move_input is None:
+            move_input = self.read_input()
+        self.apply_input(move_input, dt)
+        # Projectiles are flown by the world simulation
     
     def draw(self, screen, camera_x, camera_y):
         # Draw player (centered on screen)
@@ -153,6 +212,24 @@ class Player(Entity):
         # Draw direction indicator
         pygame.draw.circle(screen, (0, 100, 0), (int(player_screen_x), int(player_screen_y)), self.radius//2)
         
+        # Draw the last swing and a raised guard
+        if self.swing_time > 0:
+            self.draw_arc(screen, player_screen_x, player_screen_y, self.swing_direction, (255, 255, 255))
+        if self.guard_time > 0:
+            self.draw_arc(screen, player_screen_x, player_screen_y, self.guard_direction, (100, 150, 255))
+        
         # Draw projectiles
         for projectile in self.projectiles:
-            projectile.draw(screen, camera_x, camera_y)
\ No newline at end of file
+            projectile.draw(screen, camera_x, camera_y)
+    
+    def draw_arc(self, screen, screen_x, screen_y, direction, color):
+        """Outline what the held weapon covers, facing direction"""
+        reach = self.reach
+        rect = pygame.Rect(int(screen_x - reach), int(screen_y - reach), int(reach * 2), int(reach * 2))
+        half_angle = math.radians(self.weapon.arc) / 2
+        if half_angle > 0:
+            # Screen y points down, so pygame's counter-clockwise angles are negated
+            pygame.draw.arc(screen, color, rect, -direction - half_angle, -direction + half_angle, 3)
+        else:
+            end = (screen_x + math.cos(direction) * reach, screen_y + math.sin(direction) * reach)
+            pygame.draw.line(screen, color, (int(screen_x), int(screen_y)), (int(end[0]), int(end[1])), 3)
\ No newline at end of file
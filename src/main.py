@@ -9,7 +9,8 @@ def main():
     clock = pygame.time.Clock()
     
     # Initialize the main menu
-    current_screen = MainMenu(screen)
+    # (--record saves the inputs of new offline games for headless replay, see tools/replay.py)
+    current_screen = MainMenu(screen, record_inputs="--record" in sys.argv)
     
     running = True
     while running:
@@ -28,11 +29,13 @@ def main():
                 # Switch to the new screen
                 current_screen = screen_result
         
-        # Update the current screen
+        # Update the current screen (a screen may switch itself, e.g. after a background connect)
         if hasattr(current_screen, 'update'):
-            current_screen.update(dt)
+            screen_result = current_screen.update(dt)
         else:
-            current_screen.update()
+            screen_result = current_screen.update()
+        if screen_result is not None:
+            current_screen = screen_result
         
         # Draw the current screen
         current_screen.draw()
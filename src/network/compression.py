@@ -0,0 +1,85 @@
+import time
+import zlib
+
+# Codec name offered by the host and accepted by clients during the handshake
+CODEC_NAME = "zlib-dict-2"
+
+# Set in the 4-byte length prefix when the payload that follows is compressed
+COMPRESSED_FLAG = 0x80000000
+
+# Fragments that appear in almost every message. Shared by both ends so even
+# small snapshots compress well; changing it requires a new CODEC_NAME.
+PRESET_DICTIONARY = (
+    b'"owner": "monster"}, {"x": "owner": "player"}, {"x": '
+    b'"vx": "vy": "health": "max_health": "name": "Player", "level": '
+    b'"weapon": 0, "last_input": '
+    b'"monster_0": {"x": "monster_1": {"x": "monster_2": {"x": '
+    b'"player_1": {"x": "player_2": {"x": "player_3": {"x": '
+    b'{"type": "game_state", "data": {"players": {"monsters": {"projectiles": [{"x": '
+    b'"timestamp": '
+)
+
+
+class SnapshotCompressor:
+    """Per-message zlib compression with a preset dictionary.
+
+    Messages below the threshold are sent as-is since compressing them costs
+    more CPU than the bytes saved are worth. Every message is compressed on
+    its own so clients can join or drop at any point in the stream.
+    """
+
+    def __init__(self, threshold=512, level=6):
+        self.threshold = threshold
+        self.level = level
+
+        # Stats for the last tick and running totals, for tuning the threshold
+        self.last_raw_bytes = 0
+        self.last_compressed_bytes = 0
+        self.last_cpu_time = 0.0
+        self.total_raw_bytes = 0
+        self.total_compressed_bytes = 0
+        self.total_cpu_time = 0.0
+
+    def compress(self, payload):
+        """Return (compressed, data) for a message payload"""
+        if len(payload) < self.threshold:
+            self.last_raw_bytes = len(payload)
+            self.last_compressed_bytes = len(payload)
+            self.last_cpu_time = 0.0
+            return False, payload
+
+        start = time.thread_time()
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, -15, zdict=PRESET_DICTIONARY)
+        data = compressor.compress(payload) + compressor.flush()
+        cpu_time = time.thread_time() - start
+
+        self.last_raw_bytes = len(payload)
+        self.last_cpu_time = cpu_time
+        self.total_raw_bytes += len(payload)
+        self.total_cpu_time += cpu_time
+
+        # Incompressible payloads go out raw
+        if len(data) >= len(payload):
+            self.last_compressed_bytes = len(payload)
+            self.total_compressed_bytes += len(payload)
+            return False, payload
+
+        self.last_compressed_bytes = len(data)
+        self.total_compressed_bytes += len(data)
+        return True, data
+
+    def get_stats(self):
+        """Compression ratio and CPU time, for the last tick and overall"""
+        return {
+            "threshold": self.threshold,
+            "last_ratio": self.last_compressed_bytes / self.last_raw_bytes if self.last_raw_bytes else 1.0,
+            "last_cpu_ms": self.last_cpu_time * 1000,
+            "total_ratio": self.total_compressed_bytes / self.total_raw_bytes if self.total_raw_bytes else 1.0,
+            "total_cpu_ms": self.total_cpu_time * 1000
+        }
+
+
+def decompress(data):
+    """Inflate a payload produced by SnapshotCompressor"""
+    decompressor = zlib.decompressobj(-15, zdict=PRESET_DICTIONARY)
+    return decompressor.decompress(data) + decompressor.flush()
@@ -0,0 +1,211 @@
+import heapq
+import json
+import socket
+import struct
+import threading
+import time
+
+BROADCAST_PORT = 12346
+
+# Administratively scoped group, for networks that filter broadcasts
+MULTICAST_GROUP = "239.255.123.46"
+
+# Games not heard from for this long are dropped
+GAME_TTL = 10.0
+
+
+class DiscoveryService:
+    """Process-wide LAN game discovery on a single UDP socket.
+
+    Every screen that wants the game list shares this one listener instead
+    of binding its own socket. Entries are deduplicated by (host, port) and
+    expire through a heap ordered by expiry time, so nothing rescans the
+    whole table per packet. Subscribers are told about additions, updates
+    and removals as they happen.
+    """
+
+    def __init__(self, port=BROADCAST_PORT, ttl=GAME_TTL):
+        self.port = port
+        self.ttl = ttl
+        self.games = {}  # {(host, port): game dict}
+        self.expiry_heap = []  # (expires_at, (host, port)); stale items are skipped lazily
+        self.subscribers = []
+        self.version = 0  # Bumped on every change
+        self.lock = threading.Lock()
+
+        self.users = 0
+        self.running = False
+        self.socket = None
+        self.thread = None
+        self.generation = 0  # Bumped per listener started; older listeners stop when it moves on
+
+    def acquire(self):
+        """Start listening if this is the first user"""
+        with self.lock:
+            self.users += 1
+            if self.running:
+                return
+            self.running = True
+            self.generation += 1
+            previous = self.thread
+            thread = self.thread = threading.Thread(target=self._listen, args=(self.generation, previous))
+            thread.daemon = True
+        thread.start()
+
+    def release(self):
+        """Stop listening once the last user is gone"""
+        with self.lock:
+            self.users = max(0, self.users - 1)
+            if self.users > 0 or not self.running:
+                return
+            self.running = False
+
+    def subscribe(self, callback):
+        """Call callback(event, game) on "added", "updated" and "removed" events"""
+        with self.lock:
+            self.subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        with self.lock:
+            if callback in self.subscribers:
+                self.subscribers.remove(callback)
+
+    def get_games(self):
+        """Known games, least loaded first"""
+        with self.lock:
+            games = [dict(game) for game in self.games.values()]
+        games.sort(key=lambda game: (game["load"] if game["load"] is not None else 0.0,
+                                     game["players"] if game["players"] is not None else 0,
+                                     game["name"]))
+        return games
+
+    def _open_socket(self):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(('', self.port))
+        try:
+            membership = struct.pack('4s4s', socket.inet_aton(MULTICAST_GROUP), socket.inet_aton("0.0.0.0"))
+            sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+        except OSError as e:
+            # No multicast route (e.g. offline); broadcasts still work
+            print(f"Multicast discovery unavailable: {e}")
+        # Wake up regularly to expire entries and notice release()
+        sock.settimeout(0.5)
+        return sock
+
+    def _listening(self, generation):
+        with self.lock:
+            return self.running and self.generation == generation
+
+    def _listen(self, generation, previous=None):
+        # A listener from an earlier acquire may still be blocked in recvfrom; it
+        # notices it was superseded within one timeout and closes its own socket
+        if previous is not None:
+            previous.join()
+        if not self._listening(generation):
+            return
+
+        try:
+            sock = self._open_socket()
+        except Exception as e:
+            print(f"Error starting game discovery: {e}")
+            with self.lock:
+                if self.generation == generation:
+                    self.running = False
+            return
+        with self.lock:
+            self.socket = sock
+
+        while self._listening(generation):
+            try:
+                data, addr = sock.recvfrom(1024)
+                self._handle_packet(data)
+            except socket.timeout:
+                pass
+            except Exception as e:
+                # A bad packet shouldn't end discovery
+                print(f"Error discovering games: {e}")
+            self._expire()
+
+        sock.close()
+        with self.lock:
+            if self.socket is sock:
+                self.socket = None
+
+    def _handle_packet(self, data, now=None):
+        if now is None:
+            now = time.time()
+        message = json.loads(data.decode('utf-8'))
+        if message.get("type") != "game_discovery":
+            return
+
+        key = (message["host"], message["port"])
+        game = {
+            "name": message["name"],
+            "host": message["host"],
+            "port": message["port"],
+            "players": message.get("players"),
+            "load": message.get("load"),
+            "last_seen": now
+        }
+        with self.lock:
+            old = self.games.get(key)
+            self.games[key] = game
+            heapq.heappush(self.expiry_heap, (now + self.ttl, key))
+            if old is None:
+                event = "added"
+            elif (old["name"], old["players"], old["load"]) != (game["name"], game["players"], game["load"]):
+                event = "updated"
+            else:
+                return  # Just a refresh
+            self.version += 1
+        self._notify(event, game)
+
+    def _expire(self, now=None):
+        if now is None:
+            now = time.time()
+        expired = []
+        with self.lock:
+            while self.expiry_heap and self.expiry_heap[0][0] <= now:
+                expires_at, key = heapq.heappop(self.expiry_heap)
+                game = self.games.get(key)
+                # Only drop it if no newer packet pushed its expiry further out
+                if game is not None and game["last_seen"] + self.ttl <= now:
+                    del self.games[key]
+                    expired.append(game)
+            if expired:
+                self.version += 1
+        for game in expired:
+            self._notify("removed", game)
+
+    def _notify(self, event, game):
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for callback in subscribers:
+            try:
+                callback(event, dict(game))
+            except Exception as e:
+                print(f"Error in discovery subscriber: {e}")
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_discovery_service():
+    """The shared DiscoveryService for this process"""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = DiscoveryService()
+        return _service
+
+
+def send_announcement(sock, message, port=BROADCAST_PORT):
+    """Send a game_discovery message by broadcast and multicast"""
+    data = json.dumps(message).encode('utf-8')
+    sock.sendto(data, ('<broadcast>', port))
+    try:
+        sock.sendto(data, (MULTICAST_GROUP, port))
+    except OSError:
+        pass  # Broadcast already went out
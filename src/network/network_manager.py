@@ -3,6 +3,15 @@ import threading
 import json
 import time
 import struct
+import secrets
+from network.snapshot_buffer import SnapshotBuffer
+from network.outbound import OutboundAggregator
+from network.telemetry import NetworkTelemetry
+from network.snapshot_exchange import SnapshotExchange
+from network.send_scheduler import SendScheduler
+from network.compression import SnapshotCompressor, CODEC_NAME, COMPRESSED_FLAG, decompress
+from network.discovery import get_discovery_service, send_announcement
+from weapons.registry import UNARMED_ID
 
 class NetworkManager:
     def __init__(self):
@@ -14,14 +23,13 @@ class NetworkManager:
         self.is_host = False
         self.is_connected = False
         self.game_data = {}
-        self.discovered_games = {}  # {host: (name, last_seen)}
         
         # Connected players
         self.connected_players = {}
         
-        # Broadcast discovery
+        # Broadcast discovery; listening is shared process-wide, see network.discovery
         self.broadcast_socket = None
-        self.discovery_running = False
+        self.discovery = get_discovery_service()
         
         # Game state synchronization
         self.game_state = {
@@ -30,35 +38,74 @@ class NetworkManager:
             "projectiles": {}
         }
         
+        # Snapshots sent per second by the host; clients interpolate between them
+        self.sync_rate = 30
+        
+        # Client-side timeline of received snapshots
+        self.snapshot_buffer = SnapshotBuffer()
+        
         # Reconnection settings
         self.reconnect_attempts = 0
         self.max_reconnect_attempts = 5
         self.reconnect_delay = 2  # seconds
+        self.connect_cancel = threading.Event()  # Set to abort a connect_to_game in progress
         
         # Client player ID
         self.player_id = None
         
-    def start_hosting(self, game_name="Player's Game"):
-        """Start hosting a game session"""
+        # Raw bytes read from sockets by this manager
+        self.bytes_received = 0
+        
+        # RTT, jitter, bandwidth and snapshot size statistics
+        self.telemetry = NetworkTelemetry()
+        self.ping_interval = 1.0  # seconds
+        self.disconnected_addresses = set()  # For counting client reconnects
+        self.send_lock = threading.Lock()  # Client socket is written from two threads
+        
+        # Optional snapshot compression, negotiated per client at connect time
+        self.compression_enabled = True
+        self.compressor = SnapshotCompressor(threshold=512)
+        self.compression_negotiated = False  # Client side: host agreed to compress
+        
+        # Client traffic is batched into one message per network tick
+        self.outbound = OutboundAggregator(tick_rate=30)
+        
+        # Host: the simulation owns game_state and publishes a copy per tick for
+        # the network threads, which queue client traffic back to it
+        self.exchange = SnapshotExchange()
+        
+        # Host: per-client bandwidth budgets and entity priorities
+        self.send_scheduler = SendScheduler()
+        
+        # Host: smoothed fraction of each sync interval spent sending, advertised in discovery
+        self.sync_load = 0.0
+        
+        # Resumable sessions. The host hands each client a token and keeps a disconnected
+        # player's slot for session_grace seconds; the client resumes with the token.
+        self.session_grace = 15.0  # seconds
+        self.sessions = {}  # Host: {token: {"player_id": ..., "expires": time or None while connected}}
+        self.session_lock = threading.Lock()
+        self.player_counter = 2  # Host: next player number (the host is player_1)
+        self.session_token = None  # Client: token for resuming after a dropped connection
+        self.session_address = None  # Client: (host, port) the token belongs to
+        # Client: bumped whenever a session opens (join, resume or rejoin) so the game
+        # knows to drop its predicted and replicated state and pick up player_id again
+        self.session_epoch = 0
+        
+        # Seed of the host's terrain, sent to clients when they join so they build the same walls
+        self.world_seed = None
+        
+    def start_hosting(self, game_name="Player's Game", host=None, broadcast=True, host_player=True):
+        """Start hosting a game session (host overrides the detected LAN address).
+        
+        Dedicated servers pass host_player=False since nobody plays on the host.
+        """
         try:
             # Create server socket
             self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             
-            # Try to get the correct host IP
-            try:
-                # Try to get IP that is not localhost
-                hostname = socket.gethostname()
-                self.host = socket.gethostbyname(hostname)
-                # If we get localhost, try to get actual local IP
-                if self.host.startswith("127."):
-                    # Get local IP by connecting to a remote address
-                    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as temp_sock:
-                        temp_sock.connect(("8.8.8.8", 80))
-                        self.host = temp_sock.getsockname()[0]
-            except:
-                # Fallback to localhost
-                self.host = "127.0.0.1"
+            self.host = host if host else self.detect_local_ip()
             
             print(f"Binding to {self.host}:{self.port}")
             self.server_socket.bind((self.host, self.port))
@@ -66,30 +113,27 @@ class NetworkManager:
             self.is_host = True
             
             # Add host player to game state
-            self.game_state["players"]["player_1"] = {
-                "x": 400,
-                "y": 300,
-                "health": 100,
-                "max_health": 100,
-                "name": "Host",
-                "level": 1,
-                "weapon": "Unarmed"
-            }
+            if host_player:
+                self.game_state["players"]["player_1"] = {
+                    "x": 400,
+                    "y": 300,
+                    "health": 100,
+                    "max_health": 100,
+                    "name": "Host",
+                    "level": 1,
+                    "weapon": UNARMED_ID
+                }
             
             # Start accepting connections in a separate thread
             accept_thread = threading.Thread(target=self._accept_connections)
             accept_thread.daemon = True
             accept_thread.start()
             
-            # Start broadcasting game availability
-            broadcast_thread = threading.Thread(target=self._broadcast_game, args=(game_name,))
-            broadcast_thread.daemon = True
-            broadcast_thread.start()
-            
-            # Start listening for other broadcasts
-            discovery_thread = threading.Thread(target=self._discover_games)
-            discovery_thread.daemon = True
-            discovery_thread.start()
+            if broadcast:
+                # Start broadcasting game availability
+                broadcast_thread = threading.Thread(target=self._broadcast_game, args=(game_name,))
+                broadcast_thread.daemon = True
+                broadcast_thread.start()
             
             # Start game state synchronization
             sync_thread = threading.Thread(target=self._sync_game_state)
@@ -102,34 +146,35 @@ class NetworkManager:
             print(f"Error starting host: {e}")
             return False
     
+    @staticmethod
+    def detect_local_ip():
+        """Best guess at this machine's LAN address"""
+        try:
+            # Try to get IP that is not localhost
+            hostname = socket.gethostname()
+            local_ip = socket.gethostbyname(hostname)
+            # If we get localhost, try to get actual local IP
+            if local_ip.startswith("127."):
+                # Get local IP by connecting to a remote address
+                with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as temp_sock:
+                    temp_sock.connect(("8.8.8.8", 80))
+                    local_ip = temp_sock.getsockname()[0]
+            return local_ip
+        except:
+            # Fallback to localhost
+            return "127.0.0.1"
+    
     def _accept_connections(self):
         """Accept incoming client connections"""
         print("Waiting for connections...")
-        player_counter = 2  # Start from player_2 since host is player_1
         while self.is_host:
             try:
                 client_sock, address = self.server_socket.accept()
+                client_sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
                 print(f"Connection from {address}")
-                # Assign player ID
-                player_id = f"player_{player_counter}"
-                player_counter += 1
-                self.connected_players[player_id] = {
-                    "socket": client_sock,
-                    "address": address,
-                    "x": 400 + (player_counter * 50),  # Stagger player positions
-                    "y": 300
-                }
-                
-                # Send player ID to client
-                player_id_msg = json.dumps({
-                    "type": "player_id",
-                    "player_id": player_id
-                }).encode('utf-8')
-                player_id_msg = struct.pack('>I', len(player_id_msg)) + player_id_msg
-                client_sock.send(player_id_msg)
                 
-                # Handle client in a separate thread
-                client_thread = threading.Thread(target=self._handle_client, args=(client_sock, player_id))
+                # Handle client in a separate thread; it starts with the join/resume handshake
+                client_thread = threading.Thread(target=self._handle_client, args=(client_sock, address))
                 client_thread.daemon = True
                 client_thread.start()
             except Exception as e:
@@ -137,10 +182,139 @@ class NetworkManager:
                     print(f"Error accepting connections: {e}")
                 break
     
-    def _handle_client(self, client_socket, player_id):
+    def _admit_client(self, client_sock, address):
+        """Host handshake: read the client's join or resume request and answer with its player ID.
+        
+        Returns the player ID, or None if the client never sent a valid request.
+        """
+        client_sock.settimeout(5)
+        raw_msglen = self._recvall(client_sock, 4)
+        if not raw_msglen:
+            return None
+        data = self._recvall(client_sock, struct.unpack('>I', raw_msglen)[0])
+        if not data:
+            return None
+        request = json.loads(data.decode('utf-8'))
+        if request.get("type") not in ("join", "resume"):
+            return None
+        
+        # Resume the old slot if the token is still valid, otherwise join as a new player
+        player_id = None
+        with self.session_lock:
+            session = self.sessions.get(request.get("token")) if request["type"] == "resume" else None
+            if session is not None:
+                token = request["token"]
+                player_id = session["player_id"]
+                session["expires"] = None
+                old_info = self.connected_players.get(player_id)
+            else:
+                token = secrets.token_hex(8)
+                player_id = f"player_{self.player_counter}"
+                self.player_counter += 1
+                self.sessions[token] = {"player_id": player_id, "expires": None}
+                old_info = None
+        resumed = session is not None
+        
+        if old_info is not None:
+            # The host hadn't noticed the old connection drop yet; retire it
+            try:
+                old_info["socket"].close()
+            except Exception:
+                pass
+        if address[0] in self.disconnected_addresses:
+            self.telemetry.record_reconnect(address[0])
+        
+        if not resumed:
+            # The host owns movement, so give the player a starting state
+            x = 400 + (self.player_counter * 50)  # Stagger player positions
+            self.exchange.push(("join", player_id, {
+                "x": x,
+                "y": 300,
+                "vx": 0,
+                "vy": 0,
+                "health": 100,
+                "max_health": 100,
+                "name": "Player",
+                "level": 1,
+                "weapon": UNARMED_ID,
+                "last_input": 0
+            }))
+        
+        # Compress snapshots if the client asked for a codec we share
+        compression = self.compression_enabled and request.get("compression") == CODEC_NAME
+        
+        # Send player ID and session token to client
+        player_id_msg = {
+            "type": "player_id",
+            "player_id": player_id,
+            "token": token,
+            "resumed": resumed,
+            "grace": self.session_grace
+        }
+        if compression:
+            player_id_msg["compression"] = CODEC_NAME
+        if self.world_seed is not None:
+            player_id_msg["world_seed"] = self.world_seed
+        message = json.dumps(player_id_msg).encode('utf-8')
+        message = struct.pack('>I', len(message)) + message
+        
+        # A resumed client gets the whole current world in one compressed catch-up
+        # snapshot, and the scheduler continues with deltas from there
+        published = self.exchange.published
+        if resumed and published is not None:
+            tick, timestamp, game_state = published
+            payload = json.dumps({
+                "type": "game_state",
+                "data": game_state,
+                "timestamp": timestamp,
+                "catchup": True
+            }).encode('utf-8')
+            compressed = False
+            if compression:
+                compressed, payload = self.compressor.compress(payload)
+            length = len(payload) | COMPRESSED_FLAG if compressed else len(payload)
+            message += struct.pack('>I', length) + payload
+            self.send_scheduler.remove_client(player_id)
+            self.send_scheduler.prime(player_id, game_state)
+        
+        client_sock.sendall(message)
+        client_sock.settimeout(None)
+        self.telemetry.link(player_id).record_out(len(message))
+        
+        with self.session_lock:
+            self.connected_players[player_id] = {
+                "socket": client_sock,
+                "address": address,
+                "compression": compression
+            }
+            # The old connection's handler may have started the grace period meanwhile
+            self.sessions[token]["expires"] = None
+        print(f"{'Resumed' if resumed else 'Assigned'} player ID {player_id} for {address}")
+        return player_id
+    
+    def _expire_sessions(self, now):
+        """Host: drop players whose grace period ran out without them resuming"""
+        with self.session_lock:
+            expired = [
+                token for token, session in self.sessions.items()
+                if session["expires"] is not None and session["expires"] <= now
+            ]
+            for token in expired:
+                player_id = self.sessions.pop(token)["player_id"]
+                # Remove player from game state
+                self.exchange.push(("leave", player_id, None))
+    
+    def _handle_client(self, client_socket, address):
         """Handle communication with a connected client"""
+        player_id = None
         try:
-            while self.is_host and player_id in self.connected_players:
+            player_id = self._admit_client(client_socket, address)
+            if player_id is None:
+                client_socket.close()
+                return
+            
+            # Runs until the connection drops or a resumed connection replaces it
+            while self.is_host and self.connected_players.get(player_id, {}).get("socket") is client_socket:
                 # Receive data from client
                 try:
                     raw_msglen = self._recvall(client_socket, 4)
@@ -151,24 +325,40 @@ class NetworkManager:
                     data = self._recvall(client_socket, msglen)
                     if not data:
                         break
+                    self.telemetry.link(player_id).record_in(msglen + 4)
                         
                     message = json.loads(data.decode('utf-8'))
                     
-                    if message["type"] == "player_update":
-                        # Update player data in game state
-                        self.game_state["players"][player_id] = message["data"]
+                    if message["type"] == "pong":
+                        self.telemetry.link(player_id).record_rtt(time.time() - message["t"])
+                    elif message["type"] == "batch":
+                        # One network tick worth of inputs plus changed state fields
+                        if "state" in message:
+                            self.exchange.push(("state", player_id, message["state"]))
+                        if "delay" in message:
+                            self.connected_players[player_id]["view_delay"] = self.clamp_view_delay(message["delay"])
+                        if "inputs" in message:
+                            self.exchange.push(("inputs", player_id, [
+                                (row[0], (row[1], row[2]), row[3], (row[4], row[5]) if len(row) > 4 else None)
+                                for row in message["inputs"]
+                            ]))
                 except Exception as e:
                     print(f"Error receiving data from {player_id}: {e}")
                     break
-                time.sleep(0.016)  # ~60 FPS
         except Exception as e:
             print(f"Error handling client {player_id}: {e}")
         finally:
-            if player_id in self.connected_players:
-                del self.connected_players[player_id]
-                # Remove player from game state
-                if player_id in self.game_state["players"]:
-                    del self.game_state["players"][player_id]
+            with self.session_lock:
+                player_info = self.connected_players.get(player_id)
+                if player_info is not None and player_info["socket"] is client_socket:
+                    self.telemetry.remove_link(player_id)
+                    self.send_scheduler.remove_client(player_id)
+                    self.disconnected_addresses.add(address[0])
+                    del self.connected_players[player_id]
+                    # Keep the player in the world for a while in case it resumes
+                    for session in self.sessions.values():
+                        if session["player_id"] == player_id:
+                            session["expires"] = time.time() + self.session_grace
             client_socket.close()
     
     def _broadcast_game(self, game_name):
@@ -178,113 +368,123 @@ class NetworkManager:
         
         while self.is_host:
             try:
-                # Broadcast game information
-                message = json.dumps({
+                # Broadcast game information, with enough for joiners to sort by
+                players = len(self.connected_players) + (1 if "player_1" in self.game_state["players"] else 0)
+                send_announcement(self.broadcast_socket, {
                     "type": "game_discovery",
                     "name": game_name,
                     "host": self.host,
                     "port": self.port,
+                    "players": players,
+                    "load": round(self.sync_load, 3),
                     "timestamp": time.time()
-                }).encode('utf-8')
-                
-                self.broadcast_socket.sendto(message, ('<broadcast>', self.broadcast_port))
+                }, self.broadcast_port)
                 time.sleep(2)  # Broadcast every 2 seconds
             except Exception as e:
                 print(f"Error broadcasting game: {e}")
                 break
     
-    def _discover_games(self):
-        """Listen for game broadcasts on the network"""
-        self.discovery_running = True
-        discovery_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        discovery_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        discovery_socket.bind(('', self.broadcast_port))
-        
-        while self.discovery_running:
-            try:
-                data, addr = discovery_socket.recvfrom(1024)
-                message = json.loads(data.decode('utf-8'))
-                
-                if message["type"] == "game_discovery":
-                    host = message["host"]
-                    # Only keep games seen in the last 10 seconds
-                    if time.time() - message["timestamp"] < 10:
-                        self.discovered_games[host] = (message["name"], message["timestamp"])
-                    # Remove old games
-                    self.discovered_games = {
-                        h: info for h, info in self.discovered_games.items()
-                        if time.time() - info[1] < 10
-                    }
-            except Exception as e:
-                if self.discovery_running:
-                    print(f"Error discovering games: {e}")
-                break
-    
     def _sync_game_state(self):
         """Synchronize game state with connected clients"""
+        last_ping = 0
+        last_tick = None
         while self.is_host:
             try:
-                # Send game state to all connected clients
-                game_state_msg = json.dumps({
-                    "type": "game_state",
-                    "data": self.game_state,
-                    "timestamp": time.time()
-                }).encode('utf-8')
+                now = time.time()
+                self._expire_sessions(now)
                 
-                # Prefix each message with a 4-byte length (network byte order)
-                game_state_msg = struct.pack('>I', len(game_state_msg)) + game_state_msg
+                # Only read what the simulation published; skip ticks with nothing new
+                published = self.exchange.published
+                if published is None or published[0] == last_tick:
+                    time.sleep(0.005)
+                    continue
+                last_tick, timestamp, game_state = published
                 
-                # Send to all connected players
+                # Ping clients for RTT; they echo the timestamp back in a pong
+                ping_msg = None
+                if now - last_ping >= self.ping_interval:
+                    last_ping = now
+                    ping_msg = json.dumps({"type": "ping", "t": now}).encode('utf-8')
+                    ping_msg = struct.pack('>I', len(ping_msg)) + ping_msg
+                    
+                    # Measure snapshot size per entity type about once per ping
+                    sizes = {
+                        category: len(json.dumps(entities))
+                        for category, entities in game_state.items()
+                    }
+                    self.telemetry.record_snapshot_sizes(sizes, sum(sizes.values()))
+                
+                # Entity sizes are shared by every client's scheduling pass
+                entity_sizes = self.send_scheduler.measure(game_state)
+                
+                # Send each client the entities that fit its bandwidth budget
                 for player_id, player_info in list(self.connected_players.items()):
                     try:
-                        player_info["socket"].send(game_state_msg)
+                        selection = self.send_scheduler.build(player_id, game_state, entity_sizes, now)
+                        message = ping_msg if ping_msg else b''
+                        if selection:
+                            data, removed = selection
+                            payload = {
+                                "type": "game_state",
+                                "data": data,
+                                "partial": True,
+                                "timestamp": timestamp
+                            }
+                            if removed:
+                                payload["removed"] = removed
+                            payload = json.dumps(payload).encode('utf-8')
+                            
+                            compressed = False
+                            if player_info["compression"]:
+                                compressed, payload = self.compressor.compress(payload)
+                            # Prefix each message with a 4-byte length (network byte order)
+                            length = len(payload) | COMPRESSED_FLAG if compressed else len(payload)
+                            message += struct.pack('>I', length) + payload
+                        if not message:
+                            continue
+                        
+                        send_start = time.time()
+                        player_info["socket"].sendall(message)
+                        self.send_scheduler.on_sent(player_id, len(message), time.time() - send_start,
+                                                    1 / self.sync_rate)
+                        self.telemetry.link(player_id).record_out(len(message))
                     except Exception as e:
                         print(f"Error sending to player {player_id}: {e}")
-                        # Remove disconnected player
-                        if player_id in self.connected_players:
-                            del self.connected_players[player_id]
+                        # Stop sending to it; its handler thread starts the resume grace period
+                        try:
+                            player_info["socket"].close()
+                        except Exception:
+                            pass
                 
-                time.sleep(1/30)  # 30 FPS sync
+                # Keep the cadence steady regardless of how long sending took
+                elapsed = time.time() - now
+                self.sync_load += (min(1.0, elapsed * self.sync_rate) - self.sync_load) * 0.1
+                time.sleep(max(0, 1 / self.sync_rate - elapsed))
             except Exception as e:
                 print(f"Error syncing game state: {e}")
-                time.sleep(1/30)
+                time.sleep(1 / self.sync_rate)
     
     def get_discovered_games(self):
-        """Get list of discovered games"""
-        games = []
-        for host, (name, timestamp) in self.discovered_games.items():
-            games.append({
-                "name": name,
-                "host": host,
-                "port": self.port
-            })
-        return games
+        """Get list of discovered games, least loaded first"""
+        return self.discovery.get_games()
     
-    def connect_to_game(self, host, port=12345):
-        """Connect to a hosted game with reconnection support"""
+    def connect_to_game(self, host, port=12345, progress=None):
+        """Connect to a hosted game with reconnection support.
+        
+        Blocks through retries, so UI code should call it from a background thread.
+        progress, if given, is called with (status, attempt, max_attempts).
+        """
         self.reconnect_attempts = 0
+        self.connect_cancel.clear()
         
         while self.reconnect_attempts < self.max_reconnect_attempts:
+            if progress:
+                progress("connecting", self.reconnect_attempts + 1, self.max_reconnect_attempts)
             try:
-                self.client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                self.client_socket.settimeout(5)  # 5 second timeout
                 print(f"Attempting to connect to {host}:{port}")
-                self.client_socket.connect((host, port))
-                self.client_socket.settimeout(None)  # Remove timeout after connection
+                self._open_session(host, port)
                 self.is_connected = True
                 self.reconnect_attempts = 0  # Reset on successful connection
-                
-                # Receive player ID from server
-                raw_msglen = self._recvall(self.client_socket, 4)
-                if raw_msglen:
-                    msglen = struct.unpack('>I', raw_msglen)[0]
-                    data = self._recvall(self.client_socket, msglen)
-                    if data:
-                        message = json.loads(data.decode('utf-8'))
-                        if message["type"] == "player_id":
-                            self.player_id = message["player_id"]
-                            print(f"Assigned player ID: {self.player_id}")
-                
                 print(f"Successfully connected to {host}:{port} as {self.player_id}")
                 
                 # Start listening for data in a separate thread
@@ -296,41 +496,169 @@ class NetworkManager:
             except Exception as e:
                 print(f"Error connecting to game (attempt {self.reconnect_attempts + 1}): {e}")
                 self.reconnect_attempts += 1
+                if self.connect_cancel.is_set():
+                    return False
                 if self.reconnect_attempts < self.max_reconnect_attempts:
                     print(f"Retrying in {self.reconnect_delay} seconds...")
-                    time.sleep(self.reconnect_delay)
+                    if progress:
+                        progress("retrying", self.reconnect_attempts, self.max_reconnect_attempts)
+                    if self.connect_cancel.wait(self.reconnect_delay):
+                        print("Connection cancelled.")
+                        return False
                 else:
                     print("Max reconnection attempts reached.")
                     return False
     
+    def _open_session(self, host, port):
+        """Connect and join, or resume the session we hold a token for. Raises on failure."""
+        if self.client_socket:
+            self.client_socket.close()
+        self.client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.client_socket.settimeout(5)  # 5 second timeout
+        self.client_socket.connect((host, port))
+        # Batching is done explicitly by the outbound aggregator, so don't let Nagle delay it
+        self.client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        
+        # The client speaks first: resume if we hold a token for this host, otherwise join
+        request = {"type": "join"}
+        if self.session_token and self.session_address == (host, port):
+            request = {"type": "resume", "token": self.session_token}
+        if self.compression_enabled:
+            request["compression"] = CODEC_NAME
+        request = json.dumps(request).encode('utf-8')
+        self.client_socket.sendall(struct.pack('>I', len(request)) + request)
+        
+        # Receive player ID from server
+        raw_msglen = self._recvall(self.client_socket, 4)
+        if not raw_msglen:
+            raise ConnectionError("Host closed the connection during the handshake")
+        data = self._recvall(self.client_socket, struct.unpack('>I', raw_msglen)[0])
+        if not data:
+            raise ConnectionError("Host closed the connection during the handshake")
+        message = json.loads(data.decode('utf-8'))
+        if message["type"] != "player_id":
+            raise ConnectionError(f"Unexpected handshake reply: {message['type']}")
+        self.client_socket.settimeout(None)  # Remove timeout after connection
+        
+        if self.player_id is not None:
+            # Connected to a game before, so this is a reconnect
+            self.telemetry.record_reconnect("host")
+        if not message.get("resumed"):
+            print(f"Assigned player ID: {message['player_id']}")
+        # Whether resumed or not, the host starts this connection from a full world
+        # (a catch-up snapshot, or deltas from nothing), so drop what we had
+        self.game_state = {
+            "players": {},
+            "monsters": {},
+            "projectiles": {}
+        }
+        self.snapshot_buffer.clear()
+        self.outbound.reset()
+        self.player_id = message["player_id"]
+        self.session_token = message.get("token")
+        self.session_address = (host, port)
+        self.session_grace = message.get("grace", self.session_grace)
+        # The host only compresses with a codec we asked for
+        self.compression_negotiated = message.get("compression") == CODEC_NAME
+        self.world_seed = message.get("world_seed")
+        self.session_epoch += 1
+        return message.get("resumed", False)
+    
+    def _resume_session(self):
+        """Reconnect straight away with the session token, backing off briefly while the host is unreachable"""
+        start = time.time()
+        delay = 0.0
+        while time.time() - start < self.session_grace:
+            if self.connect_cancel.wait(delay):
+                return False
+            try:
+                resumed = self._open_session(*self.session_address)
+                print(f"{'Resumed' if resumed else 'Rejoined'} as {self.player_id} "
+                      f"after {(time.time() - start) * 1000:.0f} ms")
+                return True
+            except Exception as e:
+                print(f"Error resuming session: {e}")
+                delay = min(max(delay * 2, 0.05), 1.0)
+        return False
+    
+    def cancel_connect(self):
+        """Abort a connect_to_game running in another thread"""
+        self.connect_cancel.set()
+        if self.client_socket and not self.is_connected:
+            try:
+                self.client_socket.close()
+            except Exception:
+                pass
+    
     def _listen_for_data(self):
-        """Listen for data from the server"""
-        while self.is_connected:
+        """Listen for data from the server, resuming the session if the connection drops"""
+        while True:
             try:
-                # Receive the message length (4 bytes)
-                raw_msglen = self._recvall(self.client_socket, 4)
-                if not raw_msglen:
-                    break
-                msglen = struct.unpack('>I', raw_msglen)[0]
-                
-                # Receive the message data
-                data = self._recvall(self.client_socket, msglen)
-                if not data:
-                    break
-                    
-                message = json.loads(data.decode('utf-8'))
-                
-                if message["type"] == "game_state":
-                    self.game_state = message["data"]
+                self._receive_from_host()
+                error = "connection closed by host"
             except Exception as e:
-                print(f"Error listening for data: {e}")
-                # Attempt to reconnect
-                if self.reconnect_attempts < self.max_reconnect_attempts:
-                    print("Connection lost. Attempting to reconnect...")
-                    self.is_connected = False
-                    # Try to reconnect
-                    time.sleep(self.reconnect_delay)
+                error = e
+            if not self.is_connected:
+                break  # Disconnected on purpose
+            
+            print(f"Connection lost ({error}). Resuming session...")
+            self.is_connected = False
+            if not self.session_address or not self._resume_session():
+                print("Could not resume the session.")
                 break
+            self.is_connected = True
+    
+    def _receive_from_host(self):
+        """Read messages until the connection closes"""
+        while self.is_connected:
+            # Receive the message length (4 bytes)
+            raw_msglen = self._recvall(self.client_socket, 4)
+            if not raw_msglen:
+                return
+            msglen = struct.unpack('>I', raw_msglen)[0]
+            
+            # The top bit of the length marks a compressed payload
+            compressed = msglen & COMPRESSED_FLAG
+            msglen &= ~COMPRESSED_FLAG
+            
+            # Receive the message data
+            data = self._recvall(self.client_socket, msglen)
+            if not data:
+                return
+            self.telemetry.link("host").record_in(msglen + 4)
+            if compressed:
+                data = decompress(data)
+                
+            message = json.loads(data.decode('utf-8'))
+            
+            if message["type"] == "ping":
+                # Echo the host's timestamp so it can measure the round trip
+                pong = json.dumps({"type": "pong", "t": message["t"]}).encode('utf-8')
+                pong = struct.pack('>I', len(pong)) + pong
+                with self.send_lock:
+                    self.client_socket.sendall(pong)
+                self.telemetry.link("host").record_out(len(pong))
+            elif message["type"] == "game_state":
+                if message.get("partial"):
+                    # Only some entities were sent: merge them into a new copy of the
+                    # last state (the old one may still be in the snapshot buffer)
+                    state = {
+                        category: dict(entities) if isinstance(entities, dict) else entities
+                        for category, entities in self.game_state.items()
+                    }
+                    for category, entities in message["data"].items():
+                        if isinstance(entities, dict):
+                            state.setdefault(category, {}).update(entities)
+                        else:
+                            state[category] = entities
+                    for category, entity_ids in message.get("removed", {}).items():
+                        for entity_id in entity_ids:
+                            state.get(category, {}).pop(entity_id, None)
+                else:
+                    # Full state, e.g. the catch-up snapshot after resuming
+                    state = message["data"]
+                self.game_state = state
+                self.snapshot_buffer.add(state, message["timestamp"])
     
     def _recvall(self, sock, n):
         """Helper function to receive n bytes or return None if EOF"""
@@ -339,51 +667,54 @@ class NetworkManager:
             packet = sock.recv(n - len(data))
             if not packet:
                 return None
+            self.bytes_received += len(packet)
             data += packet
         return data
     
-    def send_player_update(self, player_data):
-        """Send player update to server"""
+    def flush_outbound(self):
+        """Send the batched client traffic if a network tick has passed"""
         try:
             if self.is_connected and self.client_socket:
-                message = json.dumps({
-                    "type": "player_update",
-                    "player_id": self.player_id,
-                    "data": player_data
-                }).encode('utf-8')
-                # Prefix each message with a 4-byte length (network byte order)
-                message = struct.pack('>I', len(message)) + message
-                self.client_socket.send(message)
+                message = self.outbound.build_message()
+                if message:
+                    with self.send_lock:
+                        self.client_socket.sendall(message)
+                    self.telemetry.link("host").record_out(len(message))
         except Exception as e:
-            print(f"Error sending player update: {e}")
+            print(f"Error sending batched update: {e}")
     
-    def send_data(self, data):
-        """Send data to connected clients or server"""
-        try:
-            if self.is_host and self.client_socket:
-                # Send to specific client
-                message = json.dumps(data).encode('utf-8')
-                # Prefix each message with a 4-byte length (network byte order)
-                message = struct.pack('>I', len(message)) + message
-                self.client_socket.send(message)
-            elif self.is_connected and self.client_socket:
-                # Send to server
-                message = json.dumps(data).encode('utf-8')
-                # Prefix each message with a 4-byte length (network byte order)
-                message = struct.pack('>I', len(message)) + message
-                self.client_socket.send(message)
-        except Exception as e:
-            print(f"Error sending data: {e}")
-            # Attempt to reconnect
-            if self.is_connected and self.reconnect_attempts < self.max_reconnect_attempts:
-                print("Connection error. Attempting to reconnect...")
-                self.is_connected = False
+    def process_inbound(self):
+        """Apply queued client traffic to game_state and return the input frames per player.
+        
+        Each frame is (sequence, (move_x, move_y), dt, attack), attack being the
+        (x, y) the player fired at during that frame or None.
+        
+        Host only; call once per tick from the simulation thread.
+        """
+        inputs = {}
+        players = self.game_state["players"]
+        for kind, player_id, payload in self.exchange.drain():
+            if kind == "inputs":
+                inputs.setdefault(player_id, []).extend(payload)
+            elif kind == "state":
+                players.setdefault(player_id, {}).update(payload)
+            elif kind == "join":
+                players[player_id] = payload
+            elif kind == "leave":
+                players.pop(player_id, None)
+                inputs.pop(player_id, None)
+        return inputs
+    
+    def publish_snapshot(self):
+        """Publish the current game_state to the network threads (host only, once per tick)"""
+        self.exchange.publish(self.game_state)
     
     def stop_networking(self):
         """Stop all networking activities"""
         self.is_host = False
         self.is_connected = False
-        self.discovery_running = False
+        self.connect_cancel.set()  # Also stops a session resume in progress
+        self.session_token = None
         
         if self.server_socket:
             self.server_socket.close()
@@ -397,6 +728,41 @@ class NetworkManager:
             self.broadcast_socket.close()
             self.broadcast_socket = None
     
+    def get_telemetry(self):
+        """Network statistics: per-link RTT, jitter and traffic, snapshot sizes and reconnects"""
+        stats = self.telemetry.get_stats()
+        if self.is_host:
+            stats["compression"] = self.compressor.get_stats()
+            for player_id, player_info in list(self.connected_players.items()):
+                if player_id in stats["links"]:
+                    stats["links"][player_id]["reconnects"] = stats["reconnects"].get(player_info["address"][0], 0)
+                    stats["links"][player_id]["send"] = self.send_scheduler.get_stats(player_id)
+        return stats
+    
+    def clamp_view_delay(self, delay):
+        """Host: a client's reported view delay (ms) in seconds, held to what a SnapshotBuffer can use.
+
+        The client chooses it, and it decides how far back that player's hits
+        are rewound, so it is never trusted beyond the buffer's own delay range.
+        """
+        buffer = self.snapshot_buffer
+        if isinstance(delay, bool) or not isinstance(delay, (int, float)) or delay != delay:
+            return buffer.interpolation_delay
+        return max(buffer.min_delay, min(buffer.max_delay, delay / 1000))
+    
+    def view_latency(self, player_id):
+        """Host: how far in the past a client sees the world (half RTT plus its interpolation delay)"""
+        player_info = self.connected_players.get(player_id)
+        if player_info is None:
+            return 0.0
+        rtt = self.telemetry.link(player_id).rtt
+        one_way = rtt / 2 if rtt is not None else 0.0
+        return one_way + player_info.get("view_delay", self.snapshot_buffer.interpolation_delay)
+    
+    def get_compression_stats(self):
+        """Compression ratio and CPU time per tick (host only)"""
+        return self.compressor.get_stats()
+    
     def get_connected_players(self):
         """Get list of connected players (for host UI)"""
         return list(self.connected_players.keys())
\ No newline at end of file
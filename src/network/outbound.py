@@ -0,0 +1,100 @@
+import json
+import struct
+import time
+
+# Input frame times go over the wire with this many decimals
+DT_DECIMALS = 4
+
+
+def quantize_dt(dt):
+    """A frame time as the host will see it; clients must predict with this same value"""
+    return round(dt, DT_DECIMALS)
+
+
+class OutboundAggregator:
+    """Coalesces a client's per-frame traffic into one message per network tick.
+
+    Input frames are buffered as compact [sequence, x, y, dt] rows (with the
+    attack target appended on frames where the player fired) and player
+    state is sent as a delta, so fields that rarely change (name, level,
+    weapon) only go over the wire when they actually do.
+    """
+
+    def __init__(self, tick_rate=30):
+        self.tick_rate = tick_rate
+        self.next_flush = 0.0
+
+        self.inputs = []
+        self.state = {}
+        self.sent_state = {}
+
+        # Interpolation delay of the client's view, in ms, so the host can rewind hit tests
+        self.view_delay = None
+        self.sent_view_delay = None
+
+        # Counters for comparing against the old per-frame messages
+        self.packets_sent = 0
+        self.bytes_sent = 0
+
+    def queue_input(self, sequence, move_input, dt, attack=None):
+        """Buffer one input frame until the next flush (dt already passed through quantize_dt)"""
+        row = [sequence, move_input[0], move_input[1], dt]
+        if attack is not None:
+            row.extend((round(attack[0], 1), round(attack[1], 1)))
+        self.inputs.append(row)
+
+    def update_state(self, player_data):
+        """Set the latest player state; only changed fields will be sent"""
+        self.state = player_data
+
+    def set_view_delay(self, delay):
+        """Report how far behind the host's clock the client renders (seconds)"""
+        self.view_delay = int(delay * 1000)
+
+    def build_message(self, now=None):
+        """Build the framed batch for this tick, or None if it is not due yet or empty"""
+        if now is None:
+            now = time.time()
+        # Small tolerance so frame timing noise doesn't skip a whole tick
+        if now < self.next_flush - 0.001:
+            return None
+
+        changed = {
+            key: value for key, value in self.state.items()
+            if self.sent_state.get(key) != value
+        }
+        delay_changed = self.view_delay is not None and self.view_delay != self.sent_view_delay
+        if not self.inputs and not changed and not delay_changed:
+            return None
+
+        batch = {"type": "batch"}
+        if self.inputs:
+            batch["inputs"] = self.inputs
+        if changed:
+            batch["state"] = changed
+        if delay_changed:
+            batch["delay"] = self.view_delay
+
+        message = json.dumps(batch, separators=(',', ':')).encode('utf-8')
+        # Prefix each message with a 4-byte length (network byte order)
+        message = struct.pack('>I', len(message)) + message
+
+        self.sent_state.update(changed)
+        self.sent_view_delay = self.view_delay
+        self.inputs = []
+        # Keep a steady cadence, but after falling behind (e.g. nothing to send) start over from now
+        interval = 1.0 / self.tick_rate
+        if now - self.next_flush < interval:
+            self.next_flush += interval
+        else:
+            self.next_flush = now + interval
+        self.packets_sent += 1
+        self.bytes_sent += len(message)
+        return message
+
+    def reset(self):
+        """Forget what was sent so the next batch carries the full state (e.g. new connection)"""
+        self.inputs = []
+        self.sent_state = {}
+        self.sent_view_delay = None
+        self.next_flush = 0.0
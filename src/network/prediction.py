@@ -0,0 +1,58 @@
+from collections import deque
+
+
+class InputPredictor:
+    """Client-side prediction of the local player from numbered input frames.
+
+    Every frame the client applies its input locally right away and keeps
+    it until the host acknowledges the frame number in a game_state. When
+    an authoritative state arrives, the player is reset to it and all
+    frames the host has not processed yet are replayed on top.
+    """
+
+    def __init__(self, max_pending=256):
+        self.next_sequence = 1
+        self.pending = deque(maxlen=max_pending)  # (sequence, move_input, dt)
+        self.last_acknowledged = 0
+
+        # Distance of the last correction, useful for spotting mispredictions
+        self.last_correction = 0.0
+
+    def record(self, move_input, dt):
+        """Remember an input frame that was applied locally and return its number"""
+        sequence = self.next_sequence
+        self.next_sequence += 1
+        self.pending.append((sequence, move_input, dt))
+        return sequence
+
+    def reconcile(self, player, authoritative_state):
+        """Reset the player to the host state and replay unacknowledged inputs"""
+        acknowledged = authoritative_state.get("last_input", 0)
+        if acknowledged <= self.last_acknowledged:
+            return False  # Already reconciled against this or a newer state
+        self.last_acknowledged = acknowledged
+
+        # Drop inputs the host has already simulated
+        while self.pending and self.pending[0][0] <= acknowledged:
+            self.pending.popleft()
+
+        predicted_x, predicted_y = player.x, player.y
+
+        # Rewind to the authoritative state
+        player.x = authoritative_state["x"]
+        player.y = authoritative_state["y"]
+        player.vx = authoritative_state.get("vx", 0)
+        player.vy = authoritative_state.get("vy", 0)
+
+        # Replay everything the host has not seen yet
+        for sequence, move_input, dt in self.pending:
+            player.apply_input(move_input, dt)
+
+        self.last_correction = ((player.x - predicted_x)**2 + (player.y - predicted_y)**2) ** 0.5
+        return True
+
+    def reset(self):
+        """Forget all pending inputs (e.g. after reconnecting)"""
+        self.pending.clear()
+        self.last_acknowledged = 0
+        self.last_correction = 0.0
@@ -0,0 +1,192 @@
+import json
+
+
+class ClientSendState:
+    """Per-client byte budget, priorities and what the client already has"""
+
+    def __init__(self, budget):
+        self.budget = budget  # bytes per second
+        self.allowance = 0.0  # token bucket, in bytes
+        self.last_update = None
+
+        self.priorities = {}  # {(category, entity_id): accumulated priority}
+        self.sent = {}  # {(category, entity_id): entity data last sent}
+
+        # Bytes on the wire per estimated byte (compression makes this < 1)
+        self.wire_ratio = 1.0
+        self.last_estimate = 0
+
+        self.bytes_sent = 0
+        self.packets_sent = 0
+        self.entities_skipped = 0  # Entities left for a later packet in the last tick
+
+
+class SendScheduler:
+    """Bandwidth-budgeted snapshot scheduler for the host.
+
+    Every client has a byte budget per second that grows while its sends go
+    through quickly and shrinks when they back up (additive increase,
+    multiplicative decrease). Each tick, every entity gains priority for
+    that client based on distance to the client's player, time since it was
+    last sent and whether it changed. Packets are filled with the highest
+    priority entities until the budget for the tick runs out, so a slow
+    link gets fewer, more relevant updates instead of an ever-growing
+    backlog.
+    """
+
+    def __init__(self, initial_budget=64 * 1024, min_budget=4 * 1024, max_budget=1024 * 1024):
+        self.initial_budget = initial_budget
+        self.min_budget = min_budget
+        self.max_budget = max_budget
+        self.clients = {}  # {player_id: ClientSendState}
+
+        # Base priority gained per second by each category
+        self.category_weights = {"players": 4.0, "monsters": 2.0, "projectiles": 1.0}
+        self.changed_multiplier = 3.0
+        self.distance_falloff = 400  # pixels at which the distance factor halves
+
+        # Don't bother sending fragments smaller than this; wait for more budget instead
+        self.min_packet = 256
+
+    def client(self, player_id):
+        state = self.clients.get(player_id)
+        if state is None:
+            state = self.clients[player_id] = ClientSendState(self.initial_budget)
+        return state
+
+    def remove_client(self, player_id):
+        self.clients.pop(player_id, None)
+
+    def prime(self, player_id, game_state):
+        """Record that a client already holds game_state (e.g. sent as a catch-up snapshot)"""
+        client = self.client(player_id)
+        for category, entities in game_state.items():
+            if isinstance(entities, dict):
+                for entity_id, entity in entities.items():
+                    client.sent[(category, entity_id)] = entity
+            else:
+                client.sent[(category, None)] = entities
+
+    @staticmethod
+    def measure(game_state):
+        """Serialised size of each entity, computed once per tick and shared by all clients"""
+        sizes = {}
+        for category, entities in game_state.items():
+            if isinstance(entities, dict):
+                for entity_id, entity in entities.items():
+                    sizes[(category, entity_id)] = len(json.dumps(entity)) + len(entity_id) + 4
+            else:
+                # Unkeyed lists (projectiles) are scheduled as one group
+                sizes[(category, None)] = len(json.dumps(entities)) + len(category) + 4
+        return sizes
+
+    def build(self, player_id, game_state, sizes, now):
+        """Pick the entities to send to one client this tick.
+
+        Returns (data, removed) to send, or None if the client has no budget yet.
+        """
+        client = self.client(player_id)
+        dt = now - client.last_update if client.last_update is not None else 0.0
+        client.last_update = now
+
+        # Refill the token bucket, capped so an idle client can't burst unbounded
+        client.allowance = min(client.allowance + client.budget * dt, client.budget * 0.25)
+
+        own = game_state.get("players", {}).get(player_id)
+        own_x = own["x"] if own and "x" in own else None
+        own_y = own["y"] if own and "x" in own else None
+
+        # Accumulate priority
+        present = set()
+        for category, entities in game_state.items():
+            weight = self.category_weights.get(category, 1.0)
+            items = entities.items() if isinstance(entities, dict) else [(None, entities)]
+            for entity_id, entity in items:
+                key = (category, entity_id)
+                present.add(key)
+                priority = weight
+                if isinstance(entity, dict) and own_x is not None and "x" in entity:
+                    distance = ((entity["x"] - own_x)**2 + (entity["y"] - own_y)**2) ** 0.5
+                    priority /= 1 + distance / self.distance_falloff
+                if client.sent.get(key) != entity:
+                    priority *= self.changed_multiplier
+                elif key in client.sent:
+                    # Unchanged and already on the client: nothing to gain from resending
+                    client.priorities[key] = 0.0
+                    continue
+                client.priorities[key] = client.priorities.get(key, 0.0) + priority * max(dt, 0.001)
+
+        # Entities the client knows about that no longer exist
+        removed = {}
+        for key in [key for key in client.sent if key not in present]:
+            del client.sent[key]
+            client.priorities.pop(key, None)
+            if key[1] is not None:
+                removed.setdefault(key[0], []).append(key[1])
+
+        if client.allowance < self.min_packet and not removed:
+            return None
+
+        # The client's own player always goes first so prediction can reconcile
+        if own is not None:
+            client.priorities[("players", player_id)] = float("inf")
+
+        # Fill the packet with the highest priority entities
+        data = {}
+        budget = client.allowance
+        ranked = sorted((priority, key) for key, priority in client.priorities.items() if priority > 0)
+        client.entities_skipped = 0
+        estimate = 0
+        ranked.reverse()
+        for index, (priority, key) in enumerate(ranked):
+            size = sizes.get(key, 0) * client.wire_ratio
+            if size > budget and data:
+                # Stop in strict priority order so the leftover allowance carries over
+                # and a large entity isn't starved by a stream of small ones
+                client.entities_skipped = len(ranked) - index
+                break
+            category, entity_id = key
+            entity = game_state[category] if entity_id is None else game_state[category][entity_id]
+            if entity_id is None:
+                data[category] = entity
+            else:
+                data.setdefault(category, {})[entity_id] = entity
+            client.sent[key] = entity
+            client.priorities[key] = 0.0
+            budget -= size
+            estimate += sizes.get(key, 0)
+
+        if not data and not removed:
+            return None
+        client.allowance = budget
+        client.last_estimate = estimate
+        return data, removed
+
+    def on_sent(self, player_id, size, send_time, interval):
+        """Adapt the budget from how long the send blocked"""
+        client = self.client(player_id)
+        client.bytes_sent += size
+        client.packets_sent += 1
+
+        # Learn how estimated sizes translate to wire bytes
+        if client.last_estimate > 0:
+            ratio = min(1.0, size / client.last_estimate)
+            client.wire_ratio += (ratio - client.wire_ratio) * 0.2
+            client.last_estimate = 0
+
+        if send_time > interval * 0.5:
+            # The socket buffer is full: the link can't keep up
+            client.budget = max(self.min_budget, client.budget * 0.7)
+        else:
+            client.budget = min(self.max_budget, client.budget + max(2 * 1024, client.budget * 0.05))
+
+    def get_stats(self, player_id):
+        client = self.clients.get(player_id)
+        if client is None:
+            return None
+        return {
+            "budget_bytes_per_sec": client.budget,
+            "packets_sent": client.packets_sent,
+            "bytes_sent": client.bytes_sent,
+            "entities_skipped": client.entities_skipped
+        }
@@ -0,0 +1,141 @@
+import threading
+import time
+from collections import deque
+
+
+class SnapshotBuffer:
+    """Client-side timeline of recent game_state snapshots.
+
+    Remote entities are rendered slightly in the past so that there are
+    always two snapshots to interpolate between. The delay adapts to the
+    measured arrival jitter, and short gaps are covered by extrapolating
+    along the last known velocity.
+    """
+
+    def __init__(self, capacity=32, min_delay=0.05, max_delay=0.35, max_extrapolation=0.25):
+        self.snapshots = deque(maxlen=capacity)  # (server_time, data)
+        self.lock = threading.Lock()
+
+        # Clock offset estimate (local clock - server clock)
+        self.clock_offset = None
+        self.offset_smoothing = 0.05
+
+        # Arrival statistics for the adaptive delay
+        self.last_server_time = None
+        self.last_local_time = None
+        self.average_interval = 1 / 30
+        self.jitter = 0.0
+
+        # Interpolation delay (seconds behind the newest snapshot)
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.interpolation_delay = 0.1
+        self.max_extrapolation = max_extrapolation
+
+    def add(self, data, server_time, local_time=None):
+        """Store a snapshot received from the host"""
+        if local_time is None:
+            local_time = time.time()
+
+        with self.lock:
+            # Drop out-of-order snapshots
+            if self.snapshots and server_time <= self.snapshots[-1][0]:
+                return
+
+            # Track the lowest observed offset (least delayed packet) and let it
+            # drift slowly upwards so clock skew does not pin it forever
+            offset = local_time - server_time
+            if self.clock_offset is None or offset < self.clock_offset:
+                self.clock_offset = offset
+            else:
+                self.clock_offset += (offset - self.clock_offset) * self.offset_smoothing * 0.1
+
+            # Jitter is the difference between send spacing and arrival spacing
+            if self.last_server_time is not None:
+                send_interval = server_time - self.last_server_time
+                arrival_interval = local_time - self.last_local_time
+                self.average_interval += (send_interval - self.average_interval) * 0.1
+                self.jitter += (abs(arrival_interval - send_interval) - self.jitter) * 0.1
+            self.last_server_time = server_time
+            self.last_local_time = local_time
+
+            # Keep one and a half send intervals plus two jitter deviations buffered
+            target_delay = self.average_interval * 1.5 + self.jitter * 2
+            target_delay = max(self.min_delay, min(self.max_delay, target_delay))
+            self.interpolation_delay += (target_delay - self.interpolation_delay) * 0.1
+
+            self.snapshots.append((server_time, data))
+
+    def clear(self):
+        """Forget all buffered snapshots"""
+        with self.lock:
+            self.snapshots.clear()
+            self.clock_offset = None
+            self.last_server_time = None
+            self.last_local_time = None
+
+    def latest(self):
+        """Newest snapshot data, or None if nothing has arrived yet"""
+        with self.lock:
+            if not self.snapshots:
+                return None
+            return self.snapshots[-1][1]
+
+    def render_time(self, local_time=None):
+        """Server time that should currently be on screen"""
+        if local_time is None:
+            local_time = time.time()
+        if self.clock_offset is None:
+            return None
+        return local_time - self.clock_offset - self.interpolation_delay
+
+    def sample(self, category, local_time=None):
+        """Get interpolated entities of a category ("players", "monsters") at the render time"""
+        with self.lock:
+            if not self.snapshots:
+                return {}
+            target = self.render_time(local_time)
+            snapshots = list(self.snapshots)
+
+        # Find the pair of snapshots around the render time
+        older = None
+        newer = None
+        for snapshot in snapshots:
+            if snapshot[0] <= target:
+                older = snapshot
+            else:
+                newer = snapshot
+                break
+
+        if older is None:
+            # Render time is before the buffer, show the oldest snapshot as-is
+            return dict(snapshots[0][1].get(category, {}))
+
+        if newer is not None:
+            span = newer[0] - older[0]
+            t = (target - older[0]) / span if span > 0 else 1.0
+            return self._blend(older[1].get(category, {}), newer[1].get(category, {}), t)
+
+        # Ran out of snapshots: extrapolate from the last two for a short while
+        if len(snapshots) < 2:
+            return dict(older[1].get(category, {}))
+        previous = snapshots[-2]
+        span = older[0] - previous[0]
+        ahead = min(target - older[0], self.max_extrapolation)
+        t = 1.0 + ahead / span if span > 0 else 1.0
+        return self._blend(previous[1].get(category, {}), older[1].get(category, {}), t)
+
+    def _blend(self, start, end, t):
+        """Linearly blend positions between two entity dicts (t > 1 extrapolates)"""
+        result = {}
+        for entity_id, end_data in end.items():
+            start_data = start.get(entity_id)
+            if start_data is None or "x" not in start_data or "x" not in end_data:
+                # Entity just appeared, nothing to blend from
+                result[entity_id] = end_data
+                continue
+            blended = dict(end_data)
+            blended["x"] = start_data["x"] + (end_data["x"] - start_data["x"]) * t
+            blended["y"] = start_data["y"] + (end_data["y"] - start_data["y"]) * t
+            result[entity_id] = blended
+        return result
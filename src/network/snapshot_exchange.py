@@ -0,0 +1,46 @@
+import time
+from collections import deque
+
+
+class SnapshotExchange:
+    """Hands game state between the simulation thread and the network threads.
+
+    The simulation owns the working game_state and is the only thread that
+    mutates it. Once per tick it publishes a private copy by swapping a single
+    reference, so network threads always see a complete tick and never a dict
+    that is being changed under them. Old snapshots are simply dropped when
+    nothing references them any more.
+
+    Client traffic goes the other way through a deque, whose append and
+    popleft are atomic, so receive threads never wait on the simulation.
+    """
+
+    def __init__(self):
+        self.inbound = deque()
+        self.published = None  # (tick, timestamp, data)
+        self.tick = 0
+
+    def push(self, event):
+        """Queue an inbound event from a network thread"""
+        self.inbound.append(event)
+
+    def drain(self):
+        """Take all queued events (simulation thread, once per tick)"""
+        events = []
+        while True:
+            try:
+                events.append(self.inbound.popleft())
+            except IndexError:
+                return events
+
+    def publish(self, game_state):
+        """Publish a copy of the game state for the network threads"""
+        data = {}
+        for category, entities in game_state.items():
+            if isinstance(entities, dict):
+                data[category] = {entity_id: dict(entity) for entity_id, entity in entities.items()}
+            else:
+                data[category] = [dict(entity) for entity in entities]
+        self.tick += 1
+        # A single reference assignment, so readers get the old or the new snapshot, never a mix
+        self.published = (self.tick, time.time(), data)
@@ -0,0 +1,118 @@
+import threading
+import time
+
+
+class RateCounter:
+    """Rolling per-second rate over the last few seconds, bucketed by whole second"""
+
+    def __init__(self, window=5):
+        self.window = window
+        self.buckets = {}  # {second: amount}
+        self.total = 0
+        self.lock = threading.Lock()
+
+    def add(self, amount, now=None):
+        if now is None:
+            now = time.time()
+        second = int(now)
+        with self.lock:
+            self.buckets[second] = self.buckets.get(second, 0) + amount
+            self.total += amount
+            # Drop buckets that fell out of the window
+            if len(self.buckets) > self.window + 1:
+                for old in [s for s in self.buckets if s <= second - self.window]:
+                    del self.buckets[old]
+
+    def rate(self, now=None):
+        """Average amount per second over the completed seconds in the window"""
+        if now is None:
+            now = time.time()
+        current = int(now)
+        with self.lock:
+            amount = sum(value for second, value in self.buckets.items()
+                         if current - self.window <= second < current)
+        return amount / self.window
+
+
+class LinkStats:
+    """Traffic and latency for one connection (a client on the host, or the host on a client)"""
+
+    def __init__(self):
+        self.bytes_in = RateCounter()
+        self.bytes_out = RateCounter()
+        self.messages_in = RateCounter()
+        self.messages_out = RateCounter()
+
+        self.rtt = None
+        self.jitter = 0.0
+        self.last_rtt = None
+
+    def record_in(self, size):
+        self.bytes_in.add(size)
+        self.messages_in.add(1)
+
+    def record_out(self, size):
+        self.bytes_out.add(size)
+        self.messages_out.add(1)
+
+    def record_rtt(self, rtt):
+        """Smooth the round trip time and track its variation (jitter)"""
+        if self.rtt is None:
+            self.rtt = rtt
+        else:
+            self.rtt += (rtt - self.rtt) * 0.125
+        if self.last_rtt is not None:
+            self.jitter += (abs(rtt - self.last_rtt) - self.jitter) * 0.125
+        self.last_rtt = rtt
+
+    def get_stats(self):
+        return {
+            "rtt_ms": self.rtt * 1000 if self.rtt is not None else None,
+            "jitter_ms": self.jitter * 1000,
+            "bytes_in_per_sec": self.bytes_in.rate(),
+            "bytes_out_per_sec": self.bytes_out.rate(),
+            "messages_in_per_sec": self.messages_in.rate(),
+            "messages_out_per_sec": self.messages_out.rate()
+        }
+
+
+class NetworkTelemetry:
+    """Network statistics collected by a NetworkManager"""
+
+    def __init__(self):
+        self.links = {}  # {player_id or "host": LinkStats}
+        self.snapshot_sizes = {}  # {entity type: bytes in the last measured snapshot}
+        self.snapshot_total_size = 0
+        self.reconnects = {}  # {client address or "host": count}
+        self.lock = threading.Lock()
+
+    def link(self, peer):
+        """Get (or create) the stats for a peer"""
+        with self.lock:
+            stats = self.links.get(peer)
+            if stats is None:
+                stats = self.links[peer] = LinkStats()
+            return stats
+
+    def remove_link(self, peer):
+        with self.lock:
+            self.links.pop(peer, None)
+
+    def record_reconnect(self, peer):
+        with self.lock:
+            self.reconnects[peer] = self.reconnects.get(peer, 0) + 1
+
+    def record_snapshot_sizes(self, sizes, total):
+        self.snapshot_sizes = sizes
+        self.snapshot_total_size = total
+
+    def get_stats(self):
+        with self.lock:
+            links = dict(self.links)
+            reconnects = dict(self.reconnects)
+        return {
+            "links": {peer: stats.get_stats() for peer, stats in links.items()},
+            "snapshot_sizes": dict(self.snapshot_sizes),
+            "snapshot_total_size": self.snapshot_total_size,
+            "reconnects": reconnects
+        }
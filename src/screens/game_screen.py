@@ -1,18 +1,32 @@
 import pygame
-import random
+import os
+import time
 from entities.player import Player
 from entities.monster import Monster
+from weapons.projectile import Projectile
+from weapons.registry import get_weapon_registry
 from network.network_manager import NetworkManager
+from network.prediction import InputPredictor
+from network.outbound import quantize_dt
+from world.registry import EntityRegistry
+from world.simulation import WorldSimulation
+from world.spawner import MonsterSpawner
+from world.tilemap import TileMap, TileRenderer
+from world.replay import InputRecorder, RECORDINGS_DIR
+from storage.save_format import SAVES_DIR, SaveFormatError, save_path
+from storage.world_save import capture_world, chunk_dir, load_world
+from storage.autosave import Autosaver
+from tools.profiler import FrameProfiler
 from screens.settings import SettingsScreen
 
 class GameScreen:
-    def __init__(self, screen, save_file=None):
+    def __init__(self, screen, save_file=None, network_manager=None, record_inputs=False):
         self.screen = screen
         self.font = pygame.font.Font(None, 36)
         self.small_font = pygame.font.Font(None, 20)
         
-        # Network manager
-        self.network_manager = NetworkManager()
+        # Network manager (reuse the one that joined a game, if any)
+        self.network_manager = network_manager if network_manager else NetworkManager()
         
         # Camera position (player is always centered)
         self.camera_x = 0
@@ -24,28 +38,68 @@ class GameScreen:
         
         # Create player
         player_id = self.network_manager.player_id if self.network_manager.player_id else "player_1"
-        self.player = Player(400, 300, player_id)  # Start at center of screen
+        self.player = Player(400, 300, player_id, is_local=True)  # Start at center of screen
         
-        # Create other players (for multiplayer)
-        self.other_players = []
-        
-        # Create monsters
-        self.monsters = []
-        for _ in range(5):
-            x = random.randint(100, 700)
-            y = random.randint(100, 500)
-            self.monsters.append(Monster(x, y))
-        
-        # All entities list for collision detection
-        self.entities = [self.player] + self.monsters
+        # Offline and hosted games simulate the world here; clients only mirror the host's
+        if self.network_manager.is_connected and not self.network_manager.is_host:
+            self.simulation = None
+            self.registry = EntityRegistry()
+            self.registry.add(self.player, "player", key=player_id)
+        else:
+            # Open world: monsters are generated chunk by chunk from a seed, as dense as the difficulty says
+            spawner = MonsterSpawner(difficulty=SettingsScreen.last_difficulty)
+            self.simulation = WorldSimulation(self.network_manager, local_player=self.player, spawner=spawner)
+            # Every entity in the world gets a stable ID from the registry
+            self.registry = self.simulation.registry
+        
+        # Client-side prediction of the local player (host stays authoritative)
+        self.predictor = InputPredictor()
+        self.session_epoch = self.network_manager.session_epoch  # Client: session the state below belongs to
+        self.pending_attack = None  # Attack target for the next input frame (a client's goes to the host)
+        
+        # Other players and monsters, kept up to date by the registry
+        # (replicated proxies on a client)
+        self.other_players = self.registry.kind("remote_player")
+        self.monsters = self.registry.kind("monster")
+        
+        # Client: projectiles from the last snapshot, moved along their velocity between snapshots
+        self.projectiles = []
+        self.last_snapshot = None  # Newest snapshot from the host already applied
         
         # Mouse position for targeting
         self.mouse_x = 0
         self.mouse_y = 0
         
         # Load save if provided
+        self.save_file = save_file
+        self.playtime = 0.0  # seconds
         if save_file:
             self.load_game(save_file)
+        
+        # Walls and terrain from the world seed (a client gets the host's seed when joining;
+        # a dedicated server's arena has none, leaving the plain grid)
+        seed = self.simulation.chunks.spawner.seed if self.simulation else self.network_manager.world_seed
+        self.tilemap = None
+        self.tile_renderer = None
+        if seed is not None:
+            self.tilemap = TileMap(seed)
+            self.tile_renderer = TileRenderer(self.tilemap)
+            self.player.terrain = self.tilemap
+            if self.simulation:
+                self.simulation.tilemap = self.tilemap
+                self.simulation.chunks.spawner.tilemap = self.tilemap
+                self.network_manager.world_seed = seed
+        
+        # Frame timings (F3 shows them) and background autosaves
+        self.profiler = FrameProfiler()
+        self.show_profiler = False
+        self.autosaver = Autosaver(profiler=self.profiler)
+        
+        # Input recording; only a new offline game is fully determined by its seed and inputs
+        self.record_inputs = record_inputs  # main.py --record
+        self.recorder = None
+        if record_inputs and self.simulation and not save_file and not self.network_manager.is_host:
+            self.recorder = InputRecorder(self.simulation.seed, self.difficulty)
             
         # Menu
         self.paused = False
@@ -75,12 +129,21 @@ class GameScreen:
                     # Convert mouse position to world coordinates
                     world_x = self.mouse_x + self.camera_x
                     world_y = self.mouse_y + self.camera_y
-                    self.player.attack(world_x, world_y)
+                    # Fired with the next input frame (by the host, on a client)
+                    self.pending_attack = (world_x, world_y)
         
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE:
                 self.paused = not self.paused
                 return None
+            if event.key == pygame.K_F3:
+                self.show_profiler = not self.show_profiler
+                return None
+            if not self.paused and pygame.K_0 <= event.key <= pygame.K_9:
+                # Number keys pick a weapon by its ID in the table (0 is Unarmed);
+                # a client's choice reaches the host with its next state update
+                self.player.equip_weapon(get_weapon_registry().get(event.key - pygame.K_0))
+                return None
         
         if self.paused:
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
@@ -98,45 +161,74 @@ class GameScreen:
             settings_screen = SettingsScreen(self.screen, self)
             return settings_screen
         elif action == "save_quit":
+            self.save_game()
+            self.save_recording()
+            
             # Stop network sharing when quitting to main menu
             self.network_manager.stop_networking()
             
-            # TODO: Save game
             from screens.main_menu import MainMenu
-            return MainMenu(self.screen)
+            return MainMenu(self.screen, self.record_inputs)
         return None
     
-    def update(self, dt):
-        if not self.paused:
-            # Update player
-            self.player.update(dt)
-            
-            # Update other players
-            for other_player in self.other_players:
-                other_player.update(dt)
-            
-            # Update monsters
-            for monster in self.monsters:
-                monster.update(dt, self.player.x, self.player.y)
-            
-            # Handle collisions between entities
-            for i in range(len(self.entities)):
-                for j in range(i+1, len(self.entities)):
-                    if self.entities[i].check_collision(self.entities[j]):
-                        self.entities[i].resolve_collision(self.entities[j])
-            
-            # Handle projectile collisions
-            self.handle_projectile_collisions()
-            
-            # Update camera to follow player
-            self.camera_x = self.player.x - self.screen.get_width() // 2
-            self.camera_y = self.player.y - self.screen.get_height() // 2
-            
-            # Update network state
-            self.update_network_state()
-            
-            # Update from network state
-            self.update_from_network_state()
+    def load_game(self, save_file):
+        """Restore the player and world from a save in the saves directory"""
+        if self.simulation is None:
+            return  # A client's world belongs to the host
+        try:
+            info = load_world(save_path(save_file), self.player, self.registry, self.simulation.chunks)
+            self.playtime = info.playtime
+            print(f"Loaded {save_file}")
+        except (OSError, SaveFormatError) as e:
+            # Empty or unreadable saves start a fresh game in that slot
+            print(f"Error loading save {save_file}: {e}")
+    
+    @property
+    def difficulty(self):
+        if self.simulation is None or self.simulation.chunks.spawner is None:
+            return SettingsScreen.last_difficulty
+        return self.simulation.chunks.spawner.difficulty
+    
+    def set_difficulty(self, difficulty):
+        """Density of monsters in chunks generated from now on (host or offline only)"""
+        if self.simulation is not None and self.simulation.chunks.spawner is not None:
+            self.simulation.chunks.spawner.difficulty = difficulty
+    
+    def save_game(self):
+        """Write the player and world to this game's save file and wait for it"""
+        if self.simulation is None:
+            return
+        if self.start_save():
+            self.autosaver.wait()
+            print(f"Saved {self.save_file}")
+    
+    def start_save(self):
+        """Snapshot the world and hand it to the autosaver's background writer"""
+        if not self.save_file:
+            self.save_file = time.strftime("save_%Y%m%d_%H%M%S.save")
+        try:
+            os.makedirs(SAVES_DIR, exist_ok=True)
+        except OSError as e:
+            print(f"Error saving game: {e}")
+            return False
+        name = os.path.splitext(self.save_file)[0]
+        self.simulation.chunks.directory = chunk_dir(save_path(self.save_file))
+        self.autosaver.save(save_path(self.save_file),
+                            lambda: capture_world(self.player, self.monsters.values(), self.playtime, name,
+                                                  chunks=self.simulation.chunks))
+        return True
+    
+    def save_recording(self):
+        """Write the input recording, if this game has one, to the recordings directory"""
+        if self.recorder is None:
+            return
+        try:
+            os.makedirs(RECORDINGS_DIR, exist_ok=True)
+            path = os.path.join(RECORDINGS_DIR, time.strftime("game_%Y%m%d_%H%M%S.rec"))
+            self.recorder.save(path)
+            print(f"Recorded {self.recorder.frame_count} frames to {path}")
+        except OSError as e:
+            print(f"Error saving recording: {e}")
     
     def update_network_state(self):
         """Update network state with current game state"""
@@ -148,67 +240,75 @@ class GameScreen:
             "max_health": self.player.max_health,
             "name": "Player",
             "level": self.player.level,
-            "weapon": self.player.weapon_name
+            "weapon": self.player.weapon.weapon_id
         }
         
-        self.network_manager.game_state["players"][self.player.player_id] = player_data
-        
-        # Send player update to server if we're a client
-        if self.network_manager.is_connected and not self.network_manager.is_host:
-            self.network_manager.send_player_update(player_data)
-        
-        # Update monster positions (only host should do this)
-        if self.network_manager.is_host:
-            for i, monster in enumerate(self.monsters):
-                self.network_manager.game_state["monsters"][f"monster_{i}"] = {
-                    "x": monster.x,
-                    "y": monster.y,
-                    "health": monster.current_health,
-                    "max_health": monster.max_health
-                }
-        
-        # Update projectiles (only host should do this)
-        if self.network_manager.is_host:
-            all_projectiles = []
-            # Player projectiles
-            for proj in self.player.projectiles:
-                all_projectiles.append({
-                    "x": proj.x,
-                    "y": proj.y,
-                    "vx": proj.vx,
-                    "vy": proj.vy,
-                    "owner": "player"
-                })
-            
-            # Monster projectiles
-            for monster in self.monsters:
-                for proj in monster.projectiles:
-                    all_projectiles.append({
-                        "x": proj.x,
-                        "y": proj.y,
-                        "vx": proj.vx,
-                        "vy": proj.vy,
-                        "owner": "monster"
-                    })
-            
-            self.network_manager.game_state["projectiles"] = all_projectiles
+        if self.simulation:
+            # Hosting or offline: our player is part of the world's game_state
+            self.network_manager.game_state["players"][self.player.player_id] = player_data
+        elif self.network_manager.is_connected:
+            # Send player update to server if we're a client (position travels as input frames,
+            # health and level are the host's to decide). Updates are batched and only sent
+            # once per network tick. A client's game_state is the host's last snapshot (the
+            # same object the snapshot buffer holds), so it is never written to here.
+            self.network_manager.outbound.update_state(
+                {"name": player_data["name"], "weapon": player_data["weapon"]}
+            )
+            self.network_manager.outbound.set_view_delay(self.network_manager.snapshot_buffer.interpolation_delay)
+            self.network_manager.flush_outbound()
     
     def update_from_network_state(self):
-        """Update game state from network data"""
-        # Update other players
-        if "players" in self.network_manager.game_state:
-            # Create a list to hold the updated players
-            updated_players = []
+        """Mirror the host's world on a client (the host's own world is the simulation)"""
+        if self.simulation or not self.network_manager.is_connected:
+            return
+        
+        # Clients render remote players and monsters from the interpolated snapshot timeline
+        network_players = self.network_manager.snapshot_buffer.sample("players")
+        network_monsters = self.network_manager.snapshot_buffer.sample("monsters")
+        
+        latest = self.network_manager.snapshot_buffer.latest()
+        if latest:
+            # Reconcile the predicted local player with the newest authoritative state
+            own_state = latest.get("players", {}).get(self.player.player_id)
+            if own_state and "x" in own_state:
+                self.predictor.reconcile(self.player, own_state)
             
+            if latest is not self.last_snapshot:
+                self.last_snapshot = latest
+                
+                # Our health and progression are whatever the host's snapshot says
+                if own_state:
+                    self.apply_own_state(own_state)
+                
+                # Restart the projectile proxies whenever a new snapshot arrives
+                self.projectiles = [
+                    Projectile(proj["x"], proj["y"], proj["vx"], proj["vy"], 0, proj["owner"], proj.get("type", "bullet"))
+                    for proj in latest.get("projectiles", [])
+                ]
+        
+        # Update monster proxies
+        for key, monster_data in network_monsters.items():
+            monster = self.registry.find(key)
+            if monster is None:
+                monster = Monster(monster_data["x"], monster_data["y"])
+                self.registry.add(monster, "monster", key=key)
+            monster.x = monster_data["x"]
+            monster.y = monster_data["y"]
+            if "radius" in monster_data:
+                monster.radius = monster.collision_radius = monster_data["radius"]
+            monster.current_health = monster_data["health"]
+            monster.max_health = monster_data["max_health"]
+        for entity_id in [entity_id for entity_id, monster in self.monsters.items()
+                          if self.registry.key_of(entity_id) not in network_monsters]:
+            self.registry.remove(entity_id)
+        
+        # Update other players
+        if network_players is not None:
             # Process each player from the network state
-            for player_id, player_data in self.network_manager.game_state["players"].items():
+            for player_id, player_data in network_players.items():
                 if player_id != self.player.player_id:  # Skip main player
                     # Check if player already exists
-                    existing_player = None
-                    for p in self.other_players:
-                        if p.player_id == player_id:
-                            existing_player = p
-                            break
+                    existing_player = self.registry.find(player_id)
                     
                     if existing_player:
                         # Update existing player
@@ -217,50 +317,45 @@ class GameScreen:
                         existing_player.current_health = player_data["health"]
                         existing_player.max_health = player_data["max_health"]
                         existing_player.level = player_data["level"]
-                        existing_player.weapon_name = player_data["weapon"]
-                        updated_players.append(existing_player)
+                        existing_player.equip_weapon(get_weapon_registry().get(player_data["weapon"]))
                     else:
                         # Create new player
-                        new_player = Player(player_data["x"], player_data["y"], player_id)
+                        new_player = Player(player_data["x"], player_data["y"], player_id, is_local=False)
                         new_player.current_health = player_data["health"]
                         new_player.max_health = player_data["max_health"]
                         new_player.level = player_data["level"]
-                        new_player.weapon_name = player_data["weapon"]
-                        updated_players.append(new_player)
+                        new_player.equip_weapon(get_weapon_registry().get(player_data["weapon"]))
+                        self.registry.add(new_player, "remote_player", key=player_id)
             
-            # Update the other_players list
-            self.other_players = updated_players
+            # Remove players that left
+            for entity_id, other_player in list(self.other_players.items()):
+                if other_player.player_id not in network_players:
+                    self.registry.remove(entity_id)
     
-    def handle_projectile_collisions(self):
-        """Handle collisions between projectiles and entities"""
-        # Player projectiles hitting monsters
-        for projectile in self.player.projectiles:
-            for monster in self.monsters:
-                if projectile.check_collision(monster):
-                    monster.current_health -= projectile.damage
-                    # Remove projectile on hit
-                    if projectile in self.player.projectiles:
-                        self.player.projectiles.remove(projectile)
-                    # Remove monster if dead
-                    if monster.current_health <= 0:
-                        self.monsters.remove(monster)
-                        self.entities.remove(monster)
-                        # Give player experience for killing monster
-                        self.player.gain_experience(20)
-                    break
-        
-        # Monster projectiles hitting player
-        for monster in self.monsters:
-            for projectile in monster.projectiles:
-                if projectile.check_collision(self.player):
-                    self.player.current_health -= projectile.damage
-                    # Remove projectile on hit
-                    if projectile in monster.projectiles:
-                        monster.projectiles.remove(projectile)
-                    # Remove player if dead (in a real game, this would trigger game over)
-                    if self.player.current_health <= 0:
-                        self.player.current_health = 0
-                    break
+    def start_session(self):
+        """Client: the connection was resumed or rejoined; start over from what the host sends next"""
+        self.session_epoch = self.network_manager.session_epoch
+        self.predictor.reset()
+        self.projectiles = []
+        self.last_snapshot = None
+        for entity_id in list(self.other_players) + list(self.monsters):
+            self.registry.remove(entity_id)
+        
+        # Rejoining after the grace period makes us a new player on the host
+        player_id = self.network_manager.player_id
+        if player_id != self.player.player_id:
+            print(f"Playing as {player_id} (was {self.player.player_id})")
+            self.registry.remove(self.player.entity_id)
+            self.player.player_id = player_id
+            self.registry.add(self.player, "player", key=player_id)
+    
+    def apply_own_state(self, own_state):
+        """Take the host's word on our health and progression (own_state is from a received snapshot)"""
+        while self.player.level < own_state.get("level", self.player.level):
+            self.player.level_up()  # Keeps movement stats in step with the host's copy
+        self.player.current_health = own_state.get("health", self.player.current_health)
+        self.player.max_health = own_state.get("max_health", self.player.max_health)
+        self.player.experience = own_state.get("experience", self.player.experience)
     
     def draw_grid(self):
         """Draw a grid on the background"""
@@ -323,20 +418,52 @@ class GameScreen:
             self.screen.blit(coord_text, coord_rect)
     
     def draw(self):
+        with self.profiler.measure("draw"):
+            self._draw()
+        if self.show_profiler:
+            self.draw_profiler()
+    
+    def draw_profiler(self):
+        """Frame timings over the last couple of seconds, plus autosave costs"""
+        lines = [f"{name}: avg {stats['avg_ms']:.2f} ms, max {stats['max_ms']:.2f} ms"
+                 for name, stats in sorted(self.profiler.get_stats().items())]
+        if self.simulation:
+            chunks = self.simulation.chunks.get_stats()
+            lines.append(f"chunks: {chunks['resident']} resident, {chunks['dirty']} dirty,"
+                         f" {chunks['unsaved']} unsaved; monsters {len(self.monsters)}")
+            counts = self.simulation.projectiles.counts
+            if counts:
+                lines.append("projectiles: " + ", ".join(f"{name} {count}" for name, count in sorted(counts.items())))
+        autosave = self.autosaver.get_stats()
+        if autosave["saves_written"]:
+            lines.append(f"last autosave: snapshot {autosave['snapshot_ms']:.2f} ms,"
+                         f" write {autosave['write_ms']:.1f} ms (background)")
+        for i, line in enumerate(lines):
+            text = self.small_font.render(line, True, (255, 255, 0))
+            self.screen.blit(text, (self.screen.get_width() - text.get_width() - 10, 10 + i * 20))
+    
+    def _draw(self):
         # Draw game world with grid background
         self.screen.fill((30, 30, 30))  # Dark background
-        self.draw_grid()
+        if self.tile_renderer:
+            self.tile_renderer.draw(self.screen, self.camera_x, self.camera_y)
+        else:
+            self.draw_grid()
         
         # Draw other players
-        for other_player in self.other_players:
+        for other_player in self.other_players.values():
             other_player.draw(self.screen, self.camera_x, self.camera_y)
             self.draw_entity_info(other_player, self.camera_x, self.camera_y)
         
         # Draw monsters
-        for monster in self.monsters:
+        for monster in self.monsters.values():
             monster.draw(self.screen, self.camera_x, self.camera_y)
             self.draw_entity_info(monster, self.camera_x, self.camera_y)
         
+        # Draw replicated projectiles (client)
+        for projectile in self.projectiles:
+            projectile.draw(self.screen, self.camera_x, self.camera_y)
+        
         # Draw player (should be drawn last so it's on top)
         self.player.draw(self.screen, self.camera_x, self.camera_y)
         self.draw_entity_info(self.player, self.camera_x, self.camera_y)
@@ -365,13 +492,30 @@ class GameScreen:
         # Host UI - show connected players
         if self.network_manager.is_host:
             connected_players = self.network_manager.get_connected_players()
+            list_top = self.screen.get_height() - 30 - len(connected_players) * 20
             players_text = self.small_font.render(f"Connected players: {len(connected_players) + 1}", True, (255, 255, 255))
-            self.screen.blit(players_text, (10, self.screen.get_height() - 60))
+            self.screen.blit(players_text, (10, list_top - 30))
+            
+            # Snapshot size split by entity type
+            telemetry = self.network_manager.get_telemetry()
+            sizes = ", ".join(f"{category} {size} B" for category, size in telemetry["snapshot_sizes"].items())
+            if sizes:
+                sizes_text = self.small_font.render(f"Snapshot: {sizes}", True, (200, 200, 200))
+                self.screen.blit(sizes_text, (10, list_top - 50))
             
-            # List player IDs
+            # List player IDs with their link stats
             all_players = [self.player.player_id] + connected_players
             for i, player_id in enumerate(all_players):
-                player_text = self.small_font.render(f"- {player_id}", True, (200, 200, 255))
+                label = f"- {player_id}"
+                link = telemetry["links"].get(player_id)
+                if link:
+                    rtt = f"{link['rtt_ms']:.0f}" if link["rtt_ms"] is not None else "?"
+                    label += (f"  RTT {rtt} ms (jitter {link['jitter_ms']:.0f} ms)"
+                              f"  in {link['bytes_in_per_sec'] / 1024:.1f} KB/s"
+                              f"  out {link['bytes_out_per_sec'] / 1024:.1f} KB/s")
+                    if link.get("reconnects"):
+                        label += f"  reconnects {link['reconnects']}"
+                player_text = self.small_font.render(label, True, (200, 200, 255))
                 self.screen.blit(player_text, (20, self.screen.get_height() - 30 - (len(all_players) - i - 1) * 20))
         
         # Pause menu
@@ -404,33 +548,46 @@ class GameScreen:
             self._update_with_dt(1/60)  # Default delta time
     
     def _update_with_dt(self, dt):
+        # Each update starts a new frame: the previous frame's update and draw are complete
+        self.profiler.end_frame()
+        if self.simulation is None and self.session_epoch != self.network_manager.session_epoch:
+            self.start_session()
         if not self.paused:
-            # Update player
-            self.player.update(dt)
-            
-            # Update other players
-            for other_player in self.other_players:
-                other_player.update(dt)
+            self.playtime += dt
             
-            # Update monsters
-            for monster in self.monsters:
-                monster.update(dt, self.player.x, self.player.y)
+            # Update player (predicted locally on a client, inputs are sent to the host)
+            # (the same frame order as world.replay.play_frame, so recordings replay exactly)
+            with self.profiler.measure("player"):
+                move_input = self.player.read_input()
+                # A client predicts with the frame time exactly as the host will simulate it
+                input_dt = dt if self.simulation else quantize_dt(dt)
+                self.player.update(input_dt, move_input)
+                if self.simulation and self.pending_attack is not None:
+                    self.player.attack(*self.pending_attack)
+            if self.recorder:
+                self.recorder.record(dt, move_input, self.pending_attack, self.player.weapon.weapon_id)
+            if self.simulation is None:
+                if self.network_manager.is_connected:
+                    sequence = self.predictor.record(move_input, input_dt)
+                    self.network_manager.outbound.queue_input(sequence, move_input, input_dt, self.pending_attack)
+                self.projectiles = [p for p in self.projectiles if p.update(dt)]
+            self.pending_attack = None
             
-            # Handle collisions between entities
-            for i in range(len(self.entities)):
-                for j in range(i+1, len(self.entities)):
-                    if self.entities[i].check_collision(self.entities[j]):
-                        self.entities[i].resolve_collision(self.entities[j])
+            # Update network state
+            self.update_network_state()
             
-            # Handle projectile collisions
-            self.handle_projectile_collisions()
+            # Advance the authoritative world: other players, monsters, all combat
+            if self.simulation:
+                with self.profiler.measure("simulation"):
+                    self.simulation.step(dt)
+                # Autosave hands the disk work to a background thread (not while recording:
+                # chunks reloaded from disk lose precision, which a replay would not)
+                if self.recorder is None and self.autosaver.due(time.time()):
+                    self.start_save()
             
             # Update camera to follow player
             self.camera_x = self.player.x - self.screen.get_width() // 2
             self.camera_y = self.player.y - self.screen.get_height() // 2
             
-            # Update network state
-            self.update_network_state()
-            
             # Update from network state
-            self.update_from_network_state()
\ No newline at end of file
+            self.update_from_network_state()
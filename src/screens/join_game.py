@@ -1,76 +1,113 @@
 import pygame
+import queue
 import threading
 import time
 from network.network_manager import NetworkManager
+from network.discovery import get_discovery_service
 
 class JoinGameScreen:
-    def __init__(self, screen):
+    def __init__(self, screen, record_inputs=False):
         self.screen = screen
+        self.record_inputs = record_inputs  # Passed back to the main menu
         self.font = pygame.font.Font(None, 36)
         self.small_font = pygame.font.Font(None, 24)
         
         # Network manager
         self.network_manager = NetworkManager()
         
-        # Discovered games
+        # Discovered games, kept up to date by the shared discovery service
         self.discovered_games = []
+        self.games_changed = True
         self.selected_game = None
         
+        # Background connection attempt; it reports progress through a queue
+        self.connect_events = queue.Queue()
+        self.connecting = False
+        self.connect_status = ""
+        
         # UI elements
         self.back_button = pygame.Rect(50, 50, 100, 40)
         self.refresh_button = pygame.Rect(screen.get_width() - 150, 50, 100, 40)
         self.join_button = pygame.Rect(screen.get_width() - 150, screen.get_height() - 100, 100, 40)
         
         # Start discovery
-        self.network_manager.discovery_running = True
-        discovery_thread = threading.Thread(target=self._continuous_discovery)
-        discovery_thread.daemon = True
-        discovery_thread.start()
-        
-        # Give some time for discovery
-        time.sleep(0.1)
-        self.discover_games()
+        self.discovery = get_discovery_service()
+        self.discovery.subscribe(self._on_discovery)
+        self.discovery.acquire()
         
         # Error message
         self.error_message = ""
         self.error_time = 0
         
-    def _continuous_discovery(self):
-        """Continuously discover games"""
-        # Start listening for other broadcasts
-        self.network_manager._discover_games()
+    def _on_discovery(self, event, game):
+        """Discovery thread: a game appeared, changed or expired"""
+        self.games_changed = True
+    
+    def stop_discovery(self):
+        self.discovery.unsubscribe(self._on_discovery)
+        self.discovery.release()
         
     def discover_games(self):
-        """Discover games on the local network"""
+        """Rebuild the game list, but only if discovery has seen a change"""
+        if not self.games_changed:
+            return
+        self.games_changed = False
+        
+        # Keep the same game selected even if its position in the list moves
+        selected = None
+        if self.selected_game is not None and self.selected_game < len(self.discovered_games):
+            game = self.discovered_games[self.selected_game]
+            selected = (game["host"], game["port"])
+        
         self.discovered_games = self.network_manager.get_discovered_games()
-        print(f"Discovered games: {self.discovered_games}")
+        self.selected_game = None
+        for i, game in enumerate(self.discovered_games):
+            if (game["host"], game["port"]) == selected:
+                self.selected_game = i
+    
+    def _connect(self, host, port):
+        """Background thread: connect and report the result to the UI thread"""
+        def progress(status, attempt, max_attempts):
+            self.connect_events.put((status, attempt, max_attempts))
+        
+        success = self.network_manager.connect_to_game(host, port, progress=progress)
+        self.connect_events.put(("done", success, None))
+    
+    def start_connect(self, game):
+        """Start connecting to a game without blocking the render loop"""
+        print(f"Attempting to connect to {game['name']} at {game['host']}:{game['port']}")
+        self.connecting = True
+        self.connect_status = f"Connecting to {game['name']}..."
+        connect_thread = threading.Thread(target=self._connect, args=(game["host"], game["port"]))
+        connect_thread.daemon = True
+        connect_thread.start()
+    
+    def leave(self):
+        """Stop background work before returning to the main menu"""
+        if self.connecting:
+            self.network_manager.cancel_connect()
+        self.network_manager.stop_networking()
+        self.stop_discovery()
+        from screens.main_menu import MainMenu
+        return MainMenu(self.screen, self.record_inputs)
         
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
             if event.button == 1:  # Left mouse button
                 # Back button
                 if self.back_button.collidepoint(event.pos):
-                    from screens.main_menu import MainMenu
-                    return MainMenu(self.screen)
+                    return self.leave()
                 
                 # Refresh button
                 if self.refresh_button.collidepoint(event.pos):
+                    self.games_changed = True
                     self.discover_games()
                 
                 # Join button
-                if self.join_button.collidepoint(event.pos) and self.selected_game is not None:
-                    # Connect to the selected game
-                    game = self.discovered_games[self.selected_game]
-                    print(f"Attempting to connect to {game['name']} at {game['host']}:{game['port']}")
-                    if self.network_manager.connect_to_game(game["host"], game["port"]):
-                        # TODO: Navigate to game screen
-                        from screens.game_screen import GameScreen
-                        return GameScreen(self.screen)
-                    else:
-                        print("Failed to connect to game")
-                        # Show error message
-                        self.error_message = "Failed to connect to game"
-                        self.error_time = time.time()
+                if (self.join_button.collidepoint(event.pos) and self.selected_game is not None
+                        and not self.connecting):
+                    # Connect to the selected game in the background
+                    self.start_connect(self.discovered_games[self.selected_game])
                 
                 # Game selection
                 for i, game in enumerate(self.discovered_games):
@@ -80,15 +117,36 @@ class JoinGameScreen:
         
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE:
-                from screens.main_menu import MainMenu
-                return MainMenu(self.screen)
+                return self.leave()
                 
         return None
     
     def update(self, dt=None):
-        # Update discovered games periodically
+        # Update discovered games when discovery saw a change
         self.discover_games()
         
+        # Handle progress from the connection thread
+        while True:
+            try:
+                status, value, max_attempts = self.connect_events.get_nowait()
+            except queue.Empty:
+                break
+            if status == "connecting":
+                self.connect_status = f"Connecting (attempt {value}/{max_attempts})..."
+            elif status == "retrying":
+                self.connect_status = f"Attempt {value}/{max_attempts} failed, retrying..."
+            elif status == "done":
+                self.connecting = False
+                self.connect_status = ""
+                if value:
+                    self.stop_discovery()
+                    from screens.game_screen import GameScreen
+                    return GameScreen(self.screen, network_manager=self.network_manager, record_inputs=self.record_inputs)
+                print("Failed to connect to game")
+                # Show error message
+                self.error_message = "Failed to connect to game"
+                self.error_time = time.time()
+        
         # Clear error message after 3 seconds
         if self.error_message and time.time() - self.error_time > 3:
             self.error_message = ""
@@ -129,6 +187,17 @@ class JoinGameScreen:
                 game_text = self.font.render(f"{game['name']} ({game['host']})", True, (255, 255, 255))
                 game_text_rect = game_text.get_rect(midleft=(game_rect.left + 20, game_rect.centery))
                 self.screen.blit(game_text, game_text_rect)
+                
+                # Player count and host load from the broadcast
+                details = []
+                if game["players"] is not None:
+                    details.append(f"{game['players']} players")
+                if game["load"] is not None:
+                    details.append(f"load {game['load']:.0%}")
+                if details:
+                    details_text = self.small_font.render(", ".join(details), True, (200, 200, 200))
+                    details_rect = details_text.get_rect(midright=(game_rect.right - 20, game_rect.centery))
+                    self.screen.blit(details_text, details_rect)
         
         # Draw join button
         if self.selected_game is not None:
@@ -137,6 +206,12 @@ class JoinGameScreen:
             join_text_rect = join_text.get_rect(center=self.join_button.center)
             self.screen.blit(join_text, join_text_rect)
         
+        # Draw connection progress
+        if self.connect_status:
+            status_text = self.small_font.render(self.connect_status, True, (200, 200, 255))
+            status_rect = status_text.get_rect(center=(self.screen.get_width() // 2, self.screen.get_height() - 80))
+            self.screen.blit(status_text, status_rect)
+        
         # Draw error message if exists
         if self.error_message and time.time() - self.error_time < 3:
             error_text = self.font.render(self.error_message, True, (255, 0, 0))
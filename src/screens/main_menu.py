@@ -5,8 +5,9 @@ from screens.settings import SettingsScreen
 from screens.join_game import JoinGameScreen
 
 class MainMenu:
-    def __init__(self, screen):
+    def __init__(self, screen, record_inputs=False):
         self.screen = screen
+        self.record_inputs = record_inputs  # Record new offline games for replay (main.py --record)
         self.font = pygame.font.Font(None, 36)
         
         # Define buttons
@@ -47,15 +48,15 @@ class MainMenu:
     def handle_action(self, action):
         if action == "start":
             # Navigate to save selection screen
-            save_selection = SaveSelection(self.screen)
+            save_selection = SaveSelection(self.screen, self.record_inputs)
             return save_selection
         elif action == "join":
             # Open join game screen
-            join_game_screen = JoinGameScreen(self.screen)
+            join_game_screen = JoinGameScreen(self.screen, self.record_inputs)
             return join_game_screen
         elif action == "settings":
             # Open settings screen
-            settings_screen = SettingsScreen(self.screen)
+            settings_screen = SettingsScreen(self.screen, record_inputs=self.record_inputs)
             return settings_screen
         elif action == "exit":
             return "quit"
@@ -1,26 +1,44 @@
 import pygame
-import os
+import time
+from storage.save_index import get_save_index
 
 class SaveSelection:
-    def __init__(self, screen):
+    def __init__(self, screen, record_inputs=False):
         self.screen = screen
+        self.record_inputs = record_inputs
         self.font = pygame.font.Font(None, 36)
         self.small_font = pygame.font.Font(None, 24)
         
-        # Create saves directory if it doesn't exist
-        self.saves_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "saves")
-        if not os.path.exists(self.saves_dir):
-            os.makedirs(self.saves_dir)
-        
-        # Get list of save files
-        self.save_files = [f for f in os.listdir(self.saves_dir) if f.endswith('.save')]
+        # Saves, newest first; a save's header is only read once its page is shown
+        self.save_index = get_save_index()
+        self.saves = self.save_index.list_saves()
         
         # UI elements
         self.back_button = pygame.Rect(50, 50, 100, 40)
+        self.new_button = pygame.Rect(screen.get_width() - 150, 50, 100, 40)
         self.select_button = pygame.Rect(screen.get_width() - 150, screen.get_height() - 100, 100, 40)
+        self.prev_button = pygame.Rect(100, screen.get_height() - 100, 100, 40)
+        self.next_button = pygame.Rect(220, screen.get_height() - 100, 100, 40)
+        
+        # Pages of as many rows as fit above the buttons
+        self.page_size = max(1, (screen.get_height() - 250) // 50)
+        self.page = 0
+        self.page_count = max(1, (len(self.saves) + self.page_size - 1) // self.page_size)
         
-        # Selection
+        # Selection (index into self.saves)
         self.selected_save = None
+    
+    def page_rows(self):
+        """(index, entry, rect) for the saves on the current page, reading their headers if needed"""
+        start = self.page * self.page_size
+        self.save_index.load_page(self.saves, start, self.page_size)
+        return [
+            (i, self.saves[i], pygame.Rect(100, 150 + (i - start) * 50, 600, 46))
+            for i in range(start, min(start + self.page_size, len(self.saves)))
+        ]
+    
+    def change_page(self, step):
+        self.page = min(max(self.page + step, 0), self.page_count - 1)
         
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
@@ -28,25 +46,39 @@ class SaveSelection:
                 # Back button
                 if self.back_button.collidepoint(event.pos):
                     from screens.main_menu import MainMenu
-                    return MainMenu(self.screen)
+                    return MainMenu(self.screen, self.record_inputs)
+                
+                # New game button
+                if self.new_button.collidepoint(event.pos):
+                    from screens.game_screen import GameScreen
+                    return GameScreen(self.screen, record_inputs=self.record_inputs)
                 
                 # Select button
                 if self.select_button.collidepoint(event.pos) and self.selected_save is not None:
                     # Load selected save and start game
                     from screens.game_screen import GameScreen
-                    save_file = self.save_files[self.selected_save]
-                    return GameScreen(self.screen, save_file)
+                    save_file = self.saves[self.selected_save].save_file
+                    return GameScreen(self.screen, save_file, record_inputs=self.record_inputs)
+                
+                # Page buttons
+                if self.prev_button.collidepoint(event.pos):
+                    self.change_page(-1)
+                elif self.next_button.collidepoint(event.pos):
+                    self.change_page(1)
                 
                 # Save file selection
-                for i, save_file in enumerate(self.save_files):
-                    save_rect = pygame.Rect(100, 150 + i * 50, 600, 40)
+                for i, entry, save_rect in self.page_rows():
                     if save_rect.collidepoint(event.pos):
                         self.selected_save = i
         
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_ESCAPE:
                 from screens.main_menu import MainMenu
-                return MainMenu(self.screen)
+                return MainMenu(self.screen, self.record_inputs)
+            elif event.key in (pygame.K_PAGEUP, pygame.K_LEFT):
+                self.change_page(-1)
+            elif event.key in (pygame.K_PAGEDOWN, pygame.K_RIGHT):
+                self.change_page(1)
                 
         return None
     
@@ -68,21 +100,46 @@ class SaveSelection:
         back_text_rect = back_text.get_rect(center=self.back_button.center)
         self.screen.blit(back_text, back_text_rect)
         
+        # Draw new game button
+        pygame.draw.rect(self.screen, (70, 130, 180), self.new_button)
+        new_text = self.small_font.render("New Game", True, (255, 255, 255))
+        self.screen.blit(new_text, new_text.get_rect(center=self.new_button.center))
+        
         # Draw save files
-        if not self.save_files:
+        if not self.saves:
             no_saves_text = self.font.render("No save files found", True, (200, 200, 200))
             no_saves_rect = no_saves_text.get_rect(center=(self.screen.get_width() // 2, self.screen.get_height() // 2))
             self.screen.blit(no_saves_text, no_saves_rect)
         else:
-            for i, save_file in enumerate(self.save_files):
-                save_rect = pygame.Rect(100, 150 + i * 50, 600, 40)
+            for i, entry, save_rect in self.page_rows():
                 color = (100, 100, 150) if self.selected_save != i else (150, 150, 200)
                 pygame.draw.rect(self.screen, color, save_rect)
                 pygame.draw.rect(self.screen, (200, 200, 200), save_rect, 2)
                 
-                save_text = self.font.render(save_file, True, (255, 255, 255))
-                save_text_rect = save_text.get_rect(midleft=(save_rect.left + 20, save_rect.centery))
+                save_text = self.font.render(entry.save_file, True, (255, 255, 255))
+                save_text_rect = save_text.get_rect(midleft=(save_rect.left + 20, save_rect.centery - 10))
                 self.screen.blit(save_text, save_text_rect)
+                
+                # Details from the save's header
+                if entry.info is not None:
+                    info = entry.info
+                    hours, minutes = divmod(int(info.playtime) // 60, 60)
+                    details = (f"Level {info.level}  |  {info.player_count} player(s)  |  "
+                               f"played {hours}:{minutes:02d}  |  "
+                               f"saved {time.strftime('%Y-%m-%d %H:%M', time.localtime(info.saved_at))}")
+                else:
+                    details = "Empty or unreadable save"
+                details_text = self.small_font.render(details, True, (200, 200, 220))
+                self.screen.blit(details_text, (save_rect.left + 20, save_rect.centery + 4))
+            
+            # Page controls
+            for button, label, enabled in ((self.prev_button, "Prev", self.page > 0),
+                                           (self.next_button, "Next", self.page < self.page_count - 1)):
+                pygame.draw.rect(self.screen, (150, 150, 150) if enabled else (90, 90, 90), button)
+                button_text = self.small_font.render(label, True, (0, 0, 0))
+                self.screen.blit(button_text, button_text.get_rect(center=button.center))
+            page_text = self.small_font.render(f"Page {self.page + 1}/{self.page_count}", True, (200, 200, 200))
+            self.screen.blit(page_text, page_text.get_rect(midleft=(self.next_button.right + 20, self.next_button.centery)))
         
         # Draw select button
         if self.selected_save is not None:
@@ -2,18 +2,22 @@ import pygame
 from network.network_manager import NetworkManager
 
 class SettingsScreen:
-    def __init__(self, screen, return_screen=None):
+    # Difficulty picked most recently, used by new games
+    last_difficulty = "Medium"
+    
+    def __init__(self, screen, return_screen=None, record_inputs=False):
         self.screen = screen
         self.return_screen = return_screen  # Screen to return to
+        self.record_inputs = record_inputs  # Passed back to the main menu
         self.font = pygame.font.Font(None, 36)
         self.small_font = pygame.font.Font(None, 24)
         
-        # Network manager
-        self.network_manager = NetworkManager()
+        # Share the running game's network manager so hosting from here reaches the game
+        self.network_manager = getattr(return_screen, "network_manager", None) or NetworkManager()
         
         # Settings values
-        self.difficulty = "Medium"  # Easy, Medium, Hard
-        self.network_sharing = False
+        self.difficulty = getattr(return_screen, "difficulty", SettingsScreen.last_difficulty)  # Easy, Medium, Hard
+        self.network_sharing = self.network_manager.is_host
         self.game_name = "Player's Game"
         
         # UI elements
@@ -46,12 +50,15 @@ class SettingsScreen:
                         return self.return_screen
                     else:
                         from screens.main_menu import MainMenu
-                        return MainMenu(self.screen)
+                        return MainMenu(self.screen, self.record_inputs)
                 
                 # Difficulty buttons
                 for button in self.difficulty_buttons:
                     if button["rect"].collidepoint(event.pos):
                         self.difficulty = button["value"]
+                        SettingsScreen.last_difficulty = self.difficulty
+                        if hasattr(self.return_screen, "set_difficulty"):
+                            self.return_screen.set_difficulty(self.difficulty)
                 
                 # Network sharing button
                 if self.network_button.collidepoint(event.pos):
@@ -96,7 +103,7 @@ class SettingsScreen:
                     return self.return_screen
                 else:
                     from screens.main_menu import MainMenu
-                    return MainMenu(self.screen)
+                    return MainMenu(self.screen, self.record_inputs)
                 
         return None
     
@@ -0,0 +1,181 @@
+import os
+
+# Rooms simulate with pygame entities but never open a window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import heapq
+import multiprocessing
+import socket
+import time
+from network.network_manager import NetworkManager
+from network.discovery import send_announcement
+
+
+class Room:
+    """One independent game: its own host NetworkManager, port and world tick"""
+
+    def __init__(self, index, name, port, host, tick_rate):
+        self.index = index
+        self.name = name
+        self.port = port
+        self.host = host
+        self.tick_interval = 1.0 / tick_rate
+        self.network_manager = None
+        self.simulation = None
+        self.last_tick = None
+        self.load = 0.0  # Smoothed fraction of the tick interval spent simulating
+
+    def start(self):
+        from world.simulation import WorldSimulation
+
+        self.network_manager = NetworkManager()
+        self.network_manager.port = self.port
+        if not self.network_manager.start_hosting(self.name, host=self.host, broadcast=False, host_player=False):
+            return False
+        self.simulation = WorldSimulation(self.network_manager)
+        return True
+
+    def tick(self, now):
+        # Use the real elapsed time, capped so a stall doesn't teleport everything
+        dt = self.tick_interval if self.last_tick is None else min(now - self.last_tick, 0.1)
+        self.last_tick = now
+        self.simulation.step(dt)
+        elapsed = time.time() - now
+        self.load += (min(1.0, elapsed / self.tick_interval) - self.load) * 0.1
+
+    def player_count(self):
+        return len(self.network_manager.get_connected_players())
+
+    def stop(self):
+        if self.network_manager:
+            self.network_manager.stop_networking()
+
+
+def run_worker(room_specs, host, tick_rate, player_counts, room_loads, stop_event):
+    """Worker process: tick a share of the rooms, earliest deadline first"""
+    import pygame
+    pygame.init()  # For pygame.time in monster AI; no display is created
+
+    rooms = []
+    for index, name, port in room_specs:
+        room = Room(index, name, port, host, tick_rate)
+        if room.start():
+            rooms.append(room)
+        else:
+            print(f"Room '{name}' failed to start on port {port}")
+
+    schedule = [(time.time(), i) for i in range(len(rooms))]
+    heapq.heapify(schedule)
+    try:
+        while schedule and not stop_event.is_set():
+            due, i = heapq.heappop(schedule)
+            delay = due - time.time()
+            if delay > 0:
+                time.sleep(delay)
+
+            room = rooms[i]
+            now = time.time()
+            try:
+                room.tick(now)
+            except Exception as e:
+                print(f"Error ticking room '{room.name}': {e}")
+            player_counts[room.index] = room.player_count()
+            room_loads[room.index] = room.load
+
+            # Schedule from the deadline, not from now, so ticks don't drift;
+            # if the worker fell behind, skip ahead instead of bursting
+            next_due = due + room.tick_interval
+            if next_due < now:
+                next_due = now + room.tick_interval
+            heapq.heappush(schedule, (next_due, i))
+    finally:
+        for room in rooms:
+            room.stop()
+
+
+def broadcast_rooms(room_specs, host, broadcast_port, player_counts, room_loads, stop_event):
+    """Advertise every room with the same discovery message a hosting client sends"""
+    broadcast_socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    broadcast_socket.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+    try:
+        while not stop_event.is_set():
+            for index, name, port in room_specs:
+                message = {
+                    "type": "game_discovery",
+                    "name": name,
+                    "host": host,
+                    "port": port,
+                    "players": player_counts[index],
+                    "load": round(room_loads[index], 3),
+                    "timestamp": time.time()
+                }
+                try:
+                    send_announcement(broadcast_socket, message, broadcast_port)
+                except Exception as e:
+                    print(f"Error broadcasting room '{name}': {e}")
+            stop_event.wait(2)  # Broadcast every 2 seconds
+    finally:
+        broadcast_socket.close()
+
+
+def plan_rooms(count, name, base_port, broadcast_port):
+    """[(index, name, port)] of each room, on consecutive ports that skip the broadcast port"""
+    room_specs = []
+    port = base_port
+    for index in range(count):
+        if port == broadcast_port:
+            port += 1
+        room_specs.append((index, f"{name} {index + 1}", port))
+        port += 1
+    return room_specs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GunGuys dedicated server")
+    parser.add_argument("--rooms", type=int, default=4, help="Number of rooms to host")
+    parser.add_argument("--name", default="Server Room", help="Room name prefix")
+    parser.add_argument("--host", help="Address to bind and advertise (default: detected LAN address)")
+    parser.add_argument("--base-port", type=int, default=12345, help="Port of the first room; rooms use consecutive ports")
+    parser.add_argument("--broadcast-port", type=int, default=12346)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes ticking rooms")
+    parser.add_argument("--tick-rate", type=int, default=60)
+    parser.add_argument("--no-broadcast", action="store_true", help="Don't advertise rooms on the LAN")
+    args = parser.parse_args()
+
+    host = args.host if args.host else NetworkManager.detect_local_ip()
+    room_specs = plan_rooms(args.rooms, args.name, args.base_port, args.broadcast_port)
+
+    player_counts = multiprocessing.Array('i', args.rooms)
+    room_loads = multiprocessing.Array('d', args.rooms)
+    stop_event = multiprocessing.Event()
+
+    # Deal rooms round-robin across the worker processes
+    worker_count = max(1, min(args.workers, args.rooms))
+    workers = []
+    for w in range(worker_count):
+        process = multiprocessing.Process(
+            target=run_worker,
+            args=(room_specs[w::worker_count], host, args.tick_rate, player_counts, room_loads, stop_event)
+        )
+        process.daemon = True
+        process.start()
+        workers.append(process)
+
+    print(f"Serving {args.rooms} rooms on {host}:{room_specs[0][2]}-{room_specs[-1][2]} with {worker_count} workers")
+    try:
+        if args.no_broadcast:
+            stop_event.wait()
+        else:
+            broadcast_rooms(room_specs, host, args.broadcast_port, player_counts, room_loads, stop_event)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_event.set()
+        for process in workers:
+            process.join(timeout=5)
+
+
+if __name__ == "__main__":
+    main()
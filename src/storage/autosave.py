@@ -0,0 +1,85 @@
+import queue
+import threading
+import time
+from storage.world_save import write_snapshot
+
+
+class Autosaver:
+    """Periodic saves that never block the game loop on disk.
+
+    The game loop only takes a WorldSnapshot (a quick pass over the
+    entities); a background thread packs, compresses and writes it
+    atomically, keeping the previous versions as rotating backups. Saves
+    never overlap: an autosave that comes due while the last write is still
+    running waits for the next frame, and an explicit save waits for it.
+    """
+
+    def __init__(self, interval=60.0, backups=3, profiler=None):
+        self.interval = interval  # seconds between autosaves
+        self.backups = backups
+        self.profiler = profiler
+        self.last_save = time.time()
+
+        self.pending = queue.Queue()
+        self.idle = threading.Event()
+        self.idle.set()
+        self.lock = threading.Lock()  # Keeps idle in step with the queue
+        self.thread = None
+
+        # Stats
+        self.saves_written = 0
+        self.last_snapshot_time = 0.0
+        self.last_write_time = 0.0
+        self.last_error = None
+
+    def due(self, now):
+        """Whether the autosave interval has passed and no write is in progress"""
+        return now - self.last_save >= self.interval and self.idle.is_set()
+
+    def save(self, path, capture):
+        """Snapshot now with capture() (returns a WorldSnapshot) and write it in the background"""
+        # Snapshots can be incremental (e.g. only dirty chunks), so none may be skipped
+        self.idle.wait()
+        self.last_save = time.time()
+        start = time.perf_counter()
+        snapshot = capture()
+        self.last_snapshot_time = time.perf_counter() - start
+        if self.profiler:
+            self.profiler.record("autosave snapshot", self.last_snapshot_time)
+
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._write_loop)
+            self.thread.daemon = True
+            self.thread.start()
+
+        with self.lock:
+            self.idle.clear()
+            self.pending.put((path, snapshot))
+
+    def wait(self, timeout=None):
+        """Block until queued saves are on disk (e.g. before quitting)"""
+        return self.idle.wait(timeout)
+
+    def _write_loop(self):
+        while True:
+            path, snapshot = self.pending.get()
+            start = time.perf_counter()
+            try:
+                write_snapshot(path, snapshot, compress=True, backups=self.backups)
+                self.saves_written += 1
+                self.last_error = None
+            except Exception as e:
+                self.last_error = e
+                print(f"Error autosaving to {path}: {e}")
+            self.last_write_time = time.perf_counter() - start
+            with self.lock:
+                if self.pending.empty():
+                    self.idle.set()
+
+    def get_stats(self):
+        return {
+            "saves_written": self.saves_written,
+            "snapshot_ms": self.last_snapshot_time * 1000,
+            "write_ms": self.last_write_time * 1000,
+            "error": str(self.last_error) if self.last_error else None
+        }
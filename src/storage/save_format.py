@@ -0,0 +1,228 @@
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+from array import array
+
+MAGIC = b"GGSV"
+VERSION = 1
+
+# Header flags
+FLAG_BIG_ENDIAN = 1  # Arrays were written on a big-endian machine
+
+# Section codecs
+CODEC_RAW = 0
+CODEC_ZLIB = 1
+
+# Fixed-size header at the start of every save, so listing saves only needs one short read:
+# magic, version, flags, saved_at, playtime, level, player_count, monster_count,
+# section_count, name
+HEADER = struct.Struct("<4sHHddIHIH32s")
+
+# One entry per section, right after the header: tag, codec, item count, offset, length
+SECTION = struct.Struct("<4sHIQQ")
+
+SAVES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "saves")
+
+
+class SaveFormatError(Exception):
+    """A save file is missing, truncated, corrupt or from a newer version"""
+
+
+def save_path(save_file):
+    """Full path of a save file name in the saves directory"""
+    return os.path.join(SAVES_DIR, save_file)
+
+
+class SaveInfo:
+    """The metadata stored in a save's header"""
+
+    def __init__(self, name="", saved_at=0.0, playtime=0.0, level=1, player_count=1, monster_count=0):
+        self.name = name
+        self.saved_at = saved_at
+        self.playtime = playtime
+        self.level = level
+        self.player_count = player_count
+        self.monster_count = monster_count
+
+
+def pack_columns(columns):
+    """Pack a list of arrays into one buffer, each padded to 8 bytes so they can be viewed in place"""
+    parts = []
+    for column in columns:
+        data = column.tobytes()
+        parts.append(data)
+        if len(data) % 8:
+            parts.append(b"\0" * (8 - len(data) % 8))
+    return b"".join(parts)
+
+
+def parse_header(data, path):
+    """Unpack and check a save header; returns (SaveInfo, version, flags, section_count)"""
+    if len(data) < HEADER.size:
+        raise SaveFormatError(f"{os.path.basename(path)} is empty or truncated")
+    magic, version, flags, saved_at, playtime, level, player_count, monster_count, section_count, name = \
+        HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise SaveFormatError(f"{os.path.basename(path)} is not a save file")
+    if version > VERSION:
+        raise SaveFormatError(f"{os.path.basename(path)} was saved by a newer version ({version})")
+    info = SaveInfo(name.rstrip(b"\0").decode('utf-8', 'replace'), saved_at, playtime,
+                    level, player_count, monster_count)
+    return info, version, flags, section_count
+
+
+def read_info(path):
+    """A save's SaveInfo from one short read of its header, without mapping the file"""
+    with open(path, "rb") as f:
+        return parse_header(f.read(HEADER.size), path)[0]
+
+
+class SaveWriter:
+    """Builds a save file from named sections of packed bytes"""
+
+    def __init__(self, info):
+        self.info = info
+        self.sections = []  # (tag, codec, count, data)
+
+    def add_section(self, tag, data, count=0, compress=False):
+        if compress:
+            self.sections.append((tag, CODEC_ZLIB, count, zlib.compress(data, 6)))
+        else:
+            self.sections.append((tag, CODEC_RAW, count, data))
+
+    def to_bytes(self):
+        info = self.info
+        flags = FLAG_BIG_ENDIAN if sys.byteorder == "big" else 0
+        header = HEADER.pack(
+            MAGIC, VERSION, flags, info.saved_at or time.time(), info.playtime, info.level,
+            info.player_count, info.monster_count, len(self.sections),
+            info.name.encode('utf-8')[:32]
+        )
+
+        # Sections start 8-byte aligned after the table so arrays can be read in place
+        offset = HEADER.size + SECTION.size * len(self.sections)
+        offset += -offset % 8
+        table = []
+        body = []
+        for tag, codec, count, data in self.sections:
+            table.append(SECTION.pack(tag, codec, count, offset, len(data)))
+            padding = -len(data) % 8
+            body.append(data + b"\0" * padding)
+            offset += len(data) + padding
+
+        prefix = header + b"".join(table)
+        prefix += b"\0" * (-len(prefix) % 8)
+        return prefix + b"".join(body)
+
+    def write(self, path, backups=0):
+        """Write the save atomically: a crash mid-write leaves the old file intact.
+
+        With backups > 0 the previous versions are kept as path.bak1 (newest)
+        up to path.bakN.
+        """
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(self.to_bytes())
+            f.flush()
+            os.fsync(f.fileno())
+        if backups > 0 and os.path.exists(path):
+            for i in range(backups - 1, 0, -1):
+                if os.path.exists(f"{path}.bak{i}"):
+                    os.replace(f"{path}.bak{i}", f"{path}.bak{i + 1}")
+            os.replace(path, f"{path}.bak1")
+        os.replace(temp_path, path)
+
+
+class SaveFile:
+    """Read-only, memory-mapped view of a save file.
+
+    Opening only parses the header and section table; a section's bytes are
+    not touched until it is asked for, and then only that section is
+    decoded. Use as a context manager or call close().
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.map = None
+        self.file = open(path, "rb")
+        try:
+            size = os.fstat(self.file.fileno()).st_size
+            if size < HEADER.size:
+                raise SaveFormatError(f"{os.path.basename(path)} is empty or truncated")
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.info, self.version, flags, section_count = parse_header(self.map, path)
+        except Exception:
+            self.close()
+            raise
+        self.swap_bytes = bool(flags & FLAG_BIG_ENDIAN) != (sys.byteorder == "big")
+
+        if HEADER.size + section_count * SECTION.size > size:
+            self.close()
+            raise SaveFormatError(f"{os.path.basename(path)} is truncated")
+        self.sections = {}  # {tag: (codec, count, offset, length)}
+        for i in range(section_count):
+            tag, codec, count, offset, length = SECTION.unpack_from(self.map, HEADER.size + i * SECTION.size)
+            if offset + length > size:
+                self.close()
+                raise SaveFormatError(f"{os.path.basename(path)} is truncated")
+            self.sections[tag] = (codec, count, offset, length)
+        self.decoded = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        self.file.close()
+
+    def has_section(self, tag):
+        return tag in self.sections
+
+    def count(self, tag):
+        return self.sections[tag][1] if tag in self.sections else 0
+
+    def section(self, tag):
+        """Raw bytes of a section (decompressed if needed), or None if absent"""
+        if tag not in self.sections:
+            return None
+        if tag not in self.decoded:
+            codec, count, offset, length = self.sections[tag]
+            data = self.map[offset:offset + length]
+            if codec == CODEC_ZLIB:
+                try:
+                    data = zlib.decompress(data)
+                except zlib.error as e:
+                    raise SaveFormatError(f"{os.path.basename(self.path)} is corrupt: {e}")
+            elif codec != CODEC_RAW:
+                raise SaveFormatError(f"Unknown codec {codec} in section {tag!r}")
+            self.decoded[tag] = data
+        return self.decoded[tag]
+
+    def columns(self, tag, layout):
+        """Decode a section written by pack_columns into {name: array}.
+
+        layout is the [(name, typecode)] list the section was written with.
+        """
+        data = self.section(tag)
+        if data is None:
+            return None
+        count = self.count(tag)
+        columns = {}
+        offset = 0
+        for name, typecode in layout:
+            column = array(typecode)
+            size = column.itemsize * count
+            column.frombytes(data[offset:offset + size])
+            if self.swap_bytes:
+                column.byteswap()
+            columns[name] = column
+            offset += size + (-size % 8)
+        return columns
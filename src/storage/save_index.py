@@ -0,0 +1,78 @@
+import os
+from storage.save_format import SAVES_DIR, SaveFormatError, read_info
+
+
+class SaveEntry:
+    """One save in the listing; info is None until its header has been read"""
+
+    def __init__(self, save_file, mtime, size):
+        self.save_file = save_file
+        self.mtime = mtime
+        self.size = size
+        self.info = None
+        self.error = None  # Why the header could not be read, if it couldn't
+
+
+class SaveIndex:
+    """Listing of the saves directory with each save's header cached by mtime.
+
+    list_saves() is only a directory scan; headers are read on demand with
+    load_page(), one short read per save, and reused for as long as the
+    file's mtime and size are unchanged. The cache lives for the whole
+    process, so reopening the save screen re-reads only saves that changed.
+    """
+
+    def __init__(self, saves_dir=SAVES_DIR):
+        self.saves_dir = saves_dir
+        self.cache = {}  # {save_file: (mtime, size, info, error)}
+
+    def list_saves(self):
+        """Every .save file, newest first, without reading any of them"""
+        entries = []
+        try:
+            with os.scandir(self.saves_dir) as scan:
+                for item in scan:
+                    if item.name.endswith(".save") and item.is_file():
+                        stat = item.stat()
+                        entries.append(SaveEntry(item.name, stat.st_mtime, stat.st_size))
+        except FileNotFoundError:
+            return []
+        entries.sort(key=lambda entry: (-entry.mtime, entry.save_file))
+
+        # Fill in what is already known, and forget saves that are gone
+        names = {entry.save_file for entry in entries}
+        for save_file in list(self.cache):
+            if save_file not in names:
+                del self.cache[save_file]
+        for entry in entries:
+            self._from_cache(entry)
+        return entries
+
+    def load_page(self, entries, start, count):
+        """Read the headers of entries[start:start + count] that aren't cached yet"""
+        for entry in entries[start:start + count]:
+            if entry.info is None and entry.error is None:
+                self.load(entry)
+
+    def load(self, entry):
+        try:
+            entry.info = read_info(os.path.join(self.saves_dir, entry.save_file))
+        except (OSError, SaveFormatError) as e:
+            entry.error = str(e)
+        self.cache[entry.save_file] = (entry.mtime, entry.size, entry.info, entry.error)
+
+    def _from_cache(self, entry):
+        cached = self.cache.get(entry.save_file)
+        if cached is not None and cached[0] == entry.mtime and cached[1] == entry.size:
+            entry.info, entry.error = cached[2], cached[3]
+
+
+_index = None
+
+
+def get_save_index():
+    """The shared SaveIndex of the saves directory for this process"""
+    global _index
+    if _index is None:
+        _index = SaveIndex()
+    return _index
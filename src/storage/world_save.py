@@ -0,0 +1,236 @@
+import os
+import struct
+import time
+from array import array
+from entities.monster import Monster
+from weapons.projectile import Projectile
+from weapons.registry import get_weapon_registry
+from storage.save_format import SaveFile, SaveInfo, SaveWriter, SaveFormatError, pack_columns
+
+# Player stats as one fixed record
+PLAYER_FIELDS = [
+    ("x", "f"), ("y", "f"), ("vx", "f"), ("vy", "f"),
+    ("current_health", "f"), ("level", "i"), ("experience", "i"), ("experience_needed", "i"),
+    ("base_max_health", "i"), ("base_movement_speed", "f"), ("base_acceleration_rate", "f"),
+    ("base_friction_coefficient", "f"), ("base_attack_speed", "f"), ("base_damage", "i"),
+    ("base_attack_range", "f"),
+]
+PLAYER = struct.Struct("<" + "".join(code for name, code in PLAYER_FIELDS) + "32s")
+
+# Open worlds: the spawner's seed and difficulty, so unexplored chunks grow the same way after loading
+WORLD = struct.Struct("<q16s")
+
+# Monsters and projectiles are stored column by column
+MONSTER_COLUMNS = [
+    ("x", "f"), ("y", "f"), ("vx", "f"), ("vy", "f"),
+    ("radius", "H"), ("mass", "H"), ("max_health", "f"), ("current_health", "f"),
+    ("max_speed", "f"), ("acceleration_rate", "f"), ("friction_coefficient", "f"),
+    ("damage", "f"), ("attack_speed", "f"),
+    ("red", "B"), ("green", "B"), ("blue", "B"),
+]
+PROJECTILE_COLUMNS = [
+    ("x", "f"), ("y", "f"), ("vx", "f"), ("vy", "f"),
+    ("damage", "f"), ("age", "f"),
+    ("owner", "i"),  # -1 for the player, otherwise the index of the monster that fired it
+]
+
+
+class WorldSnapshot:
+    """Point-in-time copy of what a save needs, as plain tuples.
+
+    Capturing is a single pass that reads attributes into immutable rows, so
+    it is cheap enough for the game loop; packing, compressing and writing
+    happen later from the snapshot, e.g. on a background thread, while the
+    live entities keep changing.
+    """
+
+    def __init__(self, info, player, weapon_name, monsters, projectiles, chunk_dir=None, chunks=None,
+                 seed=None, difficulty=None):
+        self.info = info
+        self.player = player  # Tuple in PLAYER_FIELDS order
+        self.weapon_name = weapon_name
+        self.monsters = monsters  # [tuple in MONSTER_COLUMNS order]
+        self.projectiles = projectiles  # [tuple in PROJECTILE_COLUMNS order]
+        self.chunk_dir = chunk_dir
+        self.chunks = chunks or {}  # {(cx, cy): (monster rows, projectile rows)} to rewrite
+        self.seed = seed  # Spawner seed and difficulty of an open world, else None
+        self.difficulty = difficulty
+
+
+def capture_monsters(monsters):
+    """Monster rows and their projectiles' rows (owner = index into the monster rows)"""
+    monster_rows = [
+        (m.x, m.y, m.vx, m.vy, m.radius, m.mass, m.max_health, m.current_health,
+         m.max_speed, m.acceleration_rate, m.friction_coefficient, m.damage, m.attack_speed) + tuple(m.color)
+        for m in monsters
+    ]
+    projectile_rows = [
+        (p.x, p.y, p.vx, p.vy, p.damage, p.age, i)
+        for i, monster in enumerate(monsters) for p in monster.projectiles
+    ]
+    return monster_rows, projectile_rows
+
+
+def capture_world(player, monsters, playtime, name="", chunks=None):
+    """Take a WorldSnapshot of the player, monsters and their projectiles.
+
+    With a ChunkManager, monsters are stored in its chunk files instead of the
+    save itself, and only the chunks that changed are captured.
+    """
+    monsters = list(monsters)
+    seed = difficulty = None
+    if chunks is not None:
+        monster_rows, projectile_rows = [], []
+        directory, chunk_rows = chunks.directory, chunks.capture()
+        if chunks.spawner is not None:
+            seed, difficulty = chunks.spawner.seed, chunks.spawner.difficulty
+    else:
+        monster_rows, projectile_rows = capture_monsters(monsters)
+        directory, chunk_rows = None, None
+    projectile_rows = [(p.x, p.y, p.vx, p.vy, p.damage, p.age, -1) for p in player.projectiles] + projectile_rows
+    info = SaveInfo(name=name, saved_at=time.time(), playtime=playtime, level=player.level,
+                    player_count=1, monster_count=len(monsters))
+    return WorldSnapshot(info, tuple(getattr(player, field) for field, code in PLAYER_FIELDS),
+                         player.weapon_name, monster_rows, projectile_rows, directory, chunk_rows,
+                         seed, difficulty)
+
+
+def _pack_rows(rows, layout):
+    return pack_columns([
+        array(code, [row[i] for row in rows])
+        for i, (column, code) in enumerate(layout)
+    ])
+
+
+def chunk_dir(path):
+    """Directory holding the world chunks of a save"""
+    return os.path.splitext(path)[0] + ".chunks"
+
+
+def chunk_path(directory, coord):
+    return os.path.join(directory, f"{coord[0]}_{coord[1]}.chunk")
+
+
+def write_chunk(path, monster_rows, projectile_rows, compress=False):
+    """Write one chunk's monsters atomically (same container as a save)"""
+    writer = SaveWriter(SaveInfo(monster_count=len(monster_rows)))
+    writer.add_section(b"MONS", _pack_rows(monster_rows, MONSTER_COLUMNS), len(monster_rows), compress=compress)
+    writer.add_section(b"PROJ", _pack_rows(projectile_rows, PROJECTILE_COLUMNS),
+                       len(projectile_rows), compress=compress)
+    writer.write(path)
+
+
+def read_chunk(path):
+    """The monsters stored in a chunk file, or None if the chunk was never saved"""
+    if not os.path.exists(path):
+        return None
+    with SaveFile(path) as save:
+        return load_monsters(save)
+
+
+def write_snapshot(path, snapshot, compress=False, backups=0):
+    """Pack a WorldSnapshot and write it atomically.
+
+    Chunks are written first, so a save never refers to chunk data that
+    isn't on disk yet.
+    """
+    if snapshot.chunks:
+        os.makedirs(snapshot.chunk_dir, exist_ok=True)
+        for coord, (monster_rows, projectile_rows) in snapshot.chunks.items():
+            write_chunk(chunk_path(snapshot.chunk_dir, coord), monster_rows, projectile_rows, compress)
+
+    writer = SaveWriter(snapshot.info)
+    writer.add_section(b"PLYR", PLAYER.pack(*snapshot.player, snapshot.weapon_name.encode('utf-8')[:32]), 1)
+    writer.add_section(b"MONS", _pack_rows(snapshot.monsters, MONSTER_COLUMNS),
+                       len(snapshot.monsters), compress=compress)
+    writer.add_section(b"PROJ", _pack_rows(snapshot.projectiles, PROJECTILE_COLUMNS),
+                       len(snapshot.projectiles), compress=compress)
+    if snapshot.seed is not None:
+        writer.add_section(b"WRLD", WORLD.pack(snapshot.seed, snapshot.difficulty.encode('utf-8')[:16]), 1)
+    writer.write(path, backups=backups)
+
+
+def save_world(path, player, monsters, playtime, name=""):
+    """Write the player, monsters and their projectiles to a save file"""
+    write_snapshot(path, capture_world(player, monsters, playtime, name))
+
+
+def load_player(save, player):
+    """Restore the player's position and stats from an open SaveFile"""
+    data = save.section(b"PLYR")
+    if data is None:
+        raise SaveFormatError("Save has no player")
+    values = PLAYER.unpack_from(data)
+    for (field, code), value in zip(PLAYER_FIELDS, values):
+        setattr(player, field, value)
+    player.update_stats()
+    # Saves keep the weapon's name so they survive renumbering of the weapon table
+    player.equip_weapon(get_weapon_registry().find(values[-1].rstrip(b"\0").decode('utf-8', 'replace')))
+
+
+def monsters_from_rows(monster_rows, projectile_rows):
+    """Build monsters (with their projectiles) from rows made by capture_monsters"""
+    monsters = []
+    for row in monster_rows:
+        monster = Monster(row[0], row[1])
+        for (column, code), value in zip(MONSTER_COLUMNS[:-3], row):
+            setattr(monster, column, value)
+        monster.collision_radius = monster.radius
+        monster.color = tuple(row[-3:])
+        monsters.append(monster)
+
+    for x, y, vx, vy, damage, age, owner in projectile_rows:
+        if 0 <= owner < len(monsters):
+            projectile = Projectile(x, y, vx, vy, damage, "monster")
+            projectile.age = age
+            monsters[owner].projectiles.append(projectile)
+    return monsters
+
+
+def load_monsters(save):
+    """Build the saved monsters (with their projectiles) from an open SaveFile"""
+    columns = save.columns(b"MONS", MONSTER_COLUMNS)
+    if columns is None:
+        return []
+    projectiles = save.columns(b"PROJ", PROJECTILE_COLUMNS)
+    projectile_rows = zip(*(projectiles[column] for column, code in PROJECTILE_COLUMNS)) if projectiles else []
+    return monsters_from_rows(zip(*(columns[column] for column, code in MONSTER_COLUMNS)), projectile_rows)
+
+
+def load_player_projectiles(save, player):
+    """Restore the player's projectiles in flight from an open SaveFile"""
+    projectiles = save.columns(b"PROJ", PROJECTILE_COLUMNS)
+    if projectiles is None:
+        return
+    for i in range(save.count(b"PROJ")):
+        if projectiles["owner"][i] == -1:
+            projectile = Projectile(projectiles["x"][i], projectiles["y"][i],
+                                    projectiles["vx"][i], projectiles["vy"][i],
+                                    projectiles["damage"][i], "player")
+            projectile.age = projectiles["age"][i]
+            player.projectiles.append(projectile)
+
+
+def load_world(path, player, registry, chunks=None):
+    """Load a save into the player and registry, replacing the registry's monsters.
+
+    With a ChunkManager, it is pointed at the save's chunks (and its spawner
+    at the save's seed and difficulty) so the world streams in from there.
+    Returns the save's SaveInfo.
+    """
+    with SaveFile(path) as save:
+        load_player(save, player)
+        load_player_projectiles(save, player)
+        for entity_id in list(registry.kind("monster")):
+            registry.remove(entity_id)
+        for monster in load_monsters(save):
+            registry.add(monster, "monster")
+
+        if chunks is not None:
+            chunks.reset(chunk_dir(path))
+            world = save.section(b"WRLD")
+            if world is not None and chunks.spawner is not None:
+                seed, difficulty = WORLD.unpack_from(world)
+                chunks.spawner.seed = seed
+                chunks.spawner.difficulty = difficulty.rstrip(b"\0").decode('utf-8', 'replace')
+        return save.info
@@ -0,0 +1,307 @@
+"""Loopback load test for the host NetworkManager.
+
+Starts a host on 127.0.0.1 (in this process or as a subprocess) and ramps up
+synthetic clients that connect through connect_to_game, stream bot input
+batches and consume snapshots. For every step it reports snapshot latency
+percentiles, snapshot rate, host CPU and bytes in/out per client, and the
+first client count at which the snapshot rate drops below the sync rate.
+
+Run from the src directory:
+    python -m tools.load_test --clients 1,2,4,8,16 --duration 5
+"""
+import argparse
+import json
+import math
+import random
+import subprocess
+import sys
+import threading
+import time
+
+from network.network_manager import NetworkManager
+from network.outbound import quantize_dt
+from network.snapshot_buffer import SnapshotBuffer
+from weapons.registry import UNARMED_ID
+
+
+class RecordingSnapshotBuffer(SnapshotBuffer):
+    """Snapshot buffer that also records the one-way latency of each snapshot"""
+
+    def __init__(self):
+        super().__init__()
+        self.latencies = []
+        self.received = 0
+
+    def add(self, data, server_time, local_time=None):
+        if local_time is None:
+            local_time = time.time()
+        # Host and clients share a clock on loopback, so this is the real latency
+        self.latencies.append(local_time - server_time)
+        self.received += 1
+        super().add(data, server_time, local_time)
+
+
+class BotClient:
+    """Synthetic client that wanders around sending input batches at 60 fps"""
+
+    def __init__(self, port, name):
+        self.network_manager = NetworkManager()
+        self.network_manager.snapshot_buffer = RecordingSnapshotBuffer()
+        self.port = port
+        self.name = name
+        self.running = False
+        self.sequence = 0
+
+    def start(self):
+        if not self.network_manager.connect_to_game("127.0.0.1", self.port):
+            return False
+        self.running = True
+        thread = threading.Thread(target=self._run)
+        thread.daemon = True
+        thread.start()
+        return True
+
+    def _run(self):
+        dt = quantize_dt(1 / 60)
+        move_input = (0, 0)
+        while self.running and self.network_manager.is_connected:
+            # Change direction every now and then like a player would
+            if random.random() < 0.05:
+                move_input = (random.choice((-1, 0, 1)), random.choice((-1, 0, 1)))
+            self.sequence += 1
+            self.network_manager.outbound.queue_input(self.sequence, move_input, dt)
+            self.network_manager.outbound.update_state({
+                "health": 100,
+                "max_health": 100,
+                "name": self.name,
+                "level": 1,
+                "weapon": UNARMED_ID
+            })
+            self.network_manager.flush_outbound()
+            time.sleep(dt)
+
+    def reset_stats(self):
+        buffer = self.network_manager.snapshot_buffer
+        buffer.latencies = []
+        buffer.received = 0
+        return self.network_manager.bytes_received, self.network_manager.outbound.bytes_sent
+
+    def stop(self):
+        self.running = False
+        self.network_manager.stop_networking()
+
+
+class HostSimulation:
+    """Headless stand-in for the host GameScreen: applies inputs and fills the world"""
+
+    def __init__(self, port, projectiles=50, sync_rate=30):
+        self.network_manager = NetworkManager()
+        self.network_manager.port = port
+        self.network_manager.sync_rate = sync_rate
+        self.projectile_count = projectiles
+        self.running = False
+        self.ticks = 0
+
+    def start(self):
+        if not self.network_manager.start_hosting("Load Test", host="127.0.0.1", broadcast=False):
+            return False
+        self.running = True
+        thread = threading.Thread(target=self._run)
+        thread.daemon = True
+        thread.start()
+        return True
+
+    def _run(self):
+        dt = 1 / 60
+        speed = 200
+        game_state = self.network_manager.game_state
+        for i in range(5):
+            game_state["monsters"][f"monster_{i}"] = {"x": 100 + i * 100, "y": 300, "health": 50, "max_health": 50}
+
+        while self.running:
+            # Move players from their input frames
+            for player_id, inputs in self.network_manager.process_inbound().items():
+                state = game_state["players"].get(player_id)
+                if state is None:
+                    continue
+                for sequence, move_input, input_dt, attack in inputs:
+                    state["x"] += move_input[0] * speed * input_dt
+                    state["y"] += move_input[1] * speed * input_dt
+                    state["last_input"] = sequence
+
+            # Keep a steady projectile population so snapshots have a realistic size
+            angle = self.ticks * 0.1
+            game_state["projectiles"] = [
+                {"x": 400 + math.cos(angle + i) * i * 5, "y": 300 + math.sin(angle + i) * i * 5,
+                 "vx": math.cos(angle + i) * 300, "vy": math.sin(angle + i) * 300, "owner": "monster"}
+                for i in range(self.projectile_count)
+            ]
+            self.network_manager.publish_snapshot()
+            self.ticks += 1
+            time.sleep(dt)
+
+    def stop(self):
+        self.running = False
+        self.network_manager.stop_networking()
+
+
+def percentile(values, fraction):
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def serve(port, projectiles, sync_rate):
+    """Subprocess mode: run a host and answer "stats" lines on stdin with CPU time"""
+    host = HostSimulation(port, projectiles, sync_rate)
+    if not host.start():
+        sys.exit(1)
+    print(json.dumps({"ready": True}), flush=True)
+    for line in sys.stdin:
+        if line.strip() == "stats":
+            print(json.dumps({"cpu": time.process_time(), "ticks": host.ticks}), flush=True)
+    host.stop()
+
+
+class HostHandle:
+    """Uniform access to the host CPU clock whether it runs here or in a subprocess"""
+
+    def __init__(self, port, projectiles, sync_rate, use_subprocess):
+        self.process = None
+        self.host = None
+        if use_subprocess:
+            self.process = subprocess.Popen(
+                [sys.executable, "-m", "tools.load_test", "--serve", "--port", str(port),
+                 "--projectiles", str(projectiles), "--sync-rate", str(sync_rate)],
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True
+            )
+            # Skip anything the host prints until it is ready
+            while True:
+                line = self.process.stdout.readline()
+                if not line:
+                    raise RuntimeError("Host subprocess exited early")
+                if line.startswith("{") and json.loads(line).get("ready"):
+                    break
+        else:
+            self.host = HostSimulation(port, projectiles, sync_rate)
+            if not self.host.start():
+                raise RuntimeError("Could not start host")
+
+    def cpu_time(self):
+        if self.process:
+            self.process.stdin.write("stats\n")
+            self.process.stdin.flush()
+            while True:
+                line = self.process.stdout.readline()
+                if line.startswith("{"):
+                    return json.loads(line)["cpu"]
+        # In-process the clients share the CPU clock, so this is an upper bound
+        return time.process_time()
+
+    def stop(self):
+        if self.process:
+            self.process.stdin.close()
+            self.process.wait(timeout=5)
+        else:
+            self.host.stop()
+
+
+def run(client_steps, duration, port, projectiles, sync_rate, use_subprocess):
+    host = HostHandle(port, projectiles, sync_rate, use_subprocess)
+    time.sleep(0.2)
+
+    clients = []
+    results = []
+    degraded_at = None
+    try:
+        for target in client_steps:
+            # Ramp up to the next step
+            while len(clients) < target:
+                client = BotClient(port, f"Bot {len(clients) + 1}")
+                if not client.start():
+                    print(f"Client {len(clients) + 1} failed to connect")
+                    break
+                clients.append(client)
+            time.sleep(0.5)  # Let the new clients settle
+
+            start_bytes = [client.reset_stats() for client in clients]
+            start_cpu = host.cpu_time()
+            start_time = time.time()
+            time.sleep(duration)
+            elapsed = time.time() - start_time
+            cpu = host.cpu_time() - start_cpu
+
+            latencies = []
+            snapshot_rates = []
+            bytes_in = []
+            bytes_out = []
+            for client, (received, sent) in zip(clients, start_bytes):
+                buffer = client.network_manager.snapshot_buffer
+                latencies.extend(buffer.latencies)
+                snapshot_rates.append(buffer.received / elapsed)
+                bytes_in.append((client.network_manager.bytes_received - received) / elapsed)
+                bytes_out.append((client.network_manager.outbound.bytes_sent - sent) / elapsed)
+
+            result = {
+                "clients": len(clients),
+                "latency_p50_ms": percentile(latencies, 0.5) * 1000,
+                "latency_p95_ms": percentile(latencies, 0.95) * 1000,
+                "latency_p99_ms": percentile(latencies, 0.99) * 1000,
+                "snapshot_rate": min(snapshot_rates) if snapshot_rates else 0.0,
+                "host_cpu_percent": cpu / elapsed * 100,
+                "bytes_in_per_client": sum(bytes_in) / len(bytes_in) if bytes_in else 0.0,
+                "bytes_out_per_client": sum(bytes_out) / len(bytes_out) if bytes_out else 0.0
+            }
+            results.append(result)
+            print(
+                f"{result['clients']:4d} clients | latency p50 {result['latency_p50_ms']:6.1f} ms "
+                f"p95 {result['latency_p95_ms']:6.1f} ms p99 {result['latency_p99_ms']:6.1f} ms | "
+                f"snapshots {result['snapshot_rate']:5.1f}/s | host CPU {result['host_cpu_percent']:5.1f}% | "
+                f"in {result['bytes_in_per_client'] / 1024:7.1f} KB/s out {result['bytes_out_per_client'] / 1024:5.1f} KB/s"
+            )
+
+            # Tick rate counts as degraded once the slowest client gets under 90% of the sync rate
+            if degraded_at is None and result["snapshot_rate"] < sync_rate * 0.9:
+                degraded_at = result["clients"]
+            if len(clients) < target:
+                break
+    finally:
+        for client in clients:
+            client.stop()
+        host.stop()
+
+    if degraded_at is None:
+        print(f"Tick rate held at {sync_rate} Hz up to {len(clients)} clients")
+    else:
+        print(f"Tick rate degraded at {degraded_at} clients")
+    return results, degraded_at
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Loopback load test for the GunGuys host")
+    parser.add_argument("--clients", default="1,2,4,8,16,32", help="Comma-separated client counts to ramp through")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds to measure at each step")
+    parser.add_argument("--port", type=int, default=22345)
+    parser.add_argument("--projectiles", type=int, default=50, help="Projectiles kept alive in the host world")
+    parser.add_argument("--sync-rate", type=int, default=30)
+    parser.add_argument("--subprocess", action="store_true", help="Run the host in a separate process")
+    parser.add_argument("--json", help="Also write the results to this file")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.port, args.projectiles, args.sync_rate)
+        return
+
+    client_steps = [int(count) for count in args.clients.split(",")]
+    results, degraded_at = run(client_steps, args.duration, args.port, args.projectiles,
+                               args.sync_rate, args.subprocess)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"steps": results, "degraded_at": degraded_at}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import time
+from collections import deque
+
+
+class FrameProfiler:
+    """Per-frame timings of named parts of the game loop.
+
+    Wrap work in `with profiler.measure("name"):`, or add a duration
+    measured elsewhere with record(). Keeps the last `window` frames so the
+    overlay can show both the average and the worst frame, which is what a
+    hitch looks like.
+    """
+
+    def __init__(self, window=120):
+        self.window = window
+        self.samples = {}  # {name: deque of seconds per frame}
+        self.current = {}  # Time accumulated this frame
+
+    def measure(self, name):
+        return _Measurement(self, name)
+
+    def record(self, name, seconds):
+        self.current[name] = self.current.get(name, 0.0) + seconds
+
+    def end_frame(self):
+        """Close the current frame; parts not measured this frame count as zero"""
+        for name in set(self.samples) | set(self.current):
+            samples = self.samples.get(name)
+            if samples is None:
+                samples = self.samples[name] = deque(maxlen=self.window)
+            samples.append(self.current.get(name, 0.0))
+        self.current = {}
+
+    def get_stats(self):
+        """{name: {"avg_ms", "max_ms"}} over the window"""
+        return {
+            name: {
+                "avg_ms": sum(samples) / len(samples) * 1000,
+                "max_ms": max(samples) * 1000
+            }
+            for name, samples in self.samples.items() if samples
+        }
+
+
+class _Measurement:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, time.perf_counter() - self.start)
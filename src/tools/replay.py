@@ -0,0 +1,53 @@
+"""Headless replay of a recorded game (see main.py --record).
+
+Rebuilds the world from the recording's seed and feeds it the recorded
+input frames as fast as the simulation runs, then reports the speed-up over
+real time and a digest of the final world state. The same recording always
+ends in the same digest, so --expect turns a recording into a regression
+test, and --repeat into a steady benchmark workload.
+
+Run from the src directory:
+    python -m tools.replay recordings/game_20250101_120000.rec --repeat 3
+"""
+import argparse
+import sys
+import time
+
+from world.replay import ReplayFormatError, load_recording, run_replay, world_digest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded GunGuys game headless")
+    parser.add_argument("recording", help="Recording file written by main.py --record")
+    parser.add_argument("--repeat", type=int, default=1, help="Replay this many times and check every run matches")
+    parser.add_argument("--expect", help="Exit with an error unless the final digest is this one")
+    args = parser.parse_args()
+
+    try:
+        recording = load_recording(args.recording)
+    except (OSError, ReplayFormatError) as e:
+        print(f"Error loading recording: {e}")
+        sys.exit(2)
+
+    print(f"{len(recording.frames)} frames, {recording.duration:.1f} s of play, "
+          f"seed {recording.seed}, {recording.difficulty}")
+    digests = set()
+    for run in range(args.repeat):
+        start = time.perf_counter()
+        simulation, player = run_replay(recording)
+        elapsed = time.perf_counter() - start
+        digest = world_digest(simulation)
+        digests.add(digest)
+        print(f"run {run + 1}: {elapsed:.2f} s ({recording.duration / max(elapsed, 1e-9):.0f}x real time), "
+              f"{len(simulation.monsters)} monsters, player level {player.level}, digest {digest}")
+
+    if len(digests) > 1:
+        print("Runs diverged: the simulation is not deterministic")
+        sys.exit(1)
+    if args.expect and args.expect not in digests:
+        print(f"Digest does not match the expected {args.expect}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
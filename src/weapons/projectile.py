@@ -2,10 +2,29 @@ import pygame
 import math
 from entities.entity import Entity
 
+# Behaviour of each projectile type (weapons name theirs in weapons.json):
+# speed in pixels/second, how many targets it can pass through, blast radius
+# when it goes off (0 for none), how fast it turns towards targets (radians/second)
+# and which defensive weapons block it
+PROJECTILE_TYPES = {
+    "bullet": {"speed": 300, "radius": 5, "pierce": 1, "blast_radius": 0, "turn_rate": 0, "damage_type": "physical"},
+    "piercing_bullet": {"speed": 450, "radius": 4, "pierce": 3, "blast_radius": 0, "turn_rate": 0, "damage_type": "physical"},
+    "bomb": {"speed": 220, "radius": 7, "pierce": 1, "blast_radius": 80, "turn_rate": 0, "damage_type": "physical"},
+    "magic_orb": {"speed": 250, "radius": 6, "pierce": 1, "blast_radius": 0, "turn_rate": 4.0, "damage_type": "magical"},
+}
+
+PROJECTILE_COLORS = {"bullet": (255, 255, 0), "piercing_bullet": (255, 255, 255),
+                     "bomb": (255, 140, 0), "magic_orb": (170, 90, 255)}
+
+DEFAULT_LIFETIME = 5.0  # seconds, for projectiles without a range
+
+
 class Projectile(Entity):
-    def __init__(self, x, y, vx, vy, damage, owner_type="player"):
+    def __init__(self, x, y, vx, vy, damage, owner_type="player", projectile_type="bullet", max_range=None):
+        behaviour = PROJECTILE_TYPES.get(projectile_type, PROJECTILE_TYPES["bullet"])
+        
         # Projectiles are small and light
-        super().__init__(x, y, radius=5, mass=1, max_health=1)
+        super().__init__(x, y, radius=behaviour["radius"], mass=1, max_health=1)
         
         # Set initial velocity
         self.vx = vx
@@ -14,12 +33,24 @@ class Projectile(Entity):
         # Projectile properties
         self.damage = damage
         self.owner_type = owner_type  # "player" or "monster"
-        self.lifetime = 5.0  # seconds
+        self.projectile_type = projectile_type
         self.age = 0.0
         
+        # A projectile flies as far as its weapon's range, then expires
+        speed = math.sqrt(vx*vx + vy*vy)
+        self.lifetime = max_range / speed if max_range and speed > 0 else DEFAULT_LIFETIME
+        
+        # Type behaviour
+        self.pierce = behaviour["pierce"]  # Targets left before it is used up
+        self.blast_radius = behaviour["blast_radius"]
+        self.turn_rate = behaviour["turn_rate"]
+        self.damage_type = behaviour["damage_type"]
+        self.hit_ids = set()  # Targets already hit, so piercing shots damage each only once
+        self.alive = True
+        
         # Colors for different projectile types
         if owner_type == "player":
-            self.color = (255, 255, 0)  # Yellow
+            self.color = PROJECTILE_COLORS.get(projectile_type, (255, 255, 0))
         else:
             self.color = (255, 0, 0)  # Red
     
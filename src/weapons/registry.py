@@ -0,0 +1,81 @@
+import json
+import os
+
+WEAPONS_FILE = os.path.join(os.path.dirname(__file__), "weapons.json")
+
+UNARMED_ID = 0
+
+
+class WeaponStats:
+    """Immutable stats of one weapon type, shared by everyone holding it"""
+
+    __slots__ = ("weapon_id", "name", "kind", "damage", "attack_speed",
+                 "attack_range", "range", "projectile_type", "defense_type", "arc")
+
+    def __init__(self, weapon_id, name, kind, damage, attack_speed,
+                 attack_range=0, range=0, projectile_type=None, defense_type=None, arc=0):
+        set_field = object.__setattr__
+        set_field(self, "weapon_id", weapon_id)
+        set_field(self, "name", name)
+        set_field(self, "kind", kind)  # "unarmed", "ranged", "melee" or "defensive"
+        set_field(self, "damage", damage)
+        set_field(self, "attack_speed", attack_speed)  # Multiplier on the holder's base attack speed
+        set_field(self, "attack_range", attack_range)  # Added to the holder's melee reach
+        set_field(self, "range", range)  # How far projectiles fly
+        set_field(self, "projectile_type", projectile_type)
+        set_field(self, "defense_type", defense_type)  # "physical" or "magical" projectiles it blocks
+        set_field(self, "arc", arc)  # Degrees a swing sweeps or a guard covers (0: a straight thrust)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"WeaponStats are shared and read-only (tried to set {name})")
+
+    def __repr__(self):
+        return f"WeaponStats({self.weapon_id}, {self.name!r})"
+
+
+class WeaponRegistry:
+    """Every weapon type from the data table, by small integer ID and by name.
+
+    IDs are what goes over the network, so an unknown or malformed ID (e.g.
+    from a newer or misbehaving peer) resolves to Unarmed rather than failing.
+    """
+
+    def __init__(self, weapons):
+        self.by_id = {weapon.weapon_id: weapon for weapon in weapons}
+        self.by_name = {weapon.name: weapon for weapon in weapons}
+        self.unarmed = self.by_id[UNARMED_ID]
+
+    def get(self, weapon_id):
+        """Weapon by ID, or Unarmed"""
+        if isinstance(weapon_id, bool) or not isinstance(weapon_id, int):
+            return self.unarmed
+        return self.by_id.get(weapon_id, self.unarmed)
+
+    def find(self, name):
+        """Weapon by name, or Unarmed"""
+        return self.by_name.get(name, self.unarmed)
+
+    def __iter__(self):
+        return iter(self.by_id.values())
+
+
+def load_weapons(path=WEAPONS_FILE):
+    """Build a WeaponRegistry from a JSON table"""
+    with open(path, "r", encoding="utf-8") as f:
+        table = json.load(f)
+    weapons = []
+    for row in table["weapons"]:
+        row = dict(row)
+        weapons.append(WeaponStats(row.pop("id"), **row))
+    return WeaponRegistry(weapons)
+
+
+_registry = None
+
+
+def get_weapon_registry():
+    """The weapon table shipped with the game, loaded on first use"""
+    global _registry
+    if _registry is None:
+        _registry = load_weapons()
+    return _registry
@@ -0,0 +1,172 @@
+from collections import OrderedDict
+from storage.world_save import capture_monsters, chunk_path, monsters_from_rows, read_chunk, SaveFormatError
+
+CHUNK_SIZE = 1024  # World units per chunk side
+
+
+def chunk_of(x, y, size=CHUNK_SIZE):
+    """Coordinate of the chunk containing a world position"""
+    return (int(x // size), int(y // size))
+
+
+class ChunkManager:
+    """Keeps the monsters around players loaded and the rest on disk.
+
+    The world is split into square chunks keyed by (cx, cy). Chunks within
+    view_radius of a player are resident: their monsters are in the
+    registry and simulated. Other chunks are evicted least recently needed
+    first once more than max_resident are loaded, taking their monsters out
+    of the registry. Only dirty chunks (ones whose monsters were simulated,
+    killed or moved in or out) are written, by the next save; until then an
+    evicted dirty chunk is kept here as compact rows, not simulated.
+    Chunks with nothing stored are populated by the spawner, if any, and are
+    dirty from then on, so even an empty one is saved and never re-rolled.
+
+    At most max_monsters are simulated at once. A loaded chunk's monsters
+    wait in deferred, outside the registry, until there is room for them;
+    they are still saved and evicted with their chunk.
+    """
+
+    def __init__(self, registry, chunk_size=CHUNK_SIZE, view_radius=1, max_resident=36, directory=None,
+                 spawner=None, max_monsters=60):
+        self.registry = registry
+        self.monsters = registry.kind("monster")
+        self.chunk_size = chunk_size
+        self.view_radius = view_radius
+        self.max_resident = max_resident
+        self.directory = directory  # Where the chunks of the current save live, once it has a file
+        self.spawner = spawner
+        self.max_monsters = max_monsters
+
+        self.resident = OrderedDict()  # {coord: set of monster IDs}, least recently needed first
+        self.deferred = OrderedDict()  # {coord: [monster]} loaded but waiting for room under max_monsters
+        self.dirty = set()
+        self.unsaved = {}  # {coord: (monster rows, projectile rows)} evicted while dirty, written by the next save
+        self.in_flight = {}  # {coord: (monster rows, projectile rows)} of the last save, newer than disk until written
+
+        # Stats
+        self.loads = 0
+        self.evictions = 0
+
+    def reset(self, directory=None):
+        """Forget all chunk state, e.g. after a save replaced the world"""
+        self.directory = directory
+        self.resident.clear()
+        self.deferred.clear()
+        self.dirty.clear()
+        self.unsaved.clear()
+        self.in_flight.clear()
+
+    def update(self, players):
+        """Load the chunks around players, re-bucket monsters and evict what isn't needed"""
+        needed = set()
+        for player in players:
+            cx, cy = chunk_of(player.x, player.y, self.chunk_size)
+            for dx in range(-self.view_radius, self.view_radius + 1):
+                for dy in range(-self.view_radius, self.view_radius + 1):
+                    needed.add((cx + dx, cy + dy))
+        for coord in needed:
+            if coord in self.resident:
+                self.resident.move_to_end(coord)
+            else:
+                self.load(coord)
+
+        # Monsters are simulated, so any chunk holding one has changed; one that
+        # walks into an unloaded chunk loads it, and may be evicted along with it
+        buckets = {}
+        for entity_id, monster in self.monsters.items():
+            buckets.setdefault(chunk_of(monster.x, monster.y, self.chunk_size), set()).add(entity_id)
+        for coord, bucket in buckets.items():
+            if coord not in self.resident:
+                self.load(coord)
+                bucket |= self.resident[coord]
+        for coord, members in self.resident.items():
+            bucket = buckets.get(coord, set())
+            if bucket or bucket != members:
+                self.dirty.add(coord)
+            self.resident[coord] = bucket
+
+        for coord in list(self.resident):
+            if len(self.resident) <= self.max_resident:
+                break
+            if coord not in needed:
+                self.evict(coord)
+
+        self.admit()
+
+    def load(self, coord):
+        """Make a chunk resident; its stored monsters join the world once there is room (see admit)"""
+        monsters = None
+        if coord in self.unsaved:
+            monsters = monsters_from_rows(*self.unsaved.pop(coord))
+            self.dirty.add(coord)  # Still not on disk
+        elif coord in self.in_flight:
+            monsters = monsters_from_rows(*self.in_flight[coord])
+        elif self.directory is not None:
+            try:
+                monsters = read_chunk(chunk_path(self.directory, coord))
+            except (OSError, SaveFormatError) as e:
+                print(f"Error loading chunk {coord}: {e}")
+                monsters = []
+        if monsters is None:
+            # Never stored: generate it, and keep what was generated (even nothing) until saved
+            if self.spawner is not None:
+                monsters = self.spawner.populate(coord, self.chunk_size)
+                self.dirty.add(coord)
+            else:
+                monsters = []
+        self.resident[coord] = set()
+        if monsters:
+            self.deferred[coord] = monsters
+        self.loads += 1
+
+    def admit(self):
+        """Move deferred monsters into the world while under max_monsters, oldest chunk first"""
+        for coord in list(self.deferred):
+            room = self.max_monsters - len(self.monsters)
+            if room <= 0:
+                break
+            waiting = self.deferred[coord]
+            for monster in waiting[:room]:
+                self.resident[coord].add(self.registry.add(monster, "monster"))
+            del waiting[:room]
+            if not waiting:
+                del self.deferred[coord]
+
+    def evict(self, coord):
+        """Take a chunk's monsters out of the world, keeping them until saved if it changed"""
+        members = self.resident.pop(coord)
+        monsters = [self.monsters[entity_id] for entity_id in members if entity_id in self.monsters]
+        for monster in monsters:
+            self.registry.remove(monster.entity_id)
+        monsters += self.deferred.pop(coord, [])
+        if coord in self.dirty:
+            self.dirty.discard(coord)
+            self.unsaved[coord] = capture_monsters(monsters)
+        self.evictions += 1
+
+    def capture(self):
+        """Rows of every chunk changed since the last save, for a WorldSnapshot.
+
+        Chunks are marked clean; the rows are also kept as in_flight so a
+        chunk reloaded before the background write lands isn't read stale.
+        """
+        chunks = {}
+        for coord in self.dirty:
+            chunks[coord] = capture_monsters([self.monsters[entity_id] for entity_id in self.resident[coord]
+                                              if entity_id in self.monsters] + self.deferred.get(coord, []))
+        chunks.update(self.unsaved)
+        self.dirty.clear()
+        self.unsaved.clear()
+        self.in_flight = chunks
+        return chunks
+
+    def get_stats(self):
+        return {
+            "resident": len(self.resident),
+            "deferred": sum(len(monsters) for monsters in self.deferred.values()),
+            "dirty": len(self.dirty),
+            "unsaved": len(self.unsaved),
+            "loads": self.loads,
+            "evictions": self.evictions
+        }
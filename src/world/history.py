@@ -0,0 +1,163 @@
+from array import array
+from world.registry import id_index
+from world.spatial import SpatialGrid
+
+NO_ENTITY = -1
+
+
+class RewoundBody:
+    """Where an entity was at a rewound time, in the shape SpatialGrid indexes"""
+    __slots__ = ("x", "y", "collision_radius")
+
+    def __init__(self, x, y, collision_radius):
+        self.x = x
+        self.y = y
+        self.collision_radius = collision_radius
+
+
+class PositionHistory:
+    """Recent positions of every entity, for rewinding hit tests on the host.
+
+    A fixed ring of frames, each a row of x/y/entity ID indexed by the
+    entity's registry slot, all stored in flat typed arrays allocated up
+    front (they only grow when the registry gains slots). Recording a frame
+    overwrites the oldest row in place.
+
+    Hit tests are batched: shots are grouped by the frame pair bracketing
+    their view time, and each group's rewound positions are computed once
+    and shared by every shot in it, so the cost grows with the number of
+    distinct view times (bounded by the ring size) rather than per shooter.
+    Each group's positions go into a SpatialGrid, so a shot is only tested
+    against the entities near it.
+    """
+
+    def __init__(self, duration=0.5, rate=60, slots=64, steps=4):
+        self.frames = max(2, int(duration * rate) + 1)
+        self.slots = slots
+        # Interpolation between two frames is rounded to this many steps so shots share rewinds
+        self.steps = steps
+
+        self.times = array('d', [0.0]) * self.frames
+        self.xs = array('d', [0.0]) * (self.frames * slots)
+        self.ys = array('d', [0.0]) * (self.frames * slots)
+        self.ids = array('q', [NO_ENTITY]) * (self.frames * slots)
+        self.radii = array('d', [0.0]) * slots  # Latest collision radius per slot
+        self.empty_row = array('q', [NO_ENTITY]) * slots
+
+        self.head = -1  # Row of the newest frame
+        self.count = 0  # Frames recorded, up to self.frames
+
+        self.grid = SpatialGrid()  # Rewound positions of the group being hit tested
+
+    def _grow(self, slots):
+        """Widen every row to hold more entity slots"""
+        new_slots = max(slots, self.slots * 2)
+        for name, fill, code in (("xs", 0.0, 'd'), ("ys", 0.0, 'd'), ("ids", NO_ENTITY, 'q')):
+            old = getattr(self, name)
+            new = array(code, [fill]) * (self.frames * new_slots)
+            for row in range(self.frames):
+                new[row * new_slots:row * new_slots + self.slots] = old[row * self.slots:(row + 1) * self.slots]
+            setattr(self, name, new)
+        self.radii.extend(array('d', [0.0]) * (new_slots - self.slots))
+        self.empty_row = array('q', [NO_ENTITY]) * new_slots
+        self.slots = new_slots
+
+    def record(self, now, entities):
+        """Store the current positions of {entity_id: entity} as the newest frame"""
+        for entity_id in entities:
+            if id_index(entity_id) >= self.slots:
+                self._grow(id_index(entity_id) + 1)
+
+        self.head = (self.head + 1) % self.frames
+        self.count = min(self.count + 1, self.frames)
+        self.times[self.head] = now
+
+        base = self.head * self.slots
+        self.ids[base:base + self.slots] = self.empty_row
+        for entity_id, entity in entities.items():
+            slot = id_index(entity_id)
+            self.xs[base + slot] = entity.x
+            self.ys[base + slot] = entity.y
+            self.ids[base + slot] = entity_id
+            self.radii[slot] = entity.collision_radius
+
+    def clear(self):
+        self.head = -1
+        self.count = 0
+
+    def _row(self, age):
+        """Row of the frame recorded `age` frames before the newest"""
+        return (self.head - age) % self.frames
+
+    def _bracket(self, when):
+        """(older row, newer row, step) of the frames around a time, clamped to the ring"""
+        if when >= self.times[self.head]:
+            return self.head, self.head, 0
+        oldest = self.count - 1
+        if when <= self.times[self._row(oldest)]:
+            row = self._row(oldest)
+            return row, row, 0
+
+        # Binary search by age: the newest frame at or before `when`
+        low, high = 1, oldest
+        while low < high:
+            mid = (low + high) // 2
+            if self.times[self._row(mid)] <= when:
+                high = mid
+            else:
+                low = mid + 1
+        older = self._row(low)
+        newer = self._row(low - 1)
+        span = self.times[newer] - self.times[older]
+        alpha = (when - self.times[older]) / span if span > 0 else 1.0
+        return older, newer, round(alpha * self.steps)
+
+    def _rewind(self, older, newer, step):
+        """{entity_id: RewoundBody} for every entity present at an interpolated point"""
+        alpha = step / self.steps
+        a = older * self.slots
+        b = newer * self.slots
+        xs, ys, ids, radii = self.xs, self.ys, self.ids, self.radii
+        bodies = {}
+        for slot in range(self.slots):
+            entity_id = ids[b + slot]
+            if entity_id == NO_ENTITY:
+                continue
+            if ids[a + slot] == entity_id:
+                x = xs[a + slot] + (xs[b + slot] - xs[a + slot]) * alpha
+                y = ys[a + slot] + (ys[b + slot] - ys[a + slot]) * alpha
+            else:
+                # Spawned between the two frames: no older position to blend from
+                x = xs[b + slot]
+                y = ys[b + slot]
+            bodies[entity_id] = RewoundBody(x, y, radii[slot])
+        return bodies
+
+    def hit_test(self, shots):
+        """Resolve a batch of shots against rewound positions.
+
+        shots is a list of (view_time, x, y, radius). Returns, for each shot,
+        the ID of the closest entity it overlapped at its view time, or None.
+        """
+        hits = [None] * len(shots)
+        if self.count == 0:
+            return hits
+
+        groups = {}
+        for i, (view_time, x, y, radius) in enumerate(shots):
+            groups.setdefault(self._bracket(view_time), []).append(i)
+
+        grid = self.grid
+        for (older, newer, step), indices in groups.items():
+            grid.rebuild(self._rewind(older, newer, step))
+            for i in indices:
+                view_time, x, y, radius = shots[i]
+                best = None
+                best_distance = None
+                for entity_id, body in grid.query_circle(x, y, radius):
+                    distance = (body.x - x)**2 + (body.y - y)**2
+                    if best is None or (distance, entity_id) < (best_distance, best):
+                        best = entity_id
+                        best_distance = distance
+                hits[i] = best
+        return hits
@@ -0,0 +1,82 @@
+import math
+from weapons.projectile import PROJECTILE_TYPES
+
+HOMING_RANGE = 300  # How far homing projectiles look for a target
+
+
+class ProjectileSystem:
+    """Moves and retires every projectile in the world, one batched kernel per type.
+
+    Each tick gathers the projectiles from their owners' lists, grouped by
+    type, and runs each group through only the kernels its type needs:
+    homing orbs steer first, then every group moves and ages in one tight
+    pass, and whatever has flown its weapon's range or hit a wall is
+    retired. Bombs retired this way go off; applying blasts and hits is
+    left to the simulation.
+    """
+
+    def __init__(self, index):
+        self.index = index  # SpatialGrid of monsters, for homing on them
+        self.counts = {}  # {projectile_type: live projectiles} after the last step
+
+    def step(self, shooters, players, dt, tilemap=None):
+        """Advance the projectiles of every shooter; returns [(owner, bomb)] that went off"""
+        groups = {}
+        for shooter in shooters:
+            for projectile in shooter.projectiles:
+                groups.setdefault(projectile.projectile_type, []).append((shooter, projectile))
+
+        detonations = []
+        for projectile_type, batch in groups.items():
+            behaviour = PROJECTILE_TYPES.get(projectile_type, PROJECTILE_TYPES["bullet"])
+            if behaviour["turn_rate"]:
+                self.home(batch, players, dt)
+            self.move(batch, dt, tilemap)
+            if behaviour["blast_radius"]:
+                detonations.extend((owner, projectile) for owner, projectile in batch if not projectile.alive)
+
+        self.counts = {projectile_type: len(batch) for projectile_type, batch in groups.items()}
+        self.retire(shooters)
+        return detonations
+
+    def move(self, batch, dt, tilemap=None):
+        """Fly straight for dt; retire what is out of range or inside a wall"""
+        is_solid = tilemap.is_solid if tilemap is not None else None
+        for owner, projectile in batch:
+            projectile.x += projectile.vx * dt
+            projectile.y += projectile.vy * dt
+            projectile.age += dt
+            if projectile.age >= projectile.lifetime or (is_solid and is_solid(projectile.x, projectile.y)):
+                projectile.alive = False
+
+    def home(self, batch, players, dt):
+        """Turn each projectile towards the nearest target, at most turn_rate radians per second"""
+        for owner, projectile in batch:
+            if projectile.owner_type == "player":
+                target = self.index.nearest(projectile.x, projectile.y, HOMING_RANGE)
+                target = target[1] if target is not None else None
+            else:
+                target = None
+                best = HOMING_RANGE * HOMING_RANGE
+                for player in players:
+                    distance = (player.x - projectile.x)**2 + (player.y - projectile.y)**2
+                    if distance < best:
+                        target, best = player, distance
+            if target is None:
+                continue
+
+            heading = math.atan2(projectile.vy, projectile.vx)
+            wanted = math.atan2(target.y - projectile.y, target.x - projectile.x)
+            turn = (wanted - heading + math.pi) % (2 * math.pi) - math.pi
+            limit = projectile.turn_rate * dt
+            heading += max(-limit, min(limit, turn))
+            speed = math.sqrt(projectile.vx**2 + projectile.vy**2)
+            projectile.vx = math.cos(heading) * speed
+            projectile.vy = math.sin(heading) * speed
+
+    def retire(self, shooters):
+        """Drop spent projectiles from their owners' lists"""
+        for shooter in shooters:
+            projectiles = shooter.projectiles
+            if projectiles and not all(projectile.alive for projectile in projectiles):
+                shooter.projectiles = [projectile for projectile in projectiles if projectile.alive]
@@ -0,0 +1,120 @@
+INDEX_BITS = 24
+INDEX_MASK = (1 << INDEX_BITS) - 1
+
+
+def make_id(index, generation):
+    """Pack a slot index and its generation into one numeric entity ID"""
+    return (generation << INDEX_BITS) | index
+
+
+def id_index(entity_id):
+    return entity_id & INDEX_MASK
+
+
+def id_generation(entity_id):
+    return entity_id >> INDEX_BITS
+
+
+class EntityRegistry:
+    """World-wide table of entities with stable numeric IDs.
+
+    Entities live in array slots; an ID is the slot index plus a generation
+    counter that is bumped whenever the slot is freed, so a stale ID never
+    resolves to whatever reuses the slot later. Lookup by ID, by external
+    key (e.g. a network player_id) and iteration by kind are all O(1) per
+    entity, and additions/removals are recorded as events so that sync and
+    rendering can update incrementally instead of rebuilding lists.
+    """
+
+    def __init__(self):
+        self.slots = []  # entity or None
+        self.generations = []
+        self.slot_kinds = []
+        self.slot_keys = []
+        self.free_slots = []
+
+        self.by_kind = {}  # {kind: {entity_id: entity}}
+        self.by_key = {}  # {key: entity_id}
+        self.events = []  # ("add" | "remove", entity_id, kind, key)
+
+    def add(self, entity, kind, key=None):
+        """Register an entity and return its ID (also stored as entity.entity_id)"""
+        if self.free_slots:
+            index = self.free_slots.pop()
+            self.slots[index] = entity
+            self.slot_kinds[index] = kind
+            self.slot_keys[index] = key
+        else:
+            index = len(self.slots)
+            self.slots.append(entity)
+            self.generations.append(0)
+            self.slot_kinds.append(kind)
+            self.slot_keys.append(key)
+
+        entity_id = make_id(index, self.generations[index])
+        entity.entity_id = entity_id
+        self.kind(kind)[entity_id] = entity
+        if key is not None:
+            self.by_key[key] = entity_id
+        self.events.append(("add", entity_id, kind, key))
+        return entity_id
+
+    def remove(self, entity_id):
+        """Unregister an entity; returns False if the ID is stale or unknown"""
+        index = id_index(entity_id)
+        if not self.is_alive(entity_id):
+            return False
+
+        kind = self.slot_kinds[index]
+        key = self.slot_keys[index]
+        del self.by_kind[kind][entity_id]
+        if key is not None and self.by_key.get(key) == entity_id:
+            del self.by_key[key]
+
+        self.slots[index] = None
+        self.slot_kinds[index] = None
+        self.slot_keys[index] = None
+        self.generations[index] += 1
+        self.free_slots.append(index)
+        self.events.append(("remove", entity_id, kind, key))
+        return True
+
+    def is_alive(self, entity_id):
+        index = id_index(entity_id)
+        return (index < len(self.slots) and self.slots[index] is not None
+                and self.generations[index] == id_generation(entity_id))
+
+    def get(self, entity_id):
+        """Look up an entity by ID, or None if it has been removed"""
+        if self.is_alive(entity_id):
+            return self.slots[id_index(entity_id)]
+        return None
+
+    def find(self, key):
+        """Look up an entity by its external key, or None"""
+        entity_id = self.by_key.get(key)
+        if entity_id is None:
+            return None
+        return self.get(entity_id)
+
+    def key_of(self, entity_id):
+        """External key an entity was registered with, or None"""
+        if self.is_alive(entity_id):
+            return self.slot_keys[id_index(entity_id)]
+        return None
+
+    def kind(self, kind):
+        """Live {entity_id: entity} dict of one kind (do not modify it directly)"""
+        entities = self.by_kind.get(kind)
+        if entities is None:
+            entities = self.by_kind[kind] = {}
+        return entities
+
+    def drain_events(self):
+        """Take the add/remove events recorded since the last call"""
+        events = self.events
+        self.events = []
+        return events
+
+    def __len__(self):
+        return sum(len(entities) for entities in self.by_kind.values())
@@ -0,0 +1,147 @@
+import hashlib
+import os
+import struct
+import zlib
+from array import array
+
+from entities.player import Player
+from network.network_manager import NetworkManager
+from weapons.registry import UNARMED_ID, get_weapon_registry
+from world.simulation import WorldSimulation
+from world.spawner import MonsterSpawner
+from world.tilemap import TileMap
+
+MAGIC = b"GGIR"
+VERSION = 2
+
+# magic, version, world seed, difficulty, frame count, then the zlib-compressed frames
+HEADER = struct.Struct("<4sHq16sI")
+
+# One input frame of the local player: dt, move x, move y, whether it attacks, weapon held
+FRAME = struct.Struct("<dbb?B")
+FRAME_V1 = struct.Struct("<dbb?")  # Version 1 had no weapon: always Unarmed
+ATTACK = struct.Struct("<dd")  # Attack target, only present when the frame attacks
+
+RECORDINGS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "recordings")
+
+
+class ReplayFormatError(Exception):
+    """A recording is truncated, corrupt or from a newer version"""
+
+
+class InputRecorder:
+    """Records the local player's input frames of an offline game from its start.
+
+    Together with the world seed and difficulty that is everything the
+    simulation depends on, so run_replay can rebuild the game headless.
+    Frames are packed as they come and compressed once on save.
+    """
+
+    def __init__(self, seed, difficulty):
+        self.seed = seed
+        self.difficulty = difficulty
+        self.data = bytearray()
+        self.frame_count = 0
+
+    def record(self, dt, move_input, attack=None, weapon_id=UNARMED_ID):
+        self.data += FRAME.pack(dt, move_input[0], move_input[1], attack is not None, weapon_id)
+        if attack is not None:
+            self.data += ATTACK.pack(attack[0], attack[1])
+        self.frame_count += 1
+
+    def save(self, path):
+        """Write the recording (temp file + rename, so a crash never leaves half of one)"""
+        header = HEADER.pack(MAGIC, VERSION, self.seed, self.difficulty.encode('utf-8')[:16], self.frame_count)
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(header)
+            f.write(zlib.compress(bytes(self.data), 6))
+        os.replace(temp_path, path)
+
+
+class InputRecording:
+    """A loaded recording: world seed, difficulty and [(dt, move_input, attack or None, weapon_id)]"""
+
+    def __init__(self, seed, difficulty, frames):
+        self.seed = seed
+        self.difficulty = difficulty
+        self.frames = frames
+
+    @property
+    def duration(self):
+        return sum(frame[0] for frame in self.frames)
+
+
+def load_recording(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    if len(data) < HEADER.size:
+        raise ReplayFormatError(f"{os.path.basename(path)} is empty or truncated")
+    magic, version, seed, difficulty, frame_count = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ReplayFormatError(f"{os.path.basename(path)} is not an input recording")
+    if version > VERSION:
+        raise ReplayFormatError(f"{os.path.basename(path)} was recorded by a newer version ({version})")
+    try:
+        packed = zlib.decompress(data[HEADER.size:])
+    except zlib.error as e:
+        raise ReplayFormatError(f"{os.path.basename(path)} is corrupt: {e}")
+
+    frames = []
+    offset = 0
+    frame = FRAME if version >= 2 else FRAME_V1
+    weapon_id = UNARMED_ID
+    try:
+        for _ in range(frame_count):
+            if version >= 2:
+                dt, move_x, move_y, attacks, weapon_id = frame.unpack_from(packed, offset)
+            else:
+                dt, move_x, move_y, attacks = frame.unpack_from(packed, offset)
+            offset += frame.size
+            attack = None
+            if attacks:
+                attack = ATTACK.unpack_from(packed, offset)
+                offset += ATTACK.size
+            frames.append((dt, (move_x, move_y), attack, weapon_id))
+    except struct.error:
+        raise ReplayFormatError(f"{os.path.basename(path)} is truncated")
+    return InputRecording(seed, difficulty.rstrip(b"\0").decode('utf-8', 'replace'), frames)
+
+
+def build_world(seed, difficulty):
+    """A fresh offline world as GameScreen starts one; returns (simulation, player)"""
+    player = Player(400, 300, "player_1", is_local=True)
+    spawner = MonsterSpawner(seed, difficulty)
+    simulation = WorldSimulation(NetworkManager(), local_player=player, spawner=spawner)
+    tilemap = TileMap(seed)
+    player.terrain = tilemap
+    simulation.tilemap = tilemap
+    spawner.tilemap = tilemap
+    return simulation, player
+
+
+def play_frame(simulation, player, dt, move_input, attack, weapon_id=UNARMED_ID):
+    """One frame of an offline game: the local player picks a weapon, moves and attacks, then the world steps"""
+    player.equip_weapon(get_weapon_registry().get(weapon_id))
+    player.update(dt, move_input)
+    if attack is not None:
+        player.attack(attack[0], attack[1])
+    simulation.step(dt)
+
+
+def run_replay(recording):
+    """Play a recording headless, as fast as possible; returns (simulation, player)"""
+    simulation, player = build_world(recording.seed, recording.difficulty)
+    for dt, move_input, attack, weapon_id in recording.frames:
+        play_frame(simulation, player, dt, move_input, attack, weapon_id)
+    return simulation, player
+
+
+def world_digest(simulation):
+    """Hash of every player's and monster's exact state, to compare two runs bit for bit"""
+    values = array('d', [simulation.clock])
+    for entity in simulation.all_players() + list(simulation.monsters.values()):
+        values.extend((entity.x, entity.y, entity.vx, entity.vy, entity.current_health))
+        for projectile in entity.projectiles:
+            values.extend((projectile.x, projectile.y, projectile.vx, projectile.vy))
+    return hashlib.sha1(values.tobytes() + repr(sorted(simulation.monsters)).encode()).hexdigest()
@@ -0,0 +1,293 @@
+import math
+import random
+from entities.player import Player
+from entities.monster import Monster
+from world.registry import EntityRegistry
+from world.history import PositionHistory
+from world.chunks import ChunkManager
+from world.spatial import SpatialGrid
+from world.projectiles import ProjectileSystem
+from weapons.registry import get_weapon_registry
+
+# Longest frame a client's input may claim, and how much simulated time a client
+# can bank between input batches (to ride out network jitter) before it is cut off
+MAX_INPUT_DT = 0.1
+MAX_INPUT_BACKLOG = 0.25
+
+
+class WorldSimulation:
+    """Authoritative world: networked players, monsters and combat.
+
+    Owns the entity registry and the NetworkManager's game_state. Each step
+    applies queued client traffic (movement and attacks), advances the
+    world, resolves every player's and monster's projectiles in one pass and
+    publishes a snapshot. It runs headless in a dedicated server, and inside
+    GameScreen when playing offline or hosting, with local_player being the
+    player at the keyboard (moved by the screen, not by network input).
+
+    Without a spawner the world is a fixed arena of monster_count monsters;
+    with one it is an open world populated chunk by chunk as players explore.
+
+    The world is deterministic given its seed (the spawner's, if any) and
+    the inputs it is fed: every random choice comes from a stream seeded
+    from it and time is the simulated clock, never the wall clock, so a
+    recorded game replays exactly (see world/replay.py).
+    """
+
+    def __init__(self, network_manager, monster_count=5, local_player=None, spawner=None, seed=None):
+        self.network_manager = network_manager
+
+        # Seeded random streams and the simulated clock (seconds of world time)
+        if seed is None:
+            seed = spawner.seed if spawner is not None else random.getrandbits(63)
+        self.seed = seed
+        self.ai_random = self.random_stream("ai")
+        self.clock = 0.0
+        self.registry = EntityRegistry()
+        self.players = self.registry.kind("remote_player")
+        self.monsters = self.registry.kind("monster")
+
+        self.local_player = local_player
+        if local_player is not None:
+            self.registry.add(local_player, "player", key=local_player.player_id)
+
+        # Where monsters were over the last half second, for lag-compensated hits
+        self.history = PositionHistory(duration=0.5)
+
+        # Only the chunks around players are simulated; the rest wait on disk
+        self.chunks = ChunkManager(self.registry, spawner=spawner)
+
+        # Walls and terrain (a TileMap), if the world has any
+        self.tilemap = None
+
+        # Monsters by position for range queries, and every projectile's flight
+        self.monster_index = SpatialGrid()
+        self.projectiles = ProjectileSystem(self.monster_index)
+
+        if spawner is None:
+            arena_random = self.random_stream("arena")
+            for _ in range(monster_count):
+                x = arena_random.randint(100, 700)
+                y = arena_random.randint(100, 500)
+                self.registry.add(Monster(x, y, arena_random), "monster")
+
+    def random_stream(self, name):
+        """Independent random.Random for one part of the world, seeded from the world seed"""
+        return random.Random(f"{self.seed}:{name}")
+
+    def all_players(self):
+        """Every player in the world, local one first"""
+        players = list(self.players.values())
+        if self.local_player is not None:
+            players.insert(0, self.local_player)
+        return players
+
+    def step(self, dt):
+        """Advance the world by one tick"""
+        self.clock += dt
+        game_state = self.network_manager.game_state
+        pending_inputs = self.network_manager.process_inbound()
+
+        # Add and remove player entities to match the connected clients
+        for player_id, player_data in game_state["players"].items():
+            if self.registry.find(player_id) is None and "x" in player_data:
+                player = Player(player_data["x"], player_data["y"], player_id, is_local=False)
+                player.terrain = self.tilemap
+                self.registry.add(player, "remote_player", key=player_id)
+        weapons = get_weapon_registry()
+        for entity_id, player in list(self.players.items()):
+            state = game_state["players"].get(player.player_id)
+            if state is None:
+                self.registry.remove(entity_id)
+            elif "weapon" in state:
+                player.equip_weapon(weapons.get(state["weapon"]))
+
+        self.chunks.update(self.all_players())
+
+        # Move players from their input frames; attacks fire in the frame they were made.
+        # Clients report their own frame times, so those are clamped: together they may
+        # not cover more simulated time than has actually passed.
+        for player in self.players.values():
+            player.input_budget = min(player.input_budget + dt, MAX_INPUT_BACKLOG)
+            for sequence, move_input, input_dt, attack in pending_inputs.get(player.player_id, []):
+                input_dt = max(0.0, min(input_dt, MAX_INPUT_DT, player.input_budget))
+                player.input_budget -= input_dt
+                if input_dt > 0:
+                    player.apply_input(move_input, input_dt)
+                if attack is not None:
+                    player.attack(attack[0], attack[1])
+                player.last_input = sequence
+
+        # Monsters chase the nearest player
+        for monster in self.monsters.values():
+            monster.terrain = self.tilemap  # Monsters come and go with chunks
+            monster.rng = self.ai_random
+            target = self.nearest_player(monster)
+            if target is not None:
+                monster.update(dt, target.x, target.y)
+            else:
+                monster.update(dt, monster.x, monster.y)
+
+        self.history.record(self.clock, self.monsters)
+        self.monster_index.rebuild(self.monsters)
+        self.resolve_swings()
+
+        self.resolve_body_collisions()
+
+        self.handle_projectile_collisions(dt)
+        self.export_state()
+
+    def resolve_body_collisions(self):
+        """Push apart overlapping bodies, finding monsters through the grid instead of testing every pair"""
+        players = self.all_players()
+        for i in range(len(players)):
+            for j in range(i+1, len(players)):
+                if players[i].check_collision(players[j]):
+                    players[i].resolve_collision(players[j])
+
+        query = self.monster_index.query_circle
+        for player in players:
+            for monster_id, monster in query(player.x, player.y, player.collision_radius):
+                player.resolve_collision(monster)
+        for monster_id, monster in self.monsters.items():
+            for other_id, other in query(monster.x, monster.y, monster.collision_radius):
+                if other_id > monster_id:  # Each pair once, and not the monster itself
+                    monster.resolve_collision(other)
+
+    def nearest_player(self, entity):
+        nearest = None
+        nearest_distance = None
+        for player in self.all_players():
+            distance = (player.x - entity.x)**2 + (player.y - entity.y)**2
+            if nearest_distance is None or distance < nearest_distance:
+                nearest = player
+                nearest_distance = distance
+        return nearest
+
+    def resolve_swings(self):
+        """Melee swings made this tick hit every monster in the weapon's arc (or along a thrust)"""
+        for player in self.all_players():
+            if not player.swings:
+                continue
+            reach = player.reach
+            half_angle = math.radians(player.weapon.arc) / 2
+            for direction in player.swings:
+                if half_angle > 0:
+                    hits = self.monster_index.query_arc(player.x, player.y, reach, direction, half_angle)
+                else:
+                    hits = self.monster_index.query_segment(player.x, player.y,
+                                                            player.x + math.cos(direction) * reach,
+                                                            player.y + math.sin(direction) * reach)
+                for monster_id, monster in hits:
+                    self.damage_monster(monster_id, monster, player.damage, player)
+            player.swings.clear()
+
+    def handle_projectile_collisions(self, dt):
+        """Fly every projectile, then player shots hitting monsters and monster shots hitting players"""
+        players = self.all_players()
+        shooters = players + list(self.monsters.values())
+        detonations = self.projectiles.step(shooters, players, dt, self.tilemap)
+
+        # Judge each player's shots against monsters where that player saw them
+        # (the local player sees the present, so its view latency is zero)
+        now = self.clock
+        shots = []
+        shot_owners = []
+        for player in players:
+            view_time = now - self.network_manager.view_latency(player.player_id)
+            for projectile in player.projectiles:
+                shots.append((view_time, projectile.x, projectile.y, projectile.collision_radius))
+                shot_owners.append((player, projectile))
+        for (player, projectile), monster_id in zip(shot_owners, self.history.hit_test(shots)):
+            if monster_id is None or monster_id in projectile.hit_ids or not projectile.alive:
+                continue
+            monster = self.registry.get(monster_id)
+            if monster is None:
+                continue
+            projectile.hit_ids.add(monster_id)
+            projectile.pierce -= 1
+            if projectile.pierce <= 0:
+                projectile.alive = False
+            if projectile.blast_radius:
+                detonations.append((player, projectile))  # Bombs hurt through their blast
+            else:
+                self.damage_monster(monster_id, monster, projectile.damage, player)
+
+        # Bombs that hit something or ran out of range blow up everything around them
+        for owner, bomb in detonations:
+            bomb.alive = False
+            for monster_id, monster in self.monster_index.query_circle(bomb.x, bomb.y, bomb.blast_radius):
+                if bomb.owner_type == "player":
+                    self.damage_monster(monster_id, monster, bomb.damage, owner)
+            if bomb.owner_type == "monster":
+                for player in players:
+                    if (player.x - bomb.x)**2 + (player.y - bomb.y)**2 < (bomb.blast_radius + player.radius)**2:
+                        player.current_health = max(0, player.current_health - bomb.damage)
+
+        for monster in self.monsters.values():
+            for projectile in monster.projectiles:
+                if not projectile.alive:
+                    continue
+                for player in players:
+                    if projectile.check_collision(player):
+                        if not player.blocks(projectile):
+                            player.current_health = max(0, player.current_health - projectile.damage)
+                        projectile.alive = False
+                        break
+
+        self.projectiles.retire(shooters)
+
+    def damage_monster(self, monster_id, monster, damage, player):
+        """Hurt a monster, crediting the player with the kill"""
+        if not self.registry.is_alive(monster_id):
+            return  # Already killed earlier this tick
+        monster.current_health -= damage
+        if monster.current_health <= 0:
+            self.registry.remove(monster_id)
+            player.gain_experience(20)
+
+    def export_state(self):
+        """Write the world into game_state and publish it to the network threads"""
+        game_state = self.network_manager.game_state
+
+        for event, entity_id, kind, key in self.registry.drain_events():
+            if event == "remove" and kind == "monster":
+                game_state["monsters"].pop(f"monster_{entity_id}", None)
+
+        # The host is authoritative for everything but a client's name and weapon
+        for player in self.players.values():
+            state = game_state["players"].get(player.player_id)
+            if state is not None:
+                state["x"] = player.x
+                state["y"] = player.y
+                state["vx"] = player.vx
+                state["vy"] = player.vy
+                state["health"] = player.current_health
+                state["max_health"] = player.max_health
+                state["level"] = player.level
+                state["experience"] = player.experience
+                state["last_input"] = player.last_input
+
+        for entity_id, monster in self.monsters.items():
+            game_state["monsters"][f"monster_{entity_id}"] = {
+                "x": monster.x,
+                "y": monster.y,
+                "radius": monster.radius,
+                "health": monster.current_health,
+                "max_health": monster.max_health
+            }
+
+        game_state["projectiles"] = [
+            {"x": proj.x, "y": proj.y, "vx": proj.vx, "vy": proj.vy, "owner": "player",
+             "type": proj.projectile_type}
+            for player in self.all_players()
+            for proj in player.projectiles
+        ] + [
+            {"x": proj.x, "y": proj.y, "vx": proj.vx, "vy": proj.vy, "owner": "monster"}
+            for monster in self.monsters.values()
+            for proj in monster.projectiles
+        ]
+
+        # Offline games have nobody to publish to
+        if self.network_manager.is_host:
+            self.network_manager.publish_snapshot()
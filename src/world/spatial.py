@@ -0,0 +1,103 @@
+import math
+
+
+class SpatialGrid:
+    """Uniform grid over entity positions for range queries.
+
+    Rebuilt once per tick from the live entities (O(n)); a query then only
+    looks at the cells its shape overlaps instead of every entity. Cells are
+    larger than any entity, so an entity is filed under the cell of its
+    centre and queries widen their search by max_radius.
+    """
+
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self.cells = {}  # {(cx, cy): [(entity_id, entity)]}
+        self.max_radius = 0.0
+
+    def rebuild(self, entities):
+        """Index {entity_id: entity} at their current positions"""
+        cells = {}
+        size = self.cell_size
+        max_radius = 0.0
+        for entity_id, entity in entities.items():
+            cells.setdefault((int(entity.x // size), int(entity.y // size)), []).append((entity_id, entity))
+            if entity.collision_radius > max_radius:
+                max_radius = entity.collision_radius
+        self.cells = cells
+        self.max_radius = max_radius
+
+    def candidates(self, left, top, right, bottom):
+        """Entities whose cell overlaps a box (widened by the largest radius)"""
+        size = self.cell_size
+        pad = self.max_radius
+        cells = self.cells
+        for cy in range(int((top - pad) // size), int((bottom + pad) // size) + 1):
+            for cx in range(int((left - pad) // size), int((right + pad) // size) + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    yield from bucket
+
+    def query_circle(self, x, y, radius):
+        """[(entity_id, entity)] overlapping a circle"""
+        found = []
+        for entity_id, entity in self.candidates(x - radius, y - radius, x + radius, y + radius):
+            reach = radius + entity.collision_radius
+            if (entity.x - x)**2 + (entity.y - y)**2 < reach * reach:
+                found.append((entity_id, entity))
+        return found
+
+    def nearest(self, x, y, max_distance):
+        """Closest entity centre within max_distance, as (entity_id, entity), or None"""
+        best = None
+        best_distance = max_distance * max_distance
+        for entity_id, entity in self.candidates(x - max_distance, y - max_distance,
+                                                 x + max_distance, y + max_distance):
+            distance = (entity.x - x)**2 + (entity.y - y)**2
+            if distance <= best_distance:
+                best = (entity_id, entity)
+                best_distance = distance
+        return best
+
+    def query_arc(self, x, y, radius, direction, half_angle):
+        """[(entity_id, entity)] overlapping a circular sector facing direction (radians)"""
+        found = []
+        for entity_id, entity in self.candidates(x - radius, y - radius, x + radius, y + radius):
+            if arc_overlaps(x, y, radius, direction, half_angle, entity.x, entity.y, entity.collision_radius):
+                found.append((entity_id, entity))
+        return found
+
+    def query_segment(self, x1, y1, x2, y2, width=0.0):
+        """[(entity_id, entity)] within width of the segment from (x1, y1) to (x2, y2)"""
+        found = []
+        for entity_id, entity in self.candidates(min(x1, x2) - width, min(y1, y2) - width,
+                                                 max(x1, x2) + width, max(y1, y2) + width):
+            reach = width + entity.collision_radius
+            if segment_distance_sq(x1, y1, x2, y2, entity.x, entity.y) < reach * reach:
+                found.append((entity_id, entity))
+        return found
+
+
+def arc_overlaps(x, y, radius, direction, half_angle, px, py, pr):
+    """Whether a circle at (px, py) of radius pr overlaps a sector of a circle at (x, y)"""
+    dx = px - x
+    dy = py - y
+    distance = math.sqrt(dx*dx + dy*dy)
+    if distance >= radius + pr:
+        return False
+    if distance <= pr:
+        return True  # Overlaps the sector's tip
+    off_angle = abs((math.atan2(dy, dx) - direction + math.pi) % (2 * math.pi) - math.pi)
+    return off_angle <= half_angle + math.asin(pr / distance)
+
+
+def segment_distance_sq(x1, y1, x2, y2, px, py):
+    """Squared distance from a point to a segment"""
+    sx = x2 - x1
+    sy = y2 - y1
+    length_sq = sx*sx + sy*sy
+    t = ((px - x1) * sx + (py - y1) * sy) / length_sq if length_sq else 0.0
+    t = max(0.0, min(1.0, t))
+    dx = x1 + sx * t - px
+    dy = y1 + sy * t - py
+    return dx*dx + dy*dy
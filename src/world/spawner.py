@@ -0,0 +1,46 @@
+import random
+from entities.monster import Monster
+
+# Monsters per chunk relative to Medium
+DIFFICULTY_DENSITY = {"Easy": 0.5, "Medium": 1.0, "Hard": 1.75}
+
+
+class MonsterSpawner:
+    """Deterministic monster populations for chunks visited for the first time.
+
+    A chunk's monsters come from a Random seeded by the world seed and the
+    chunk coordinate alone, so one seed always grows the same world whatever
+    order it is explored in. Difficulty scales how many spawn per chunk
+    (changing it only affects chunks generated afterwards). How many of them
+    are simulated at once is up to the ChunkManager.
+    """
+
+    def __init__(self, seed=None, difficulty="Medium", density=4):
+        self.seed = seed if seed is not None else random.getrandbits(63)
+        self.difficulty = difficulty
+        self.density = density  # Average monsters per chunk on Medium
+        self.tilemap = None  # Monsters aren't placed inside its walls
+        self.spawned = 0
+
+    def chunk_random(self, coord):
+        return random.Random(f"{self.seed}:{coord[0]}:{coord[1]}")
+
+    def populate(self, coord, chunk_size):
+        """The full population of a chunk that has never been generated"""
+        rng = self.chunk_random(coord)
+        expected = self.density * DIFFICULTY_DENSITY.get(self.difficulty, 1.0)
+        count = int(expected * rng.uniform(0.5, 1.5) + 0.5)
+
+        left = coord[0] * chunk_size
+        top = coord[1] * chunk_size
+        monsters = []
+        for _ in range(count):
+            monster = Monster(left, top, rng)
+            for _ in range(8):
+                monster.x = left + rng.uniform(0, chunk_size)
+                monster.y = top + rng.uniform(0, chunk_size)
+                if self.tilemap is None or self.tilemap.free_position(monster.x, monster.y, monster.radius):
+                    break
+            monsters.append(monster)
+        self.spawned += len(monsters)
+        return monsters
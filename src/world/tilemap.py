@@ -0,0 +1,191 @@
+import random
+from collections import OrderedDict
+import pygame
+from world.chunks import CHUNK_SIZE
+
+TILE_SIZE = 64
+CHUNK_TILES = CHUNK_SIZE // TILE_SIZE  # Tiles per chunk side
+
+# Tile types
+FLOOR = 0
+ROUGH = 1  # Decorative ground
+WALL = 2
+
+SOLID = bytes(1 if tile == WALL else 0 for tile in range(256))  # Collision flag per tile type
+
+TILE_COLORS = {FLOOR: (30, 30, 30), ROUGH: (45, 40, 35), WALL: (110, 110, 120)}
+GRID_COLOR = (200, 200, 200)
+
+
+class TileChunk:
+    """Tiles of one chunk, row by row, and the matching collision bitmap"""
+
+    def __init__(self, tiles):
+        self.tiles = tiles  # bytearray of CHUNK_TILES * CHUNK_TILES tile types
+        self.solid = bytearray(SOLID[tile] for tile in tiles)
+        self.version = 0  # Bumped on every change so cached renders know to redraw
+
+
+class TileMap:
+    """Walls and terrain, generated per chunk from the world seed.
+
+    Each chunk is built once, the first time anything asks about it, into a
+    tile array plus a solid bitmap; after that collision queries only look
+    at the handful of tiles under an entity, so their cost doesn't grow with
+    the map. The area around the spawn point is always left open.
+    """
+
+    def __init__(self, seed, spawn=(400, 300), clear_radius=3):
+        self.seed = seed
+        self.spawn = spawn
+        self.clear_radius = clear_radius  # Tiles kept free around the spawn point
+        self.chunks = {}  # {(cx, cy): TileChunk}
+
+    def chunk(self, coord):
+        chunk = self.chunks.get(coord)
+        if chunk is None:
+            chunk = self.chunks[coord] = TileChunk(self.generate(coord))
+        return chunk
+
+    def generate(self, coord):
+        """Deterministic tiles for a chunk: some rough ground and a few wall segments"""
+        rng = random.Random(f"tiles:{self.seed}:{coord[0]}:{coord[1]}")
+        tiles = bytearray(CHUNK_TILES * CHUNK_TILES)
+        for _ in range(rng.randint(4, 10)):
+            tiles[rng.randrange(len(tiles))] = ROUGH
+        for _ in range(rng.randint(2, 4)):
+            tx = rng.randint(1, CHUNK_TILES - 2)
+            ty = rng.randint(1, CHUNK_TILES - 2)
+            dx, dy = rng.choice(((1, 0), (0, 1)))
+            for _ in range(rng.randint(3, 7)):
+                if tx >= CHUNK_TILES - 1 or ty >= CHUNK_TILES - 1:
+                    break
+                tiles[ty * CHUNK_TILES + tx] = WALL
+                tx += dx
+                ty += dy
+
+        # Keep the spawn area open
+        spawn_tx = int(self.spawn[0] // TILE_SIZE) - coord[0] * CHUNK_TILES
+        spawn_ty = int(self.spawn[1] // TILE_SIZE) - coord[1] * CHUNK_TILES
+        for ty in range(spawn_ty - self.clear_radius, spawn_ty + self.clear_radius + 1):
+            for tx in range(spawn_tx - self.clear_radius, spawn_tx + self.clear_radius + 1):
+                if 0 <= tx < CHUNK_TILES and 0 <= ty < CHUNK_TILES:
+                    tiles[ty * CHUNK_TILES + tx] = FLOOR
+        return tiles
+
+    def tile_at(self, tx, ty):
+        """Tile type at tile coordinates"""
+        chunk = self.chunk((tx // CHUNK_TILES, ty // CHUNK_TILES))
+        return chunk.tiles[(ty % CHUNK_TILES) * CHUNK_TILES + tx % CHUNK_TILES]
+
+    def set_tile(self, tx, ty, tile):
+        """Change one tile; the chunk's render is redrawn next time it is shown"""
+        chunk = self.chunk((tx // CHUNK_TILES, ty // CHUNK_TILES))
+        index = (ty % CHUNK_TILES) * CHUNK_TILES + tx % CHUNK_TILES
+        if chunk.tiles[index] != tile:
+            chunk.tiles[index] = tile
+            chunk.solid[index] = SOLID[tile]
+            chunk.version += 1
+
+    def solid_tile(self, tx, ty):
+        chunk = self.chunk((tx // CHUNK_TILES, ty // CHUNK_TILES))
+        return chunk.solid[(ty % CHUNK_TILES) * CHUNK_TILES + tx % CHUNK_TILES]
+
+    def is_solid(self, x, y):
+        """Whether a world position is inside a wall"""
+        return self.solid_tile(int(x // TILE_SIZE), int(y // TILE_SIZE))
+
+    def collide(self, entity):
+        """Push a circular entity out of any walls it overlaps and stop it moving into them"""
+        radius = entity.collision_radius
+        for ty in range(int((entity.y - radius) // TILE_SIZE), int((entity.y + radius) // TILE_SIZE) + 1):
+            for tx in range(int((entity.x - radius) // TILE_SIZE), int((entity.x + radius) // TILE_SIZE) + 1):
+                if not self.solid_tile(tx, ty):
+                    continue
+                left = tx * TILE_SIZE
+                top = ty * TILE_SIZE
+                # Closest point of the tile to the entity's centre
+                nearest_x = min(max(entity.x, left), left + TILE_SIZE)
+                nearest_y = min(max(entity.y, top), top + TILE_SIZE)
+                dx = entity.x - nearest_x
+                dy = entity.y - nearest_y
+                distance_sq = dx * dx + dy * dy
+                if distance_sq >= radius * radius:
+                    continue
+                if distance_sq > 0:
+                    distance = distance_sq ** 0.5
+                    nx, ny = dx / distance, dy / distance
+                    push = radius - distance
+                else:
+                    # Centre inside the tile: leave by the nearest edge
+                    exits = ((entity.x - left, -1, 0), (left + TILE_SIZE - entity.x, 1, 0),
+                             (entity.y - top, 0, -1), (top + TILE_SIZE - entity.y, 0, 1))
+                    depth, nx, ny = min(exits)
+                    push = depth + radius
+                entity.x += nx * push
+                entity.y += ny * push
+                # Drop the velocity component going into the wall
+                into = entity.vx * nx + entity.vy * ny
+                if into < 0:
+                    entity.vx -= into * nx
+                    entity.vy -= into * ny
+
+    def free_position(self, x, y, radius):
+        """Whether a circle at (x, y) is clear of walls"""
+        for ty in range(int((y - radius) // TILE_SIZE), int((y + radius) // TILE_SIZE) + 1):
+            for tx in range(int((x - radius) // TILE_SIZE), int((x + radius) // TILE_SIZE) + 1):
+                if self.solid_tile(tx, ty):
+                    return False
+        return True
+
+
+class TileRenderer:
+    """Draws the tilemap from one pre-rendered surface per chunk.
+
+    A chunk is rasterised (tiles and grid lines) the first time it comes
+    into view and again only when its tiles change; each frame just blits
+    the few surfaces overlapping the screen. Surfaces are kept for the most
+    recently seen max_cached chunks.
+    """
+
+    def __init__(self, tilemap, max_cached=8):
+        self.tilemap = tilemap
+        self.max_cached = max_cached
+        self.surfaces = OrderedDict()  # {coord: (version, surface)}, least recently drawn first
+        self.rasterised = 0
+
+    def draw(self, screen, camera_x, camera_y):
+        left = int(camera_x // CHUNK_SIZE)
+        top = int(camera_y // CHUNK_SIZE)
+        right = int((camera_x + screen.get_width()) // CHUNK_SIZE)
+        bottom = int((camera_y + screen.get_height()) // CHUNK_SIZE)
+        for cy in range(top, bottom + 1):
+            for cx in range(left, right + 1):
+                surface = self.surface((cx, cy))
+                screen.blit(surface, (cx * CHUNK_SIZE - camera_x, cy * CHUNK_SIZE - camera_y))
+
+    def surface(self, coord):
+        chunk = self.tilemap.chunk(coord)
+        cached = self.surfaces.get(coord)
+        if cached is not None and cached[0] == chunk.version:
+            self.surfaces.move_to_end(coord)
+            return cached[1]
+
+        surface = cached[1] if cached is not None else pygame.Surface((CHUNK_SIZE, CHUNK_SIZE))
+        self.rasterise(chunk, surface)
+        self.surfaces[coord] = (chunk.version, surface)
+        self.surfaces.move_to_end(coord)
+        while len(self.surfaces) > self.max_cached:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def rasterise(self, chunk, surface):
+        surface.fill(TILE_COLORS[FLOOR])
+        for index, tile in enumerate(chunk.tiles):
+            if tile != FLOOR:
+                tx, ty = index % CHUNK_TILES, index // CHUNK_TILES
+                surface.fill(TILE_COLORS[tile], (tx * TILE_SIZE, ty * TILE_SIZE, TILE_SIZE, TILE_SIZE))
+        for i in range(CHUNK_TILES):
+            pygame.draw.line(surface, GRID_COLOR, (i * TILE_SIZE, 0), (i * TILE_SIZE, CHUNK_SIZE))
+            pygame.draw.line(surface, GRID_COLOR, (0, i * TILE_SIZE), (CHUNK_SIZE, i * TILE_SIZE))
+        self.rasterised += 1
@@ -0,0 +1,9 @@
+import os
+import sys
+
+# The game imports its packages from src (it is run from there)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+# Nothing under test opens a window, but pygame is imported by the entities
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
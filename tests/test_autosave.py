@@ -0,0 +1,74 @@
+import os
+import threading
+
+import pytest
+
+from entities.player import Player
+from storage import autosave, save_format
+from storage.autosave import Autosaver
+from storage.save_format import SaveFile, read_info
+from storage.world_save import capture_world
+
+
+def capture(playtime):
+    player = Player(100, 200, "player_1", is_local=True)
+    return lambda: capture_world(player, [], playtime, name="Autosave")
+
+
+def test_saves_in_the_background(tmp_path):
+    path = str(tmp_path / "game.save")
+    autosaver = Autosaver()
+    autosaver.save(path, capture(12.0))
+    assert autosaver.wait(5)
+    assert read_info(path).playtime == pytest.approx(12.0)
+    assert autosaver.get_stats()["saves_written"] == 1
+
+
+def test_previous_versions_rotate_into_backups(tmp_path):
+    path = str(tmp_path / "game.save")
+    autosaver = Autosaver(backups=2)
+    for playtime in (1.0, 2.0, 3.0, 4.0):
+        autosaver.save(path, capture(playtime))
+        assert autosaver.wait(5)
+    assert read_info(path).playtime == pytest.approx(4.0)
+    assert read_info(path + ".bak1").playtime == pytest.approx(3.0)
+    assert read_info(path + ".bak2").playtime == pytest.approx(2.0)
+    assert not os.path.exists(path + ".bak3")
+
+
+def test_a_crash_mid_write_leaves_the_previous_save_readable(tmp_path, monkeypatch):
+    path = str(tmp_path / "game.save")
+    autosaver = Autosaver()
+    autosaver.save(path, capture(1.0))
+    assert autosaver.wait(5)
+
+    def crash(fd):
+        raise OSError("disk full")
+    monkeypatch.setattr(save_format.os, "fsync", crash)
+    autosaver.save(path, capture(2.0))
+    assert autosaver.wait(5)
+
+    assert isinstance(autosaver.last_error, OSError)
+    with SaveFile(path) as save:
+        assert save.info.playtime == pytest.approx(1.0)
+        assert save.section(b"PLYR") is not None
+
+
+def test_due_waits_for_the_interval_and_the_last_write(tmp_path, monkeypatch):
+    autosaver = Autosaver(interval=60.0)
+    assert not autosaver.due(autosaver.last_save + 30)
+    assert autosaver.due(autosaver.last_save + 60)
+
+    # Hold the background write until the test lets it go
+    release = threading.Event()
+    write_snapshot = autosave.write_snapshot
+
+    def held_write(*args, **kwargs):
+        release.wait(5)
+        write_snapshot(*args, **kwargs)
+    monkeypatch.setattr(autosave, "write_snapshot", held_write)
+    autosaver.save(str(tmp_path / "game.save"), capture(1.0))
+    assert not autosaver.due(autosaver.last_save + 120)
+    release.set()
+    assert autosaver.wait(5)
+    assert autosaver.due(autosaver.last_save + 120)
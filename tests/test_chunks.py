@@ -0,0 +1,138 @@
+from world.chunks import ChunkManager
+from world.registry import EntityRegistry
+from world.spawner import MonsterSpawner
+
+
+class Body:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+def manager(max_monsters=10, difficulty="Hard", **kwargs):
+    return ChunkManager(EntityRegistry(), chunk_size=1000, spawner=MonsterSpawner(7, difficulty),
+                        max_monsters=max_monsters, **kwargs)
+
+
+def population(chunks, coord):
+    """Positions of every monster a chunk holds, simulated or deferred"""
+    monsters = [chunks.monsters[entity_id] for entity_id in chunks.resident[coord]] + chunks.deferred.get(coord, [])
+    return sorted((monster.x, monster.y) for monster in monsters)
+
+
+def test_generation_does_not_depend_on_exploration_order():
+    coords = [(0, 0), (1, 0), (2, 0)]
+    forward = manager()
+    for coord in coords:
+        forward.load(coord)
+        forward.admit()
+    backward = manager()
+    for coord in reversed(coords):
+        backward.load(coord)
+        backward.admit()
+    for coord in coords:
+        assert population(forward, coord) == population(backward, coord)
+    assert sum(len(population(forward, coord)) for coord in coords) > 10
+
+
+def test_live_monsters_stay_under_max_monsters():
+    chunks = manager(max_monsters=10, view_radius=1)
+    chunks.update([Body(500, 500)])
+    total = sum(len(population(chunks, coord)) for coord in chunks.resident)
+    assert len(chunks.monsters) == 10
+    assert chunks.get_stats()["deferred"] == total - 10
+    # Deferred monsters are still part of their chunk when it is saved
+    assert sum(len(monster_rows) for monster_rows, projectile_rows in chunks.capture().values()) == total
+
+
+def test_deferred_monsters_join_when_room_frees_up():
+    chunks = manager(max_monsters=10, view_radius=1)
+    chunks.update([Body(500, 500)])
+    for entity_id in list(chunks.monsters)[:4]:
+        chunks.registry.remove(entity_id)
+    chunks.update([Body(500, 500)])
+    assert len(chunks.monsters) == 10
+
+
+def test_generated_chunks_are_saved_even_when_empty():
+    chunks = manager(max_monsters=60, view_radius=0)
+    chunks.spawner.density = 0
+    chunks.load((5, 5))
+    assert population(chunks, (5, 5)) == []
+    assert (5, 5) in chunks.capture()
+
+
+def test_an_evicted_chunk_is_not_re_rolled():
+    chunks = manager(max_monsters=60, view_radius=0, max_resident=1)
+    chunks.spawner.density = 0
+    chunks.update([Body(500, 500)])
+    chunks.spawner.density = 20  # Would generate plenty if the chunk were rolled again
+    chunks.update([Body(1500, 500)])
+    assert (0, 0) not in chunks.resident and (0, 0) in chunks.unsaved
+    chunks.update([Body(500, 500)])
+    assert population(chunks, (0, 0)) == []
+
+
+def world(tmp_path=None, max_resident=1):
+    """A chunk manager without a spawner and one marked monster in chunk (0, 0)"""
+    from entities.monster import Monster
+    chunks = ChunkManager(EntityRegistry(), chunk_size=1000, view_radius=0, max_resident=max_resident,
+                          directory=str(tmp_path) if tmp_path else None)
+    monster = Monster(500, 500)
+    monster.current_health = 13
+    chunks.registry.add(monster, "monster")
+    chunks.update([Body(500, 500)])
+    return chunks
+
+
+def healths(chunks):
+    return sorted(monster.current_health for monster in chunks.monsters.values())
+
+
+def test_an_evicted_dirty_chunk_comes_back_from_its_unsaved_rows():
+    chunks = world()
+    assert (0, 0) in chunks.dirty
+    chunks.update([Body(5500, 500)])
+    assert len(chunks.monsters) == 0 and (0, 0) in chunks.unsaved
+    chunks.update([Body(500, 500)])
+    assert healths(chunks) == [13]
+    assert (0, 0) in chunks.dirty and (0, 0) not in chunks.unsaved  # Still not on disk
+
+
+def test_a_chunk_reloaded_before_its_save_lands_comes_from_in_flight(tmp_path):
+    chunks = world(tmp_path)
+    snapshot_chunks = chunks.capture()  # The save's write hasn't happened yet
+    assert (0, 0) in snapshot_chunks and not chunks.dirty
+    chunks.update([Body(5500, 500)])
+    chunks.update([Body(500, 500)])
+    assert healths(chunks) == [13]
+
+
+def test_saved_chunks_come_back_from_disk(tmp_path):
+    from storage.world_save import chunk_path, write_chunk
+    chunks = world(tmp_path)
+    for coord, rows in chunks.capture().items():
+        write_chunk(chunk_path(str(tmp_path), coord), *rows)
+    for entity_id in list(chunks.monsters):
+        chunks.registry.remove(entity_id)
+    chunks.reset(str(tmp_path))  # As after loading that save
+    chunks.update([Body(500, 500)])
+    assert healths(chunks) == [13]
+
+
+def test_unsaved_chunks_are_written_by_the_next_save():
+    chunks = world()
+    chunks.update([Body(5500, 500)])
+    saved = chunks.capture()
+    assert len(saved[(0, 0)][0]) == 1
+    assert not chunks.unsaved and not chunks.dirty
+
+
+def test_a_monster_walking_into_an_unloaded_chunk_loads_it():
+    chunks = world(max_resident=4)
+    chunks.capture()
+    monster = next(iter(chunks.monsters.values()))
+    monster.x = 1500
+    chunks.update([Body(500, 500)])
+    assert (1, 0) in chunks.resident and (1, 0) in chunks.dirty
+    assert chunks.resident[(1, 0)] == {monster.entity_id}
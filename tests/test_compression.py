@@ -0,0 +1,42 @@
+import json
+import random
+
+from network.compression import SnapshotCompressor, decompress
+
+
+def snapshot(monsters):
+    return json.dumps({"type": "game_state", "data": {
+        "players": {"player_1": {"x": 400.0, "y": 300.0, "health": 100, "max_health": 100,
+                                 "name": "Player", "level": 1, "weapon": 0, "last_input": 12}},
+        "monsters": {f"monster_{i}": {"x": i * 10.0, "y": i * 5.0, "health": 50, "max_health": 50}
+                     for i in range(monsters)},
+        "projectiles": []}, "timestamp": 1234.5}).encode('utf-8')
+
+
+def test_round_trip():
+    payload = snapshot(40)
+    compressed, data = SnapshotCompressor().compress(payload)
+    assert compressed
+    assert len(data) < len(payload)
+    assert decompress(data) == payload
+
+
+def test_small_payload_sent_raw():
+    payload = snapshot(0)
+    compressor = SnapshotCompressor(threshold=len(payload) + 1)
+    assert compressor.compress(payload) == (False, payload)
+
+
+def test_incompressible_payload_sent_raw():
+    payload = random.Random(0).randbytes(1024)
+    compressed, data = SnapshotCompressor(threshold=0).compress(payload)
+    assert not compressed
+    assert data == payload
+
+
+def test_stats_track_ratio():
+    compressor = SnapshotCompressor()
+    compressor.compress(snapshot(40))
+    stats = compressor.get_stats()
+    assert 0 < stats["last_ratio"] < 1
+    assert stats["total_ratio"] == stats["last_ratio"]
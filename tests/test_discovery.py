@@ -0,0 +1,52 @@
+import socket
+
+from network.discovery import DiscoveryService
+
+
+def free_udp_port():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(('', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def test_quick_release_and_acquire_keeps_one_listener():
+    service = DiscoveryService(port=free_udp_port())
+    service.acquire()
+    first = service.thread
+    service.release()
+    service.acquire()
+    second = service.thread
+    assert second is not first
+
+    # The old listener winds down; the new one ends up owning the only socket
+    first.join(timeout=3)
+    assert not first.is_alive()
+    for _ in range(100):
+        if service.socket is not None:
+            break
+        second.join(timeout=0.05)
+    assert second.is_alive()
+    assert service.socket is not None
+    assert service.socket.fileno() != -1
+
+    service.release()
+    second.join(timeout=3)
+    assert not second.is_alive()
+    assert service.socket is None
+
+
+def test_packets_are_deduplicated_and_expire():
+    service = DiscoveryService(ttl=10.0)
+    events = []
+    service.subscribe(lambda event, game: events.append((event, game["name"])))
+    packet = b'{"type": "game_discovery", "name": "A", "host": "10.0.0.1", "port": 1, "players": 1}'
+    service._handle_packet(packet, now=0.0)
+    service._handle_packet(packet, now=5.0)
+    assert len(service.get_games()) == 1
+    service._expire(now=12.0)
+    assert len(service.get_games()) == 1  # The refresh at t=5 keeps it until t=15
+    service._expire(now=15.0)
+    assert service.get_games() == []
+    assert events == [("added", "A"), ("removed", "A")]
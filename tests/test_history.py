@@ -0,0 +1,84 @@
+from world.history import PositionHistory
+from world.registry import EntityRegistry
+
+
+class Body:
+    def __init__(self, x, y, radius=10):
+        self.x = x
+        self.y = y
+        self.collision_radius = radius
+
+
+def moving_monster(frames=10):
+    """A monster moving 10 px to the right per 0.1 s frame"""
+    registry = EntityRegistry()
+    monster = Body(0.0, 0.0)
+    monster_id = registry.add(monster, "monster")
+    history = PositionHistory(duration=1.0, rate=10)
+    for frame in range(frames):
+        monster.x = frame * 10.0
+        history.record(frame * 0.1, registry.kind("monster"))
+    return history, monster_id
+
+
+def test_hit_at_the_rewound_position_only():
+    history, monster_id = moving_monster()
+    # At t=0.3 the monster was at x=30; it is now at x=90
+    assert history.hit_test([(0.3, 30.0, 0.0, 2)]) == [monster_id]
+    assert history.hit_test([(0.3, 90.0, 0.0, 2)]) == [None]
+    assert history.hit_test([(0.9, 90.0, 0.0, 2)]) == [monster_id]
+
+
+def test_interpolates_between_frames():
+    history, monster_id = moving_monster()
+    # Halfway between the x=30 and x=40 frames
+    assert history.hit_test([(0.35, 35.0, 0.0, 0.5)]) == [monster_id]
+
+
+def test_times_outside_the_ring_clamp():
+    history, monster_id = moving_monster()
+    assert history.hit_test([(-5.0, 0.0, 0.0, 1), (5.0, 90.0, 0.0, 1)]) == [monster_id, monster_id]
+
+
+def test_removed_entities_are_not_hit_after_removal():
+    registry = EntityRegistry()
+    monster = Body(0.0, 0.0)
+    monster_id = registry.add(monster, "monster")
+    history = PositionHistory(duration=1.0, rate=10)
+    history.record(0.0, registry.kind("monster"))
+    registry.remove(monster_id)
+    history.record(0.1, registry.kind("monster"))
+    assert history.hit_test([(0.0, 0.0, 0.0, 1)]) == [monster_id]
+    assert history.hit_test([(0.1, 0.0, 0.0, 1)]) == [None]
+
+
+def test_empty_history_hits_nothing():
+    assert PositionHistory().hit_test([(0.0, 0.0, 0.0, 5)]) == [None]
+
+
+def test_closest_of_several_overlapping_entities_is_hit():
+    registry = EntityRegistry()
+    bodies = {registry.add(Body(x, 0.0), "monster"): x for x in (0.0, 12.0, 400.0)}
+    history = PositionHistory(duration=1.0, rate=10)
+    history.record(0.0, registry.kind("monster"))
+    by_x = {x: entity_id for entity_id, x in bodies.items()}
+    assert history.hit_test([(0.0, 8.0, 0.0, 5), (0.0, 3.0, 0.0, 5), (0.0, 395.0, 0.0, 1)]) == [
+        by_x[12.0], by_x[0.0], by_x[400.0]]
+
+
+def test_many_entities_resolve_like_a_full_scan():
+    registry = EntityRegistry()
+    for i in range(200):
+        registry.add(Body((i * 37) % 1000, (i * 91) % 800, 5 + i % 7), "monster")
+    history = PositionHistory(duration=1.0, rate=10)
+    history.record(0.0, registry.kind("monster"))
+    shots = [(0.0, (i * 53) % 1000, (i * 29) % 800, 4) for i in range(300)]
+
+    expected = []
+    for _, x, y, radius in shots:
+        overlapping = [((body.x - x)**2 + (body.y - y)**2, entity_id)
+                       for entity_id, body in registry.kind("monster").items()
+                       if (body.x - x)**2 + (body.y - y)**2 < (radius + body.collision_radius)**2]
+        expected.append(min(overlapping)[1] if overlapping else None)
+    assert history.hit_test(shots) == expected
+    assert any(hit is not None for hit in expected)
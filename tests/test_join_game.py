@@ -0,0 +1,96 @@
+import socket
+import time
+
+import pygame
+import pytest
+
+from network.discovery import DiscoveryService
+from network.network_manager import NetworkManager
+from screens import join_game
+from screens.join_game import JoinGameScreen
+
+
+def free_port(kind):
+    sock = socket.socket(socket.AF_INET, kind)
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def update_until(screen, condition, timeout=5.0):
+    """Run the screen's frames until condition(result) holds; returns the last result"""
+    end = time.time() + timeout
+    while time.time() < end:
+        start = time.perf_counter()
+        result = screen.update(1 / 60)
+        assert time.perf_counter() - start < 0.1  # A frame never waits on the network
+        if condition(result):
+            return result
+        time.sleep(0.01)
+    return None
+
+
+@pytest.fixture
+def screen(monkeypatch):
+    service = DiscoveryService(port=free_port(socket.SOCK_DGRAM))
+    monkeypatch.setattr(join_game, "get_discovery_service", lambda: service)
+    pygame.init()
+    join_screen = JoinGameScreen(pygame.display.set_mode((800, 600)))
+    yield join_screen
+    join_screen.network_manager.stop_networking()
+    if service.users:
+        join_screen.stop_discovery()
+    pygame.quit()
+
+
+def game(name, port):
+    return {"name": name, "host": "127.0.0.1", "port": port}
+
+
+def test_selection_follows_its_game_when_the_list_changes(screen, monkeypatch):
+    games = [game("A", 1), game("B", 2)]
+    monkeypatch.setattr(screen.network_manager, "get_discovered_games", lambda: list(games))
+    screen.discover_games()
+    screen.selected_game = 1
+    games.insert(0, game("C", 3))
+    screen.games_changed = True
+    screen.discover_games()
+    assert screen.discovered_games[screen.selected_game]["name"] == "B"
+    games.pop(2)
+    screen.games_changed = True
+    screen.discover_games()
+    assert screen.selected_game is None
+
+
+def test_connecting_to_a_host_opens_the_game(screen):
+    from screens.game_screen import GameScreen
+    host = NetworkManager()
+    host.port = free_port(socket.SOCK_STREAM)
+    assert host.start_hosting("test", host="127.0.0.1", broadcast=False)
+    try:
+        screen.start_connect(game("test", host.port))
+        result = update_until(screen, lambda result: result is not None)
+        assert isinstance(result, GameScreen)
+        assert result.network_manager is screen.network_manager and result.simulation is None
+    finally:
+        host.stop_networking()
+
+
+def test_a_failed_connect_shows_an_error_and_leaving_cancels_retries(screen):
+    screen.network_manager.max_reconnect_attempts = 2
+    screen.network_manager.reconnect_delay = 0.05
+    screen.start_connect(game("nobody", free_port(socket.SOCK_STREAM)))
+    update_until(screen, lambda result: not screen.connecting)
+    assert screen.error_message == "Failed to connect to game"
+
+    screen.network_manager.reconnect_delay = 30
+    screen.start_connect(game("nobody", free_port(socket.SOCK_STREAM)))
+    update_until(screen, lambda result: "retrying" in screen.connect_status)
+    assert "retrying" in screen.connect_status
+    start = time.perf_counter()
+    screen.leave()
+    # The connect thread gives up at once instead of sleeping out its retry delay
+    while screen.connect_events.get(timeout=1)[0] != "done":
+        pass
+    assert time.perf_counter() - start < 1.0
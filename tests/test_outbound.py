@@ -0,0 +1,80 @@
+import json
+import struct
+
+from network.outbound import OutboundAggregator, quantize_dt
+
+
+def decode(message):
+    length = struct.unpack('>I', message[:4])[0]
+    assert length == len(message) - 4
+    return json.loads(message[4:])
+
+
+def test_frames_between_ticks_go_out_as_one_batch():
+    outbound = OutboundAggregator(tick_rate=30)
+    for sequence in range(1, 4):
+        outbound.queue_input(sequence, (1, 0), quantize_dt(1 / 60))
+    outbound.queue_input(4, (0, -1), quantize_dt(1 / 60), attack=(120.04, 80.06))
+    batch = decode(outbound.build_message(now=100.0))
+    assert batch["type"] == "batch"
+    assert [row[0] for row in batch["inputs"]] == [1, 2, 3, 4]
+    assert batch["inputs"][0] == [1, 1, 0, 0.0167]
+    assert batch["inputs"][3][4:] == [120.0, 80.1]
+    assert outbound.packets_sent == 1
+
+
+def test_nothing_is_sent_before_the_next_tick_or_when_empty():
+    outbound = OutboundAggregator(tick_rate=30)
+    outbound.queue_input(1, (1, 0), 0.0167)
+    assert outbound.build_message(now=100.0) is not None
+    outbound.queue_input(2, (1, 0), 0.0167)
+    assert outbound.build_message(now=100.01) is None  # Held for the next tick
+    assert [row[0] for row in decode(outbound.build_message(now=100.04))["inputs"]] == [2]
+    assert outbound.build_message(now=101.0) is None  # Nothing new
+
+
+def test_ticks_keep_a_steady_cadence():
+    outbound = OutboundAggregator(tick_rate=30)
+    sent = []
+    for frame in range(60):  # One second of 60 fps frames
+        now = 100.0 + frame / 60
+        outbound.queue_input(frame, (1, 0), 0.0167)
+        if outbound.build_message(now=now) is not None:
+            sent.append(frame)
+    assert len(sent) == 30
+    assert sent[:3] == [0, 2, 4]
+
+
+def test_state_is_sent_as_a_delta():
+    outbound = OutboundAggregator()
+    outbound.update_state({"name": "Player", "weapon": 0})
+    assert decode(outbound.build_message(now=100.0))["state"] == {"name": "Player", "weapon": 0}
+    outbound.update_state({"name": "Player", "weapon": 5})
+    assert decode(outbound.build_message(now=101.0))["state"] == {"weapon": 5}
+    outbound.update_state({"name": "Player", "weapon": 5})
+    assert outbound.build_message(now=102.0) is None
+
+
+def test_view_delay_is_sent_when_it_changes():
+    outbound = OutboundAggregator()
+    outbound.set_view_delay(0.1)
+    assert decode(outbound.build_message(now=100.0)) == {"type": "batch", "delay": 100}
+    outbound.set_view_delay(0.1)
+    assert outbound.build_message(now=101.0) is None
+
+
+def test_reset_resends_the_full_state():
+    outbound = OutboundAggregator()
+    outbound.update_state({"name": "Player", "weapon": 0})
+    outbound.set_view_delay(0.1)
+    outbound.queue_input(1, (1, 0), 0.0167)
+    outbound.build_message(now=100.0)
+    outbound.queue_input(2, (1, 0), 0.0167)
+    outbound.reset()
+    batch = decode(outbound.build_message(now=100.001))
+    assert batch == {"type": "batch", "state": {"name": "Player", "weapon": 0}, "delay": 100}
+
+
+def test_quantize_dt():
+    assert quantize_dt(1 / 60) == 0.0167
+    assert quantize_dt(quantize_dt(1 / 60)) == quantize_dt(1 / 60)
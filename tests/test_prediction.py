@@ -0,0 +1,117 @@
+import pygame
+import pytest
+
+from entities.player import Player
+from network.network_manager import NetworkManager
+from network.prediction import InputPredictor
+
+
+def test_reconcile_replays_unacknowledged_inputs():
+    predictor = InputPredictor()
+    player = Player(0, 0, "player_2", is_local=False)
+    for _ in range(5):
+        player.apply_input((1, 0), 0.1)
+        predictor.record((1, 0), 0.1)
+
+    # The host has simulated the first three frames and ended up at x=10
+    reference = Player(10, 0, "reference", is_local=False)
+    reference.vx = 20.0
+    assert predictor.reconcile(player, {"x": 10.0, "y": 0.0, "vx": 20.0, "vy": 0.0, "last_input": 3})
+    assert [frame[0] for frame in predictor.pending] == [4, 5]
+    for _ in range(2):
+        reference.apply_input((1, 0), 0.1)
+    assert (player.x, player.y) == (reference.x, reference.y)
+
+    # An older or repeated acknowledgement changes nothing
+    assert not predictor.reconcile(player, {"x": 0.0, "y": 0.0, "last_input": 3})
+    assert (player.x, player.y) == (reference.x, reference.y)
+
+
+@pytest.fixture
+def client_screen():
+    from screens.game_screen import GameScreen
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    network_manager = NetworkManager()
+    network_manager.is_connected = True
+    network_manager.player_id = "player_2"
+    game = GameScreen(screen, network_manager=network_manager)
+    game.player.read_input = lambda: (1, 0)
+    yield game
+    pygame.quit()
+
+
+def receive(network_manager, state, timestamp):
+    """Deliver a snapshot the way NetworkManager._receive_from_host does"""
+    network_manager.game_state = state
+    network_manager.snapshot_buffer.add(state, timestamp)
+
+
+def test_client_reconciles_against_the_hosts_snapshot(client_screen):
+    game = client_screen
+    network_manager = game.network_manager
+    for _ in range(6):
+        game.update(0.05)
+    assert len(game.predictor.pending) == 6
+
+    host_state = {"x": 123.0, "y": 45.0, "vx": 0.0, "vy": 0.0, "health": 70, "max_health": 100,
+                  "level": 1, "experience": 40, "last_input": 4}
+    receive(network_manager, {"players": {"player_2": dict(host_state)}, "monsters": {}, "projectiles": []},
+            timestamp=1000.0)
+    game.update(0.05)
+
+    # The snapshot is still the host's, not overwritten by the client's own view
+    assert network_manager.snapshot_buffer.latest()["players"]["player_2"] == host_state
+    assert game.predictor.last_acknowledged == 4
+    assert [frame[0] for frame in game.predictor.pending] == [5, 6, 7]
+    assert game.player.current_health == 70
+    assert game.player.experience == 40
+
+    # Replaying the three unacknowledged frames from the host's position
+    reference = Player(123.0, 45.0, "reference", is_local=False)
+    for sequence, move_input, dt in game.predictor.pending:
+        reference.apply_input(move_input, dt)
+    assert (game.player.x, game.player.y) == (reference.x, reference.y)
+
+
+def test_client_predicts_with_the_frame_times_the_host_simulates(client_screen):
+    game = client_screen
+    network_manager = game.network_manager
+    start = (game.player.x, game.player.y)
+    for _ in range(8):
+        game.update(1 / 60)
+    sent = list(network_manager.outbound.inputs)
+    assert [row[3] for row in sent] == [dt for sequence, move_input, dt in game.predictor.pending]
+
+    # The host simulates the first five frames exactly as they were sent
+    host_player = Player(*start, "player_2", is_local=False)
+    for sequence, move_x, move_y, dt in sent[:5]:
+        host_player.apply_input((move_x, move_y), dt)
+    receive(network_manager, {"players": {"player_2": {
+        "x": host_player.x, "y": host_player.y, "vx": host_player.vx, "vy": host_player.vy,
+        "last_input": 5}}, "monsters": {}, "projectiles": []}, timestamp=1000.0)
+    game.update(1 / 60)
+    assert game.predictor.last_acknowledged == 5
+    assert game.predictor.last_correction == 0.0
+
+
+def test_client_takes_health_and_progression_from_the_host(client_screen):
+    game = client_screen
+    network_manager = game.network_manager
+    game.update(1 / 60)
+    host_state = {"x": 0.0, "y": 0.0, "health": 55, "max_health": 110, "level": 2, "experience": 15,
+                  "last_input": 1}
+    receive(network_manager, {"players": {"player_2": dict(host_state)}, "monsters": {}, "projectiles": []},
+            timestamp=1000.0)
+    for _ in range(3):
+        game.update(1 / 60)
+    assert (game.player.level, game.player.current_health, game.player.max_health, game.player.experience) == \
+        (2, 55, 110, 15)
+    assert network_manager.snapshot_buffer.latest()["players"]["player_2"] == host_state
+
+    # Local changes don't stick: the next snapshot is the authority
+    game.player.current_health = 100
+    receive(network_manager, {"players": {"player_2": dict(host_state, health=40, last_input=2)},
+                              "monsters": {}, "projectiles": []}, timestamp=1000.1)
+    game.update(1 / 60)
+    assert game.player.current_health == 40
@@ -0,0 +1,44 @@
+from world.registry import EntityRegistry, id_generation, id_index
+
+
+class Thing:
+    pass
+
+
+def test_ids_resolve_until_removed():
+    registry = EntityRegistry()
+    thing = Thing()
+    entity_id = registry.add(thing, "monster")
+    assert thing.entity_id == entity_id
+    assert registry.get(entity_id) is thing
+    assert registry.kind("monster") == {entity_id: thing}
+    assert registry.remove(entity_id)
+    assert registry.get(entity_id) is None
+    assert not registry.remove(entity_id)
+    assert registry.kind("monster") == {}
+
+
+def test_reused_slot_gets_a_new_generation():
+    registry = EntityRegistry()
+    old_id = registry.add(Thing(), "monster")
+    registry.remove(old_id)
+    new_thing = Thing()
+    new_id = registry.add(new_thing, "monster")
+    assert id_index(new_id) == id_index(old_id)
+    assert id_generation(new_id) == id_generation(old_id) + 1
+    assert registry.get(old_id) is None  # A stale ID never finds the new occupant
+    assert registry.get(new_id) is new_thing
+
+
+def test_keys_and_events():
+    registry = EntityRegistry()
+    player = Thing()
+    entity_id = registry.add(player, "player", key="player_1")
+    assert registry.find("player_1") is player
+    assert registry.key_of(entity_id) == "player_1"
+    registry.remove(entity_id)
+    assert registry.find("player_1") is None
+    assert registry.drain_events() == [("add", entity_id, "player", "player_1"),
+                                       ("remove", entity_id, "player", "player_1")]
+    assert registry.drain_events() == []
+    assert len(registry) == 0
@@ -0,0 +1,111 @@
+import random
+
+import pygame
+import pytest
+
+import zlib
+
+from world.replay import (FRAME_V1, HEADER, MAGIC, InputRecorder, ReplayFormatError, load_recording,
+                          run_replay, world_digest)
+
+
+def record(path, frames=300, seed=1234, difficulty="Hard", weapons=(0,)):
+    """Record a few seconds of wandering and attacking, as GameScreen would, and save it"""
+    rng = random.Random(seed)
+    recorder = InputRecorder(seed, difficulty)
+    move_input = (0, 0)
+    for frame in range(frames):
+        if frame % 20 == 0:
+            move_input = (rng.choice((-1, 0, 1)), rng.choice((-1, 0, 1)))
+        attack = (rng.uniform(0, 800), rng.uniform(0, 600)) if frame % 7 == 0 else None
+        weapon_id = weapons[frame * len(weapons) // frames]
+        recorder.record(1 / 60, move_input, attack, weapon_id)
+    recorder.save(str(path))
+    return recorder
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "game.rec"
+    recorder = record(path, frames=50)
+    recording = load_recording(str(path))
+    assert (recording.seed, recording.difficulty) == (1234, "Hard")
+    assert len(recording.frames) == recorder.frame_count == 50
+    assert recording.frames[0][1] == recording.frames[19][1]
+    assert recording.frames[0][2] is not None and recording.frames[1][2] is None
+    assert recording.duration == pytest.approx(50 / 60)
+
+
+def test_replays_are_bit_for_bit_identical(tmp_path):
+    path = tmp_path / "game.rec"
+    record(path)
+    recording = load_recording(str(path))
+    first, first_player = run_replay(recording)
+    second, second_player = run_replay(load_recording(str(path)))
+    assert world_digest(first) == world_digest(second)
+    assert (first_player.x, first_player.y) == (second_player.x, second_player.y)
+    # The recording actually exercised the world
+    assert first.clock == pytest.approx(300 / 60)
+    assert first_player.x != 400 or first_player.y != 300
+
+
+def test_weapon_switches_replay(tmp_path):
+    path = tmp_path / "game.rec"
+    record(path, weapons=(1, 5, 8))  # Rifle, then Sword, then Shield
+    recording = load_recording(str(path))
+    assert [frame[3] for frame in recording.frames[::100]] == [1, 5, 8]
+    first, first_player = run_replay(recording)
+    second, second_player = run_replay(recording)
+    assert world_digest(first) == world_digest(second)
+    assert first_player.weapon_name == "Shield"
+
+
+def test_version_1_recordings_still_load(tmp_path):
+    path = tmp_path / "old.rec"
+    frames = FRAME_V1.pack(1 / 60, 1, 0, False) + FRAME_V1.pack(1 / 60, 0, -1, False)
+    path.write_bytes(HEADER.pack(MAGIC, 1, 99, b"Easy", 2) + zlib.compress(frames))
+    recording = load_recording(str(path))
+    assert recording.frames == [(1 / 60, (1, 0), None, 0), (1 / 60, (0, -1), None, 0)]
+    run_replay(recording)
+
+
+def test_another_seed_grows_another_world(tmp_path):
+    record(tmp_path / "a.rec", frames=60, seed=1)
+    record(tmp_path / "b.rec", frames=60, seed=2)
+    a, _ = run_replay(load_recording(str(tmp_path / "a.rec")))
+    b, _ = run_replay(load_recording(str(tmp_path / "b.rec")))
+    assert world_digest(a) != world_digest(b)
+
+
+@pytest.mark.parametrize("damage", ["empty", "header", "frames", "corrupt", "magic", "version"])
+def test_damaged_recordings_raise_replay_format_error(tmp_path, damage):
+    path = tmp_path / "game.rec"
+    record(path, frames=50)
+    data = path.read_bytes()
+    if damage == "empty":
+        data = b""
+    elif damage == "header":
+        data = data[:HEADER.size - 1]
+    elif damage == "frames":
+        # A valid stream that holds fewer frames than the header claims
+        short = tmp_path / "short.rec"
+        record(short, frames=10)
+        data = data[:HEADER.size] + short.read_bytes()[HEADER.size:]
+    elif damage == "corrupt":
+        data = data[:HEADER.size] + b"\xff" * (len(data) - HEADER.size)
+    elif damage == "magic":
+        data = b"GGSV" + data[4:]
+    elif damage == "version":
+        data = data[:4] + b"\xff\xff" + data[6:]
+    path.write_bytes(data)
+    with pytest.raises(ReplayFormatError):
+        load_recording(str(path))
+
+
+def test_game_screen_records_only_when_asked():
+    from screens.game_screen import GameScreen
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    assert GameScreen(screen).recorder is None
+    recorder = GameScreen(screen, record_inputs=True).recorder
+    assert recorder is not None and recorder.frame_count == 0
+    pygame.quit()
@@ -0,0 +1,89 @@
+from array import array
+
+import pytest
+
+from storage.save_format import (HEADER, SaveFile, SaveFormatError, SaveInfo, SaveWriter,
+                                 pack_columns, read_info)
+
+
+def write_save(path, compress=False):
+    writer = SaveWriter(SaveInfo(name="Test", playtime=12.5, level=3, player_count=1, monster_count=2))
+    writer.add_section(b"MONS", pack_columns([array('f', [1.0, 2.0]), array('i', [7, 8])]), 2, compress=compress)
+    writer.add_section(b"NOTE", b"hello", compress=compress)
+    writer.write(str(path))
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_round_trip(tmp_path, compress):
+    path = tmp_path / "a.save"
+    write_save(path, compress)
+    with SaveFile(str(path)) as save:
+        assert save.info.name == "Test"
+        assert save.info.level == 3
+        assert save.count(b"MONS") == 2
+        columns = save.columns(b"MONS", [("x", "f"), ("n", "i")])
+        assert list(columns["x"]) == [1.0, 2.0]
+        assert list(columns["n"]) == [7, 8]
+        assert save.section(b"NOTE") == b"hello"
+        assert save.section(b"NONE") is None
+
+
+def test_read_info_only_needs_the_header(tmp_path):
+    path = tmp_path / "a.save"
+    write_save(path)
+    info = read_info(str(path))
+    assert (info.name, info.playtime, info.monster_count) == ("Test", 12.5, 2)
+
+
+def test_backups_rotate(tmp_path):
+    path = tmp_path / "a.save"
+    for _ in range(4):
+        write_save(path)
+        SaveWriter(SaveInfo()).write(str(path), backups=2)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a.save", "a.save.bak1", "a.save.bak2"]
+
+
+def test_truncated_header(tmp_path):
+    path = tmp_path / "a.save"
+    write_save(path)
+    path.write_bytes(path.read_bytes()[:HEADER.size - 1])
+    with pytest.raises(SaveFormatError):
+        SaveFile(str(path))
+    with pytest.raises(SaveFormatError):
+        read_info(str(path))
+
+
+def test_truncated_section(tmp_path):
+    path = tmp_path / "a.save"
+    write_save(path)
+    path.write_bytes(path.read_bytes()[:-8])
+    with pytest.raises(SaveFormatError):
+        SaveFile(str(path))
+
+
+def test_not_a_save(tmp_path):
+    path = tmp_path / "a.save"
+    path.write_bytes(b"x" * 200)
+    with pytest.raises(SaveFormatError):
+        SaveFile(str(path))
+
+
+def test_truncated_section_table(tmp_path):
+    path = tmp_path / "a.save"
+    write_save(path)
+    path.write_bytes(path.read_bytes()[:HEADER.size + 10])
+    with pytest.raises(SaveFormatError):
+        SaveFile(str(path))
+
+
+def test_corrupt_compressed_section(tmp_path):
+    path = tmp_path / "a.save"
+    write_save(path, compress=True)
+    with SaveFile(str(path)) as save:
+        codec, count, offset, length = save.sections[b"NOTE"]
+    data = bytearray(path.read_bytes())
+    data[offset:offset + length] = b"\xff" * length
+    path.write_bytes(bytes(data))
+    with SaveFile(str(path)) as save:
+        with pytest.raises(SaveFormatError):
+            save.section(b"NOTE")
@@ -0,0 +1,92 @@
+import os
+
+import pytest
+
+from storage import save_index
+from storage.save_format import SaveInfo, SaveWriter
+from storage.save_index import SaveIndex
+
+
+def write(directory, name, playtime, mtime):
+    path = os.path.join(directory, name)
+    SaveWriter(SaveInfo(name=name, playtime=playtime)).write(path)
+    os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    """Names of the saves whose headers were read"""
+    names = []
+    read_info = save_index.read_info
+
+    def counting_read_info(path):
+        names.append(os.path.basename(path))
+        return read_info(path)
+    monkeypatch.setattr(save_index, "read_info", counting_read_info)
+    return names
+
+
+def test_listing_reads_no_headers(tmp_path, reads):
+    write(tmp_path, "old.save", 1.0, 1000)
+    write(tmp_path, "new.save", 2.0, 2000)
+    (tmp_path / "notes.txt").write_text("not a save")
+    entries = SaveIndex(str(tmp_path)).list_saves()
+    assert [entry.save_file for entry in entries] == ["new.save", "old.save"]
+    assert all(entry.info is None for entry in entries)
+    assert reads == []
+
+
+def test_pages_read_only_their_own_headers(tmp_path, reads):
+    for i in range(5):
+        write(tmp_path, f"{i}.save", float(i), 1000 + i)
+    index = SaveIndex(str(tmp_path))
+    entries = index.list_saves()
+    index.load_page(entries, 0, 2)
+    assert reads == ["4.save", "3.save"]
+    assert entries[0].info.playtime == 4.0 and entries[2].info is None
+
+
+def test_unchanged_saves_come_from_the_cache(tmp_path, reads):
+    write(tmp_path, "a.save", 1.0, 1000)
+    index = SaveIndex(str(tmp_path))
+    index.load_page(index.list_saves(), 0, 10)
+    entries = index.list_saves()
+    index.load_page(entries, 0, 10)
+    assert reads == ["a.save"]
+    assert entries[0].info.playtime == 1.0
+
+
+def test_a_changed_save_is_read_again(tmp_path, reads):
+    write(tmp_path, "a.save", 1.0, 1000)
+    index = SaveIndex(str(tmp_path))
+    index.load_page(index.list_saves(), 0, 10)
+
+    write(tmp_path, "a.save", 2.0, 2000)  # Same size, newer mtime
+    entries = index.list_saves()
+    assert entries[0].info is None
+    index.load_page(entries, 0, 10)
+    assert reads == ["a.save", "a.save"]
+    assert entries[0].info.playtime == 2.0
+
+
+def test_unreadable_saves_are_reported_once(tmp_path, reads):
+    (tmp_path / "broken.save").write_bytes(b"garbage")
+    index = SaveIndex(str(tmp_path))
+    entries = index.list_saves()
+    index.load_page(entries, 0, 10)
+    index.load_page(entries, 0, 10)
+    assert entries[0].info is None and entries[0].error
+    assert reads == ["broken.save"]
+
+
+def test_deleted_saves_leave_the_cache(tmp_path):
+    write(tmp_path, "a.save", 1.0, 1000)
+    index = SaveIndex(str(tmp_path))
+    index.load_page(index.list_saves(), 0, 10)
+    os.remove(tmp_path / "a.save")
+    assert index.list_saves() == []
+    assert index.cache == {}
+
+
+def test_missing_directory_lists_nothing(tmp_path):
+    assert SaveIndex(str(tmp_path / "missing")).list_saves() == []
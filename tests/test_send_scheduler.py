@@ -0,0 +1,72 @@
+from network.send_scheduler import SendScheduler
+
+
+def world(monsters):
+    return {
+        "players": {"player_2": {"x": 0.0, "y": 0.0, "health": 100}},
+        "monsters": {f"monster_{i}": {"x": i * 50.0, "y": 0.0, "health": 50} for i in range(monsters)},
+        "projectiles": [],
+    }
+
+
+def test_first_build_sends_everything_within_budget():
+    scheduler = SendScheduler(initial_budget=1024 * 1024)
+    state = world(5)
+    scheduler.build("player_2", state, scheduler.measure(state), now=0.0)  # Starts the token bucket
+    data, removed = scheduler.build("player_2", state, scheduler.measure(state), now=0.1)
+    assert set(data["monsters"]) == set(state["monsters"])
+    assert "player_2" in data["players"]
+    assert removed == {}
+
+
+def test_unchanged_entities_are_not_resent():
+    scheduler = SendScheduler(initial_budget=1024 * 1024)
+    state = world(5)
+    scheduler.prime("player_2", state)
+    state["monsters"]["monster_3"] = {"x": 999.0, "y": 0.0, "health": 10}
+    scheduler.build("player_2", state, scheduler.measure(state), now=0.0)  # Starts the token bucket
+    data, removed = scheduler.build("player_2", state, scheduler.measure(state), now=0.1)
+    assert list(data["monsters"]) == ["monster_3"]
+    assert "projectiles" not in data
+
+
+def test_small_budget_sends_own_player_first_and_defers_the_rest():
+    scheduler = SendScheduler(initial_budget=4 * 1024, min_budget=1024)
+    scheduler.min_packet = 0
+    state = world(200)
+    sizes = scheduler.measure(state)
+    scheduler.build("player_2", state, sizes, now=0.0)
+    data, removed = scheduler.build("player_2", state, sizes, now=0.1)
+    assert "player_2" in data["players"]
+    assert len(data.get("monsters", {})) < 200
+    assert scheduler.client("player_2").entities_skipped > 0
+
+
+def test_removed_entities_are_reported_once():
+    scheduler = SendScheduler(initial_budget=1024 * 1024)
+    state = world(3)
+    scheduler.prime("player_2", state)
+    del state["monsters"]["monster_1"]
+    data, removed = scheduler.build("player_2", state, scheduler.measure(state), now=0.0)
+    assert removed == {"monsters": ["monster_1"]}
+    data, removed = scheduler.build("player_2", state, scheduler.measure(state), now=0.1)
+    assert removed == {}
+    assert list(data) == ["players"]  # Only the client's own player, which always goes out
+
+
+def test_budget_backs_off_when_sends_block():
+    scheduler = SendScheduler(initial_budget=64 * 1024, min_budget=4 * 1024)
+    scheduler.on_sent("player_2", 1000, send_time=0.1, interval=1 / 30)
+    assert scheduler.client("player_2").budget == 64 * 1024 * 0.7
+    for _ in range(50):
+        scheduler.on_sent("player_2", 1000, send_time=0.1, interval=1 / 30)
+    assert scheduler.client("player_2").budget == 4 * 1024
+    scheduler.on_sent("player_2", 1000, send_time=0.0, interval=1 / 30)
+    assert scheduler.client("player_2").budget > 4 * 1024
+
+
+def test_remove_client_forgets_state():
+    scheduler = SendScheduler()
+    scheduler.prime("player_2", world(3))
+    scheduler.remove_client("player_2")
+    assert scheduler.get_stats("player_2") is None
@@ -0,0 +1,53 @@
+import socket
+import time
+
+import pytest
+
+from network.network_manager import NetworkManager
+from server import Room, plan_rooms
+
+
+def free_tcp_port():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def test_rooms_skip_the_broadcast_port():
+    assert plan_rooms(3, "Room", 12345, 12346) == [(0, "Room 1", 12345), (1, "Room 2", 12347),
+                                                    (2, "Room 3", 12348)]
+    assert [port for index, name, port in plan_rooms(2, "Room", 2000, 12346)] == [2000, 2001]
+
+
+@pytest.fixture
+def room():
+    room = Room(0, "Test Room", free_tcp_port(), "127.0.0.1", tick_rate=60)
+    assert room.start()
+    yield room
+    room.stop()
+
+
+def test_a_room_hosts_without_a_player_of_its_own(room):
+    assert room.player_count() == 0
+    assert room.simulation.local_player is None
+    client = NetworkManager()
+    try:
+        assert client.connect_to_game("127.0.0.1", room.port)
+        deadline = time.time() + 5
+        while room.player_count() == 0 and time.time() < deadline:
+            time.sleep(0.02)
+        assert room.player_count() == 1
+    finally:
+        client.stop_networking()
+
+
+def test_ticks_advance_the_world_by_real_time_capped(room):
+    room.tick(100.0)
+    assert room.simulation.clock == pytest.approx(room.tick_interval)
+    room.tick(100.02)
+    assert room.simulation.clock == pytest.approx(room.tick_interval + 0.02)
+    room.tick(105.0)  # A stall doesn't teleport everything
+    assert room.simulation.clock == pytest.approx(room.tick_interval + 0.02 + 0.1)
+    assert 0.0 <= room.load <= 1.0
@@ -0,0 +1,117 @@
+import socket
+import time
+
+import pygame
+import pytest
+
+from network.network_manager import NetworkManager
+
+
+def free_tcp_port():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def wait_for(condition, timeout=5.0):
+    end = time.time() + timeout
+    while time.time() < end:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+@pytest.fixture
+def host_and_client():
+    host = NetworkManager()
+    host.port = free_tcp_port()
+    assert host.start_hosting("test", host="127.0.0.1", broadcast=False)
+    client = NetworkManager()
+    assert client.connect_to_game("127.0.0.1", host.port)
+    yield host, client
+    client.stop_networking()
+    host.stop_networking()
+
+
+def drop_connection(client):
+    client.client_socket.shutdown(socket.SHUT_RDWR)
+
+
+def test_resume_keeps_the_player_and_starts_a_new_epoch(host_and_client):
+    host, client = host_and_client
+    player_id = client.player_id
+    epoch = client.session_epoch
+    client.game_state["monsters"]["monster_stale"] = {"x": 0, "y": 0}
+
+    drop_connection(client)
+    assert wait_for(lambda: client.session_epoch > epoch and client.is_connected)
+    assert client.player_id == player_id
+    assert "monster_stale" not in client.game_state["monsters"]
+
+
+def test_rejoin_after_grace_gets_a_new_player(host_and_client):
+    host, client = host_and_client
+    player_id = client.player_id
+    epoch = client.session_epoch
+    client.session_token = "expired"  # As if the host had already dropped our slot
+    client.game_state["monsters"]["monster_stale"] = {"x": 0, "y": 0}
+
+    drop_connection(client)
+    assert wait_for(lambda: client.session_epoch > epoch and client.is_connected)
+    assert client.player_id != player_id
+    assert "monster_stale" not in client.game_state["monsters"]
+    assert client.snapshot_buffer.latest() is None or \
+        "monster_stale" not in client.snapshot_buffer.latest().get("monsters", {})
+
+
+def test_game_screen_follows_a_rejoin():
+    from entities.monster import Monster
+    from entities.player import Player
+    from screens.game_screen import GameScreen
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    network_manager = NetworkManager()
+    network_manager.is_connected = True
+    network_manager.player_id = "player_2"
+    game = GameScreen(screen, network_manager=network_manager)
+    game.registry.add(Monster(10, 10), "monster", key="monster_1")
+    game.registry.add(Player(50, 50, "player_3", is_local=False), "remote_player", key="player_3")
+    game.predictor.record((1, 0), 0.1)
+    game.predictor.last_acknowledged = 40
+
+    # What _open_session does on a rejoin
+    network_manager.player_id = "player_7"
+    network_manager.snapshot_buffer.clear()
+    network_manager.session_epoch += 1
+    game.update(1 / 60)
+
+    assert game.player.player_id == "player_7"
+    assert game.registry.find("player_7") is game.player
+    assert game.registry.find("player_2") is None
+    assert len(game.monsters) == 0 and len(game.other_players) == 0
+    assert game.predictor.last_acknowledged == 0
+    assert [frame[0] for frame in game.predictor.pending] == [2]  # Only this frame's input
+    pygame.quit()
+
+
+def test_clamp_view_delay():
+    network_manager = NetworkManager()
+    buffer = network_manager.snapshot_buffer
+    clamp = network_manager.clamp_view_delay
+    assert clamp(100) == pytest.approx(0.1)
+    assert clamp(60000) == buffer.max_delay
+    assert clamp(-500) == buffer.min_delay
+    assert clamp(float("nan")) == buffer.interpolation_delay
+    assert clamp("100") == buffer.interpolation_delay
+
+
+def test_host_clamps_a_reported_view_delay(host_and_client):
+    host, client = host_and_client
+    client.outbound.set_view_delay(60.0)  # A client asking for a full minute of rewind
+    client.flush_outbound()
+    assert wait_for(lambda: "view_delay" in host.connected_players[client.player_id])
+    assert host.connected_players[client.player_id]["view_delay"] == host.snapshot_buffer.max_delay
+    assert host.view_latency(client.player_id) <= host.snapshot_buffer.max_delay + 0.05
@@ -0,0 +1,90 @@
+from entities.monster import Monster
+from entities.player import Player
+from network.network_manager import NetworkManager
+from world.simulation import MAX_INPUT_DT, WorldSimulation
+
+
+def hosted_world():
+    """A world with one remote client, fed input frames directly"""
+    network_manager = NetworkManager()
+    network_manager.game_state["players"]["player_2"] = {"x": 0.0, "y": 0.0}
+    simulation = WorldSimulation(network_manager, monster_count=0)
+    simulation.step(0.0)  # Adds the remote player
+    player = simulation.registry.find("player_2")
+    return simulation, player
+
+
+def step_with_inputs(simulation, frames, dt):
+    simulation.network_manager.process_inbound = lambda: {"player_2": frames}
+    simulation.step(dt)
+
+
+def moved_with(frames, dt, ticks=1):
+    simulation, player = hosted_world()
+    for _ in range(ticks):
+        step_with_inputs(simulation, frames, dt)
+    return player
+
+
+def test_honest_inputs_are_applied_in_full():
+    player = moved_with([(1, (1, 0), 1 / 60, None)], 1 / 60, ticks=30)
+    reference = Player(0, 0, "reference", is_local=False)
+    for _ in range(30):
+        reference.apply_input((1, 0), 1 / 60)
+    assert player.x == reference.x
+    assert player.last_input == 1
+
+
+def test_oversized_frame_is_clamped():
+    cheat = moved_with([(1, (1, 0), 5.0, None)], 1.0)
+    capped = moved_with([(1, (1, 0), MAX_INPUT_DT, None)], 1.0)
+    assert cheat.x == capped.x
+    assert cheat.last_input == 1  # Still acknowledged, so the client reconciles back
+
+
+def test_frames_cannot_cover_more_than_the_elapsed_time():
+    dt = 1 / 60
+    flood = [(sequence, (1, 0), dt, None) for sequence in range(1, 101)]
+    player = moved_with(flood, dt)
+    reference = Player(0, 0, "reference", is_local=False)
+    reference.apply_input((1, 0), dt)
+    assert player.x == reference.x
+    assert player.last_input == 100
+
+
+def test_batches_may_arrive_every_other_tick():
+    simulation, player = hosted_world()
+    dt = 1 / 60
+    reference = Player(0, 0, "reference", is_local=False)
+    for tick in range(20):
+        if tick % 2:
+            step_with_inputs(simulation, [(tick, (1, 0), dt, None), (tick + 1, (1, 0), dt, None)], dt)
+            reference.apply_input((1, 0), dt)
+            reference.apply_input((1, 0), dt)
+        else:
+            step_with_inputs(simulation, [], dt)
+    assert abs(player.x - reference.x) < 1e-9
+
+
+class StillMonster(Monster):
+    """A monster that stays put, so only collisions move it"""
+
+    def update(self, dt, player_x, player_y):
+        pass
+
+
+def test_overlapping_bodies_are_pushed_apart():
+    local = Player(0, 0, "player_1", is_local=True)
+    simulation = WorldSimulation(NetworkManager(), monster_count=0, local_player=local)
+    touching_player = StillMonster(25, 0)
+    far_away = StillMonster(2000, 0)
+    pair = [StillMonster(500, 500), StillMonster(505, 500)]
+    for monster in [touching_player, far_away] + pair:
+        monster.projectiles = []
+        monster.attack = lambda *args: False
+        simulation.registry.add(monster, "monster")
+
+    simulation.step(1 / 60)
+    assert not local.check_collision(touching_player)
+    assert not pair[0].check_collision(pair[1])
+    assert (far_away.x, far_away.y) == (2000, 0)
@@ -0,0 +1,68 @@
+import pytest
+
+from network.snapshot_buffer import SnapshotBuffer
+
+
+def snapshot(x, **players):
+    return {"players": {"player_2": {"x": x, "y": 0.0, "health": 100}, **players}}
+
+
+def buffer_of(*snapshots):
+    """A buffer holding (server_time, data) pairs that arrived with no delay, rendering 0.1 s behind"""
+    buffer = SnapshotBuffer()
+    for server_time, data in snapshots:
+        buffer.add(data, server_time, local_time=server_time)
+    buffer.interpolation_delay = 0.1
+    return buffer
+
+
+def test_interpolates_between_the_snapshots_around_the_render_time():
+    buffer = buffer_of((0.0, snapshot(0.0)), (0.1, snapshot(10.0)), (0.2, snapshot(20.0)))
+    player = buffer.sample("players", local_time=0.175)["player_2"]
+    assert player["x"] == pytest.approx(7.5)
+    assert player["health"] == 100
+
+
+def test_extrapolates_past_the_newest_snapshot():
+    buffer = buffer_of((0.0, snapshot(0.0)), (0.1, snapshot(10.0)))
+    assert buffer.sample("players", local_time=0.25)["player_2"]["x"] == pytest.approx(15.0)
+
+
+def test_extrapolation_is_capped():
+    buffer = buffer_of((0.0, snapshot(0.0)), (0.1, snapshot(10.0)))
+    # However late the next snapshot is, entities coast for max_extrapolation at most
+    assert buffer.sample("players", local_time=5.0)["player_2"]["x"] == pytest.approx(35.0)
+
+
+def test_render_time_before_the_buffer_shows_the_oldest_snapshot():
+    buffer = buffer_of((1.0, snapshot(0.0)), (1.1, snapshot(10.0)))
+    assert buffer.sample("players", local_time=0.5)["player_2"]["x"] == 0.0
+
+
+def test_out_of_order_and_duplicate_snapshots_are_dropped():
+    buffer = buffer_of((0.0, snapshot(0.0)), (0.2, snapshot(20.0)))
+    buffer.add(snapshot(10.0), 0.1, local_time=0.25)
+    buffer.add(snapshot(99.0), 0.2, local_time=0.25)
+    assert len(buffer.snapshots) == 2
+    assert buffer.latest()["players"]["player_2"]["x"] == 20.0
+
+
+def test_new_entities_appear_without_blending():
+    newcomer = {"x": 50.0, "y": 50.0}
+    buffer = buffer_of((0.0, snapshot(0.0)), (0.1, snapshot(10.0, player_3=newcomer)))
+    assert buffer.sample("players", local_time=0.15)["player_3"] == newcomer
+
+
+def test_clock_offset_follows_the_least_delayed_snapshot():
+    buffer = SnapshotBuffer()
+    buffer.add(snapshot(0.0), 100.0, local_time=100.3)
+    buffer.add(snapshot(0.0), 100.1, local_time=100.15)
+    assert buffer.clock_offset == pytest.approx(0.05)
+
+
+def test_empty_or_cleared_buffer_samples_nothing():
+    buffer = buffer_of((0.0, snapshot(0.0)))
+    buffer.clear()
+    assert buffer.sample("players", local_time=1.0) == {}
+    assert buffer.latest() is None
+    assert buffer.render_time(1.0) is None
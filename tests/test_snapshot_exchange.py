@@ -0,0 +1,52 @@
+import threading
+
+from network.snapshot_exchange import SnapshotExchange
+
+
+def test_drain_returns_events_in_arrival_order_once():
+    exchange = SnapshotExchange()
+    for i in range(5):
+        exchange.push(("inputs", "player_2", i))
+    assert [event[2] for event in exchange.drain()] == [0, 1, 2, 3, 4]
+    assert exchange.drain() == []
+
+
+def test_events_pushed_from_many_threads_all_arrive():
+    exchange = SnapshotExchange()
+
+    def push(player):
+        for i in range(1000):
+            exchange.push((player, i))
+    threads = [threading.Thread(target=push, args=(f"player_{n}",)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    events = []
+    while any(thread.is_alive() for thread in threads):
+        events.extend(exchange.drain())
+    for thread in threads:
+        thread.join()
+    events.extend(exchange.drain())
+    assert len(events) == 4000
+    for n in range(4):
+        assert [i for player, i in events if player == f"player_{n}"] == list(range(1000))
+
+
+def test_published_snapshots_are_private_copies():
+    exchange = SnapshotExchange()
+    game_state = {"players": {"player_1": {"x": 1.0}}, "monsters": {}, "projectiles": [{"x": 5.0}]}
+    exchange.publish(game_state)
+    tick, timestamp, data = exchange.published
+    game_state["players"]["player_1"]["x"] = 2.0
+    game_state["projectiles"][0]["x"] = 6.0
+    game_state["monsters"]["monster_1"] = {"x": 0.0}
+    assert data == {"players": {"player_1": {"x": 1.0}}, "monsters": {}, "projectiles": [{"x": 5.0}]}
+
+
+def test_each_publish_is_a_new_tick():
+    exchange = SnapshotExchange()
+    assert exchange.published is None
+    exchange.publish({"players": {}})
+    first = exchange.published
+    exchange.publish({"players": {"player_1": {"x": 0.0}}})
+    assert exchange.published[0] == first[0] + 1
+    assert first[2] == {"players": {}}  # A reader holding the old snapshot keeps it intact
@@ -0,0 +1,58 @@
+import math
+
+from world.spatial import SpatialGrid, arc_overlaps, segment_distance_sq
+
+
+class Body:
+    def __init__(self, x, y, radius=10):
+        self.x = x
+        self.y = y
+        self.collision_radius = radius
+
+
+def grid_of(positions, cell_size=64):
+    grid = SpatialGrid(cell_size)
+    grid.rebuild({i: Body(x, y) for i, (x, y) in enumerate(positions)})
+    return grid
+
+
+def found(results):
+    return sorted(entity_id for entity_id, entity in results)
+
+
+def test_circle_includes_bodies_that_overlap_the_edge():
+    grid = grid_of([(0, 0), (105, 0), (115, 0), (-300, 0)])
+    assert found(grid.query_circle(0, 0, 100)) == [0, 1]
+
+
+def test_arc_only_hits_the_facing_side():
+    grid = grid_of([(80, 0), (60, 60), (0, 80), (-80, 0)])
+    # 120 degree sweep to the right
+    assert found(grid.query_arc(0, 0, 100, 0.0, math.radians(60))) == [0, 1]
+    # Facing down (+y on screen)
+    assert found(grid.query_arc(0, 0, 100, math.pi / 2, math.radians(30))) == [2]
+    # A body straddling the edge of the sector still counts
+    assert arc_overlaps(0, 0, 100, 0.0, math.radians(10), 50, 15, 10)
+    assert not arc_overlaps(0, 0, 100, 0.0, math.radians(10), 50, 40, 10)
+
+
+def test_arc_tip_overlap():
+    assert arc_overlaps(0, 0, 100, 0.0, math.radians(10), -5, 0, 10)
+
+
+def test_segment_finds_bodies_along_the_line():
+    grid = grid_of([(50, 5), (150, 0), (50, 40), (250, 0)])
+    assert found(grid.query_segment(0, 0, 200, 0)) == [0, 1]
+    assert found(grid.query_segment(0, 0, 200, 0, width=35)) == [0, 1, 2]
+
+
+def test_segment_distance():
+    assert segment_distance_sq(0, 0, 10, 0, 5, 3) == 9
+    assert segment_distance_sq(0, 0, 10, 0, 13, 4) == 25  # Past the end
+    assert segment_distance_sq(2, 2, 2, 2, 5, 6) == 25  # Degenerate segment
+
+
+def test_nearest_within_range():
+    grid = grid_of([(100, 0), (30, 40), (500, 500)])
+    assert grid.nearest(0, 0, 200)[0] == 1
+    assert grid.nearest(400, 400, 50) is None
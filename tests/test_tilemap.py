@@ -0,0 +1,93 @@
+import pygame
+import pytest
+
+from world.tilemap import CHUNK_TILES, FLOOR, TILE_SIZE, WALL, TileMap, TileRenderer
+
+
+class Body:
+    def __init__(self, x, y, vx=0.0, vy=0.0, radius=30):
+        self.x = x
+        self.y = y
+        self.vx = vx
+        self.vy = vy
+        self.collision_radius = radius
+
+
+def one_wall(tx=5, ty=5):
+    """A map whose first chunk is open floor but for one wall tile"""
+    tilemap = TileMap(1)
+    for y in range(CHUNK_TILES):
+        for x in range(CHUNK_TILES):
+            tilemap.set_tile(x, y, FLOOR)
+    tilemap.set_tile(tx, ty, WALL)
+    return tilemap
+
+
+def test_generation_is_deterministic_and_keeps_the_spawn_open():
+    a, b = TileMap(42), TileMap(42)
+    coords = [(0, 0), (3, -2), (-1, 5)]
+    assert all(a.chunk(coord).tiles == b.chunk(coord).tiles for coord in coords)
+    assert any(TileMap(43).chunk(coord).tiles != a.chunk(coord).tiles for coord in coords)
+    assert a.free_position(400, 300, 3 * TILE_SIZE - 1)
+
+
+def test_collide_pushes_out_of_a_wall_edge_and_stops_motion_into_it():
+    tilemap = one_wall()
+    wall_left = 5 * TILE_SIZE
+    body = Body(wall_left - 20, 5.5 * TILE_SIZE, vx=100.0, vy=50.0)
+    tilemap.collide(body)
+    assert body.x == pytest.approx(wall_left - 30)
+    assert body.y == pytest.approx(5.5 * TILE_SIZE)
+    assert (body.vx, body.vy) == (0.0, 50.0)
+
+
+def test_collide_moves_a_centre_inside_a_wall_out_by_the_nearest_edge():
+    tilemap = one_wall()
+    body = Body(5 * TILE_SIZE + 10, 5.5 * TILE_SIZE)
+    tilemap.collide(body)
+    assert body.x == pytest.approx(5 * TILE_SIZE - 30)
+    assert tilemap.free_position(body.x, body.y, body.collision_radius - 1)
+
+
+def test_collide_pushes_away_from_a_corner():
+    tilemap = one_wall()
+    corner = 6 * TILE_SIZE
+    body = Body(corner + 10, corner + 10, vx=-10.0, vy=-10.0, radius=20)
+    tilemap.collide(body)
+    assert body.x == body.y
+    assert (body.x - corner) ** 2 + (body.y - corner) ** 2 == pytest.approx(20 ** 2)
+    assert body.vx == pytest.approx(0.0) and body.vy == pytest.approx(0.0)
+
+
+def test_collide_leaves_bodies_in_the_open_alone():
+    tilemap = one_wall()
+    body = Body(100.0, 100.0, vx=5.0)
+    tilemap.collide(body)
+    assert (body.x, body.y, body.vx) == (100.0, 100.0, 5.0)
+
+
+def test_free_position():
+    tilemap = one_wall()
+    assert not tilemap.free_position(5.5 * TILE_SIZE, 5.5 * TILE_SIZE, 10)
+    assert not tilemap.free_position(5 * TILE_SIZE - 5, 5.5 * TILE_SIZE, 10)
+    assert tilemap.free_position(2 * TILE_SIZE, 2 * TILE_SIZE, 10)
+    assert tilemap.is_solid(5.5 * TILE_SIZE, 5.5 * TILE_SIZE)
+
+
+def test_renderer_redraws_a_chunk_only_when_it_changes():
+    pygame.init()
+    pygame.display.set_mode((800, 600))
+    tilemap = one_wall()
+    renderer = TileRenderer(tilemap, max_cached=2)
+    first = renderer.surface((0, 0))
+    assert renderer.surface((0, 0)) is first and renderer.rasterised == 1
+    tilemap.set_tile(1, 1, WALL)
+    assert renderer.surface((0, 0)) is first and renderer.rasterised == 2
+    tilemap.set_tile(1, 1, WALL)  # No change
+    renderer.surface((0, 0))
+    assert renderer.rasterised == 2
+
+    renderer.surface((1, 0))
+    renderer.surface((2, 0))
+    assert list(renderer.surfaces) == [(1, 0), (2, 0)]
+    pygame.quit()
@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+from weapons.registry import UNARMED_ID, WeaponStats, get_weapon_registry, load_weapons
+
+
+def test_table_loads_with_unarmed():
+    weapons = get_weapon_registry()
+    assert weapons.get(UNARMED_ID).kind == "unarmed"
+    assert weapons.find("Sword").kind == "melee"
+    assert weapons.get(weapons.find("Sword").weapon_id) is weapons.find("Sword")
+
+
+def test_stats_are_read_only():
+    sword = get_weapon_registry().find("Sword")
+    with pytest.raises(AttributeError):
+        sword.damage = 1000
+    with pytest.raises(AttributeError):
+        sword.extra = 1
+
+
+@pytest.mark.parametrize("weapon_id", [999, -1, None, "5", 5.0, True, [5], {"id": 5}])
+def test_unknown_or_malformed_ids_fall_back_to_unarmed(weapon_id):
+    weapons = get_weapon_registry()
+    assert weapons.get(weapon_id) is weapons.unarmed
+
+
+def test_unknown_names_fall_back_to_unarmed():
+    weapons = get_weapon_registry()
+    assert weapons.find("Lightsaber") is weapons.unarmed
+
+
+def test_load_from_a_table(tmp_path):
+    path = tmp_path / "weapons.json"
+    path.write_text(json.dumps({"weapons": [
+        {"id": 0, "name": "Unarmed", "kind": "unarmed", "damage": 0, "attack_speed": 1.0},
+        {"id": 1, "name": "Pike", "kind": "melee", "damage": 12, "attack_speed": 0.8, "attack_range": 40},
+    ]}))
+    weapons = load_weapons(str(path))
+    pike = weapons.find("Pike")
+    assert isinstance(pike, WeaponStats)
+    assert (pike.weapon_id, pike.attack_range, pike.arc) == (1, 40, 0)
+    assert [weapon.name for weapon in weapons] == ["Unarmed", "Pike"]
+
+
+def test_host_ignores_a_malformed_weapon_from_a_client():
+    from network.network_manager import NetworkManager
+    from world.simulation import WorldSimulation
+    network_manager = NetworkManager()
+    network_manager.game_state["players"]["player_2"] = {"x": 0.0, "y": 0.0, "weapon": [5]}
+    simulation = WorldSimulation(network_manager, monster_count=0)
+    simulation.step(1 / 60)
+    assert simulation.registry.find("player_2").weapon is get_weapon_registry().unarmed
+
+
+def test_number_keys_equip_weapons():
+    import pygame
+    from screens.game_screen import GameScreen
+    pygame.init()
+    screen = pygame.display.set_mode((800, 600))
+    game = GameScreen(screen)
+    game.handle_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_5))
+    assert game.player.weapon_name == "Sword"
+    game.handle_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_0))
+    assert game.player.weapon_name == "Unarmed"
+    pygame.quit()